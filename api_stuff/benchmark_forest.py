@@ -0,0 +1,78 @@
+import argparse
+import glob
+import os
+import sys
+import time
+
+import joblib
+import pandas as pd
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from compiled_forest import CompiledForest
+
+
+def load_or_train(model_path, train_path):
+    if model_path is not None and os.path.exists(model_path):
+        return joblib.load(model_path)
+
+    # same settings as the Random Forest in model_stuff/train_model/train_model.ipynb
+    from sklearn.ensemble import RandomForestClassifier
+    print(f"training a Random Forest on {train_path}")
+    train = pd.read_csv(train_path)
+    model = RandomForestClassifier(class_weight='balanced', n_estimators=200, min_samples_leaf=5, n_jobs=-1)
+    model.fit(train.drop(columns=['psg_label']), train['psg_label'])
+    model.n_jobs = None
+    return model
+
+
+def time_call(function, repeats):
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start_time) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the compiled forest against sklearn predict.')
+    parser.add_argument('--model', default=os.path.join(project_root, 'model_stuff/saved_models/hella_features/Random_Forest.joblib'))
+    parser.add_argument('--train', default=os.path.join(project_root, 'model_stuff/data/train/bigboy_hella_features.csv'))
+    parser.add_argument('--repeats', type=int, default=50)
+    arguments = parser.parse_args()
+
+    model = load_or_train(arguments.model, arguments.train)
+    start_time = time.perf_counter()
+    compiled_model = CompiledForest.compile(model)
+    print(f"compiled {len(model.estimators_)} trees, {len(compiled_model.feature)} nodes, depth "
+          f"{compiled_model.depth} in {time.perf_counter() - start_time:.2f} s")
+
+    test_data = None
+    for test_path in sorted(glob.glob(os.path.join(project_root, 'model_stuff/data/test/*.csv'))):
+        data = pd.read_csv(test_path)
+        if 'psg_label' not in data.columns:
+            continue
+        data = data.drop(columns=['psg_label'])
+        if list(data.columns) != list(model.feature_names_in_):
+            continue
+
+        mismatches = int((model.predict(data) != compiled_model.predict(data)).sum())
+        print(f"{os.path.basename(test_path)}: {len(data)} rows, {mismatches} mismatching predictions")
+        if mismatches > 0:
+            raise SystemExit("compiled forest does not reproduce sklearn")
+        test_data = data
+
+    if test_data is None:
+        raise SystemExit("no test CSV with the model's feature columns")
+
+    for batch_size in [1, 10, 100, 500, len(test_data)]:
+        batch = test_data.iloc[0:batch_size]
+        repeats = arguments.repeats if batch_size <= 10 else max(1, arguments.repeats // 10)
+        sklearn_time = time_call(lambda: model.predict(batch), repeats)
+        compiled_time = time_call(lambda: compiled_model.predict(batch), repeats)
+        print(f"batch of {batch_size}: sklearn {sklearn_time:.2f} ms, compiled {compiled_time:.2f} ms "
+              f"({sklearn_time / compiled_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
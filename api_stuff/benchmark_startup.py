@@ -0,0 +1,74 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def make_payload(minutes):
+    import numpy as np
+
+    accel_timestamp = np.arange(0, minutes * 60, 0.02)
+    heart_rate_timestamp = np.arange(0, minutes * 60, 5.0)
+    return {
+        'x': np.zeros(len(accel_timestamp)).tolist(),
+        'y': np.zeros(len(accel_timestamp)).tolist(),
+        'z': np.sin(accel_timestamp).tolist(),
+        'accel_timestamp': accel_timestamp.tolist(),
+        'heartRate': np.full(len(heart_rate_timestamp), 60.0).tolist(),
+        'heartRate_timestamp': heart_rate_timestamp.tolist(),
+    }
+
+
+def run_child(minutes):
+    # Runs in a fresh interpreter so that every import is cold
+    start_time = time.perf_counter()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import testServer
+    import_time = time.perf_counter() - start_time
+
+    client = testServer.app.test_client()
+    payload = make_payload(minutes)
+    request_start_time = time.perf_counter()
+    response = client.post('/data', json=payload)
+    request_time = time.perf_counter() - request_start_time
+
+    heavy_modules = [name for name in ['tensorflow', 'pdfminer', 'matplotlib', 'sklearn.neural_network']
+                     if name in sys.modules]
+    print(json.dumps({'import_seconds': import_time, 'first_request_seconds': request_time,
+                      'status_code': response.status_code, 'heavy_modules': heavy_modules}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time from process launch to the first served /data request.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--minutes', type=float, default=1, help='minutes of samples in the first upload')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.child:
+        run_child(arguments.minutes)
+        return
+
+    totals = []
+    for run in range(arguments.runs):
+        launch_time = time.perf_counter()
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child',
+                                 '--minutes', str(arguments.minutes)],
+                                cwd=project_root, capture_output=True, text=True, check=True).stdout
+        total = time.perf_counter() - launch_time
+        result = json.loads(output.strip().splitlines()[-1])
+        totals.append(total)
+        print(f"run {run}: first /data served after {total:.2f} s "
+              f"(imports {result['import_seconds']:.2f} s, request {result['first_request_seconds']:.3f} s, "
+              f"status {result['status_code']}, heavy modules loaded: {result['heavy_modules']})")
+
+    totals.sort()
+    print(f"median time to first /data: {totals[len(totals) // 2]:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
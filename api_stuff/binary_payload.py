@@ -0,0 +1,148 @@
+import gzip
+import struct
+import zlib
+
+import numpy as np
+
+
+class BinaryPayload(object):
+    # Layout (all little endian):
+    #   fixed header   magic 'AGA1', version uint8, compression uint8, column count uint16
+    #   body           column directory, then the column blocks, gzip/zstd compressed as a whole if requested
+    #   directory      per column: name (24 bytes ascii, nul padded), dtype uint8, 3 pad bytes, length uint32
+    #   column blocks  raw float32/float64 values, each block starting on an 8 byte boundary
+    CONTENT_TYPE = 'application/x-sensor-columns'
+    MAGIC = b'AGA1'
+    VERSION = 1
+    HEADER = struct.Struct('<4sBBH')
+    COLUMN = struct.Struct('<24sB3xI')
+    MAXIMUM_NAME_LENGTH = 24
+    ALIGNMENT = 8
+    MAXIMUM_BODY_SIZE = 1 << 30  # decompressed bytes accepted from one upload
+
+    REQUIRED_COLUMNS = ('x', 'y', 'z', 'accel_timestamp', 'heartRate', 'heartRate_timestamp')
+
+    COMPRESSION_NONE = 0
+    COMPRESSION_GZIP = 1
+    COMPRESSION_ZSTD = 2
+
+    DTYPES = {0: np.dtype('<f4'), 1: np.dtype('<f8')}
+    DTYPE_CODES = {np.dtype('<f4'): 0, np.dtype('<f8'): 1}
+
+    @staticmethod
+    def get_padding(offset):
+        return -offset % BinaryPayload.ALIGNMENT
+
+    @staticmethod
+    def compress(body, compression):
+        if compression == BinaryPayload.COMPRESSION_NONE:
+            return body
+        if compression == BinaryPayload.COMPRESSION_GZIP:
+            return gzip.compress(body)
+        if compression == BinaryPayload.COMPRESSION_ZSTD:
+            import zstandard
+            return zstandard.ZstdCompressor().compress(body)
+        raise ValueError(f"unknown compression {compression}")
+
+    @staticmethod
+    def decompress(body, compression):
+        if compression == BinaryPayload.COMPRESSION_NONE:
+            return body
+        if compression == BinaryPayload.COMPRESSION_GZIP:
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            try:
+                decompressed = decompressor.decompress(body, BinaryPayload.MAXIMUM_BODY_SIZE)
+            except zlib.error as error:
+                raise ValueError(f"corrupt gzip body: {error}")
+            if len(decompressor.unconsumed_tail) > 0:
+                raise ValueError(f"gzip body inflates past {BinaryPayload.MAXIMUM_BODY_SIZE} bytes")
+            if not decompressor.eof:
+                raise ValueError("corrupt gzip body: truncated stream")
+            return decompressed
+        if compression == BinaryPayload.COMPRESSION_ZSTD:
+            try:
+                import zstandard
+            except ImportError:
+                raise ValueError("zstd payloads need the zstandard package")
+            try:
+                return zstandard.ZstdDecompressor().decompress(body, max_output_size=BinaryPayload.MAXIMUM_BODY_SIZE)
+            except zstandard.ZstdError as error:
+                raise ValueError(f"corrupt zstd body: {error}")
+        raise ValueError(f"unknown compression {compression}")
+
+    @staticmethod
+    def encode(columns, compression=COMPRESSION_NONE):
+        directory = b''
+        blocks = b''
+        data_offset = len(columns) * BinaryPayload.COLUMN.size
+        data_offset = data_offset + BinaryPayload.get_padding(data_offset)
+
+        for name, values in columns.items():
+            values = np.atleast_1d(np.asarray(values))
+            if values.dtype not in BinaryPayload.DTYPE_CODES:
+                values = values.astype('<f8')
+            values = values.astype(values.dtype.newbyteorder('<'), copy=False)
+            if len(name) > BinaryPayload.MAXIMUM_NAME_LENGTH:
+                raise ValueError(f"column name {name} is longer than {BinaryPayload.MAXIMUM_NAME_LENGTH}")
+
+            directory = directory + BinaryPayload.COLUMN.pack(name.encode('ascii'),
+                                                              BinaryPayload.DTYPE_CODES[values.dtype], len(values))
+            blocks = blocks + values.tobytes() + b'\0' * BinaryPayload.get_padding(values.nbytes)
+
+        body = directory + b'\0' * (data_offset - len(directory)) + blocks
+        header = BinaryPayload.HEADER.pack(BinaryPayload.MAGIC, BinaryPayload.VERSION, compression, len(columns))
+        return header + BinaryPayload.compress(body, compression)
+
+    @staticmethod
+    def decode(payload):
+        if len(payload) < BinaryPayload.HEADER.size:
+            raise ValueError("payload shorter than header")
+        magic, version, compression, column_count = BinaryPayload.HEADER.unpack_from(payload)
+        if magic != BinaryPayload.MAGIC or version != BinaryPayload.VERSION:
+            raise ValueError("not a sensor column payload")
+
+        body = BinaryPayload.decompress(memoryview(payload)[BinaryPayload.HEADER.size:], compression)
+
+        data_offset = column_count * BinaryPayload.COLUMN.size
+        if data_offset > len(body):
+            raise ValueError("column directory extends past end of payload")
+        data_offset = data_offset + BinaryPayload.get_padding(data_offset)
+        columns = {}
+        for index in range(column_count):
+            try:
+                name, dtype_code, length = BinaryPayload.COLUMN.unpack_from(body, index * BinaryPayload.COLUMN.size)
+            except struct.error as error:
+                raise ValueError(f"corrupt column directory: {error}")
+            if dtype_code not in BinaryPayload.DTYPES:
+                raise ValueError(f"unknown dtype code {dtype_code}")
+            dtype = BinaryPayload.DTYPES[dtype_code]
+            if data_offset + length * dtype.itemsize > len(body):
+                raise ValueError("column extends past end of payload")
+
+            name = name.rstrip(b'\0').decode('ascii')
+            if name in columns:
+                raise ValueError(f"duplicate column {name}")
+            columns[name] = np.frombuffer(body, dtype=dtype, count=length, offset=data_offset)
+            data_offset = data_offset + length * dtype.itemsize
+            data_offset = data_offset + BinaryPayload.get_padding(data_offset)
+
+        return columns
+
+    @staticmethod
+    def to_record(columns):
+        # Same shape as one JSON upload; scalar fields are sent as one element columns
+        missing_columns = [name for name in BinaryPayload.REQUIRED_COLUMNS if name not in columns]
+        if len(missing_columns) > 0:
+            raise ValueError(f"missing columns {', '.join(missing_columns)}")
+
+        for group in (('x', 'y', 'z', 'accel_timestamp'), ('heartRate', 'heartRate_timestamp')):
+            lengths = [len(columns[name]) for name in group]
+            if len(set(lengths)) > 1:
+                raise ValueError(f"columns {', '.join(group)} have different lengths {lengths}")
+
+        record = dict(columns)
+        if 'absoluteStartTime' in record:
+            if len(record['absoluteStartTime']) != 1:
+                raise ValueError("absoluteStartTime must be a one element column")
+            record['absoluteStartTime'] = float(record['absoluteStartTime'][0])
+        return record
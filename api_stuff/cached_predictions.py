@@ -0,0 +1,5 @@
+class CachedPredictions(object):
+    def __init__(self, cells, predictions, model_version):
+        self.cells = cells  # what each cached prediction depends on, see PredictionCache.get_cells
+        self.predictions = predictions
+        self.model_version = model_version
@@ -0,0 +1,106 @@
+import numpy as np
+import sklearn
+
+
+class CompiledForest(object):
+    # Before 1.4 sklearn stored class counts in tree_.value and normalized them in predict_proba
+    NORMALIZE_LEAF_VALUES = tuple(int(part) for part in sklearn.__version__.split('.')[0:2]) < (1, 4)
+
+    def __init__(self, feature, threshold, left, right, leaf_value, roots, depth, classes, feature_names):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.depth = depth
+        self.classes = classes
+        self.feature_names = feature_names
+
+    @staticmethod
+    def supports(model):
+        estimators = getattr(model, 'estimators_', None)
+        return estimators is not None and hasattr(model, 'classes_') and getattr(model, 'n_outputs_', 1) == 1 \
+            and all(hasattr(estimator, 'tree_') for estimator in estimators)
+
+    @staticmethod
+    def compile(model):
+        features, thresholds, lefts, rights, leaf_values, roots = [], [], [], [], [], []
+        depth = 0
+        offset = 0
+        number_of_classes = len(model.classes_)
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            node_count = tree.node_count
+            is_leaf = tree.children_left == -1
+            node_index = np.arange(offset, offset + node_count)
+
+            # leaves point back at themselves so every tree can be walked for the same number of levels
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, node_index, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_index, tree.children_right + offset))
+
+            value = tree.value[:, 0, 0:number_of_classes]
+            if CompiledForest.NORMALIZE_LEAF_VALUES:
+                normalizer = value.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                value = value / normalizer
+            leaf_values.append(value)
+
+            roots.append(offset)
+            depth = max(depth, tree.max_depth)
+            offset = offset + node_count
+
+        return CompiledForest(feature=np.concatenate(features).astype(np.intp),
+                              threshold=np.concatenate(thresholds).astype(np.float64),
+                              left=np.concatenate(lefts).astype(np.intp),
+                              right=np.concatenate(rights).astype(np.intp),
+                              leaf_value=np.ascontiguousarray(np.concatenate(leaf_values), dtype=np.float64),
+                              roots=np.array(roots, dtype=np.intp),
+                              depth=depth,
+                              classes=model.classes_,
+                              feature_names=getattr(model, 'feature_names_in_', None))
+
+    def get_input(self, data):
+        if hasattr(data, 'columns') and self.feature_names is not None:
+            if list(data.columns) != list(self.feature_names):
+                raise ValueError("feature names do not match the ones seen during fit")
+        # sklearn evaluates trees on float32 inputs
+        values = np.asarray(data, dtype=np.float32)
+        if np.isnan(values).any():
+            raise ValueError("input contains NaN")
+        return values
+
+    def apply(self, values):
+        number_of_rows, number_of_features = values.shape
+        number_of_trees = len(self.roots)
+        values = values.ravel()
+
+        # one entry per (row, tree); each level only advances the paths that have not reached a leaf yet
+        nodes = np.tile(self.roots, number_of_rows)
+        offsets = np.repeat(np.arange(number_of_rows) * number_of_features, number_of_trees)
+        active = np.nonzero(self.left[nodes] != nodes)[0]
+
+        for _ in range(self.depth):
+            if len(active) == 0:
+                break
+            current = nodes[active]
+            go_left = values[offsets[active] + self.feature[current]] <= self.threshold[current]
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+            active = active[self.left[current] != current]
+
+        return nodes.reshape(number_of_rows, number_of_trees)
+
+    def predict_proba(self, data):
+        nodes = self.apply(self.get_input(data))
+
+        # sklearn adds the trees one after another; cumsum keeps that order so the sums match bit for bit
+        proba = np.cumsum(self.leaf_value[nodes], axis=1)[:, -1]
+        proba /= len(self.roots)
+        return proba
+
+    def predict(self, data):
+        return self.classes.take(np.argmax(self.predict_proba(data), axis=1), axis=0)
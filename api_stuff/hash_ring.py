@@ -0,0 +1,24 @@
+import bisect
+import hashlib
+
+
+class HashRing(object):
+    def __init__(self, nodes, replicas=64):
+        self.points = []
+        self.nodes = []
+        for node in nodes:
+            for replica in range(replicas):
+                self.points.append(HashRing.get_hash(f"{node}:{replica}"))
+                self.nodes.append(node)
+
+        order = sorted(range(len(self.points)), key=lambda index: self.points[index])
+        self.points = [self.points[index] for index in order]
+        self.nodes = [self.nodes[index] for index in order]
+
+    @staticmethod
+    def get_hash(key):
+        return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[0:8], 'big')
+
+    def get_node(self, key):
+        index = bisect.bisect(self.points, HashRing.get_hash(key)) % len(self.points)
+        return self.nodes[index]
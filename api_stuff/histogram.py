@@ -0,0 +1,26 @@
+import threading
+
+import numpy as np
+
+
+class Histogram(object):
+    RESERVOIR_SIZE = 2048  # quantiles are taken over the most recent observations
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.observations = np.zeros(Histogram.RESERVOIR_SIZE)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        with self.lock:
+            self.observations[self.count % Histogram.RESERVOIR_SIZE] = value
+            self.count = self.count + 1
+            self.sum = self.sum + value
+
+    def get_quantiles(self, quantiles):
+        with self.lock:
+            observations = self.observations[0:min(self.count, Histogram.RESERVOIR_SIZE)].copy()
+        if len(observations) == 0:
+            return [float('nan')] * len(quantiles)
+        return np.quantile(observations, quantiles).tolist()
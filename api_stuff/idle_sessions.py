@@ -0,0 +1,28 @@
+import time
+from collections import OrderedDict
+
+
+class IdleSessions(object):
+    TIMEOUT = 12 * 60 * 60  # seconds without an upload before a session's in-memory state is dropped
+
+    def __init__(self):
+        self.last_touched = OrderedDict()
+
+    def touch(self, session_id):
+        self.last_touched[session_id] = time.time()
+        self.last_touched.move_to_end(session_id)
+
+    def forget(self, session_id):
+        self.last_touched.pop(session_id, None)
+
+    def pop_expired(self):
+        # Sessions are kept in the order they were last touched, so the sweep stops at the first active one
+        cutoff = time.time() - IdleSessions.TIMEOUT
+        expired = []
+        while len(self.last_touched) > 0:
+            session_id, last_touched = next(iter(self.last_touched.items()))
+            if last_touched > cutoff:
+                break
+            del self.last_touched[session_id]
+            expired.append(session_id)
+        return expired
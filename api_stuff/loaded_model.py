@@ -0,0 +1,16 @@
+class LoadedModel(object):
+    # The compiled forest wins on the small batches served per upload; sklearn's C loops win on whole nights
+    COMPILED_BATCH_LIMIT = 256
+
+    def __init__(self, name, path, model, modified_time, version, compiled_model=None):
+        self.name = name
+        self.path = path
+        self.model = model
+        self.modified_time = modified_time
+        self.version = version
+        self.compiled_model = compiled_model
+
+    def get_predictor(self, number_of_rows):
+        if self.compiled_model is not None and number_of_rows <= LoadedModel.COMPILED_BATCH_LIMIT:
+            return self.compiled_model
+        return self.model
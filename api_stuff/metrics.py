@@ -0,0 +1,66 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from histogram import Histogram
+
+
+class Metrics(object):
+    QUANTILES = [0.5, 0.95, 0.99]
+    histograms = {}
+    histograms_lock = threading.Lock()
+    current = threading.local()
+
+    @staticmethod
+    def start_trace():
+        Metrics.current.trace = {}
+        return Metrics.current.trace
+
+    @staticmethod
+    def end_trace():
+        trace = getattr(Metrics.current, 'trace', None)
+        Metrics.current.trace = None
+        return trace
+
+    @staticmethod
+    @contextmanager
+    def stage(name):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            trace = getattr(Metrics.current, 'trace', None)
+            if trace is not None:
+                trace[name] = trace.get(name, 0.0) + time.perf_counter() - start_time
+
+    @staticmethod
+    def get_histogram(endpoint, stage):
+        key = (endpoint, stage)
+        with Metrics.histograms_lock:
+            if key not in Metrics.histograms:
+                Metrics.histograms[key] = Histogram()
+            return Metrics.histograms[key]
+
+    @staticmethod
+    def record_trace(endpoint, trace):
+        for stage, seconds in trace.items():
+            Metrics.get_histogram(endpoint, stage).observe(seconds)
+
+    @staticmethod
+    def format_server_timing(trace):
+        return ', '.join(f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in trace.items())
+
+    @staticmethod
+    def to_prometheus():
+        lines = ['# HELP api_stage_seconds Time spent in each stage of an endpoint.',
+                 '# TYPE api_stage_seconds summary']
+        with Metrics.histograms_lock:
+            items = sorted(Metrics.histograms.items())
+
+        for (endpoint, stage), histogram in items:
+            labels = f'endpoint="{endpoint}",stage="{stage}"'
+            for quantile, value in zip(Metrics.QUANTILES, histogram.get_quantiles(Metrics.QUANTILES)):
+                lines.append(f'api_stage_seconds{{{labels},quantile="{quantile}"}} {value}')
+            lines.append(f'api_stage_seconds_sum{{{labels}}} {histogram.sum}')
+            lines.append(f'api_stage_seconds_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
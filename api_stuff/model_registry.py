@@ -0,0 +1,89 @@
+import hashlib
+import os
+import threading
+
+import joblib
+
+from compiled_forest import CompiledForest
+from loaded_model import LoadedModel
+
+
+class ModelRegistry(object):
+    MODELS_DIRECTORY = 'model_stuff/saved_models/'
+    DEFAULT_MODEL = 'hella_features'
+    MODEL_FILE = 'Random_Forest.joblib'
+    models = {}
+    models_lock = threading.Lock()
+    load_lock = threading.Lock()
+
+    @staticmethod
+    def get_model_path(name):
+        return os.path.join(ModelRegistry.MODELS_DIRECTORY, name, ModelRegistry.MODEL_FILE)
+
+    @staticmethod
+    def get_version(name, path):
+        with open(path, 'rb') as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+        return name + '/' + os.path.basename(path) + '@' + digest[0:12]
+
+    @staticmethod
+    def load(name):
+        path = ModelRegistry.get_model_path(name)
+        modified_time = os.stat(path).st_mtime_ns
+        version = ModelRegistry.get_version(name, path)
+        model = joblib.load(path)
+        compiled_model = CompiledForest.compile(model) if CompiledForest.supports(model) else None
+        print(f"loaded model {version}")
+        return LoadedModel(name=name, path=path, model=model, modified_time=modified_time, version=version,
+                           compiled_model=compiled_model)
+
+    @staticmethod
+    def preload(names=None):
+        if names is None:
+            names = [ModelRegistry.DEFAULT_MODEL]
+        for name in names:
+            try:
+                ModelRegistry.get(name)
+            except FileNotFoundError:
+                print(f"Model not found at '{ModelRegistry.get_model_path(name)}'")
+                print("Run notebook first to train and save the models.")
+
+    @staticmethod
+    def get(name=None):
+        if name is None:
+            name = ModelRegistry.DEFAULT_MODEL
+
+        loaded_model = ModelRegistry.models.get(name)
+        if loaded_model is not None:
+            try:
+                modified_time = os.stat(loaded_model.path).st_mtime_ns
+            except FileNotFoundError:
+                # keep serving the last good model while the file is being replaced
+                return loaded_model
+            if modified_time == loaded_model.modified_time:
+                return loaded_model
+
+        # Only one thread unpickles a given change; requests keep using the old model until the swap
+        with ModelRegistry.load_lock:
+            current_model = ModelRegistry.models.get(name)
+            if current_model is not None and current_model is not loaded_model:
+                return current_model
+
+            try:
+                new_model = ModelRegistry.load(name)
+            except Exception as error:
+                if loaded_model is None:
+                    raise
+                print(f"could not reload model {name}: {error}")
+                # remember the bad file's mtime so it is not unpickled again on every request
+                loaded_model = LoadedModel(name=name, path=loaded_model.path, model=loaded_model.model,
+                                           modified_time=os.stat(loaded_model.path).st_mtime_ns,
+                                           version=loaded_model.version,
+                                           compiled_model=loaded_model.compiled_model)
+                with ModelRegistry.models_lock:
+                    ModelRegistry.models[name] = loaded_model
+                return loaded_model
+
+            with ModelRegistry.models_lock:
+                ModelRegistry.models[name] = new_model
+            return new_model
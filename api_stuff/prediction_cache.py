@@ -0,0 +1,98 @@
+import threading
+
+import numpy as np
+
+from cached_predictions import CachedPredictions
+from idle_sessions import IdleSessions
+
+
+class PredictionCache(object):
+    # Night-level normalization moves every row slightly on each upload. Rows are re-checked only while they
+    # are among the most recent RECHECK_EPOCHS (which covers the predictions returned to the watch); older
+    # rows keep the prediction they had when they left that window, which keeps the cost per upload constant
+    RECHECK_EPOCHS = 20
+    sessions = {}
+    sessions_lock = threading.Lock()
+    idle_sessions = IdleSessions()
+    split_thresholds = {}
+
+    @staticmethod
+    def get(session_id):
+        with PredictionCache.sessions_lock:
+            return PredictionCache.sessions.get(session_id)
+
+    @staticmethod
+    def put(session_id, cached_predictions):
+        with PredictionCache.sessions_lock:
+            for idle_session_id in PredictionCache.idle_sessions.pop_expired():
+                PredictionCache.sessions.pop(idle_session_id, None)
+            PredictionCache.idle_sessions.touch(session_id)
+            PredictionCache.sessions[session_id] = cached_predictions
+
+    @staticmethod
+    def reset_session(session_id):
+        with PredictionCache.sessions_lock:
+            PredictionCache.sessions.pop(session_id, None)
+            PredictionCache.idle_sessions.forget(session_id)
+
+    @staticmethod
+    def get_split_thresholds(loaded_model, number_of_features):
+        if loaded_model.version in PredictionCache.split_thresholds:
+            return PredictionCache.split_thresholds[loaded_model.version]
+
+        thresholds = None
+        estimators = getattr(loaded_model.model, 'estimators_', None)
+        if estimators is not None and all(hasattr(estimator, 'tree_') for estimator in estimators):
+            thresholds = []
+            for feature in range(number_of_features):
+                thresholds.append(np.unique(np.concatenate([estimator.tree_.threshold[estimator.tree_.feature == feature]
+                                                            for estimator in estimators])))
+
+        PredictionCache.split_thresholds[loaded_model.version] = thresholds
+        return thresholds
+
+    @staticmethod
+    def get_cells(loaded_model, features):
+        # For a forest, a row's prediction only depends on which side of every split threshold each feature
+        # falls; two rows in the same cell of the per-feature threshold grid get identical predictions
+        thresholds = PredictionCache.get_split_thresholds(loaded_model, features.shape[1])
+        if thresholds is None:
+            return features
+
+        # sklearn compares float32 copies of the features against the thresholds (go left if x <= threshold)
+        features = features.astype(np.float32).astype(np.float64)
+        cells = np.zeros(features.shape, dtype=np.int64)
+        for feature in range(features.shape[1]):
+            cells[:, feature] = np.searchsorted(thresholds[feature], features[:, feature], side='left')
+        return cells
+
+    @staticmethod
+    def get_rows_to_predict(cached_predictions, cells, model_version):
+        if cached_predictions is None or cached_predictions.model_version != model_version \
+                or cached_predictions.cells.shape[1] != cells.shape[1] \
+                or len(cached_predictions.cells) > len(cells):
+            return np.arange(len(cells))
+
+        number_cached = len(cached_predictions.cells)
+        first_checked = min(max(0, len(cells) - PredictionCache.RECHECK_EPOCHS), number_cached)
+        changed = np.any(cells[first_checked:number_cached] != cached_predictions.cells[first_checked:], axis=1)
+        changed_rows = first_checked + np.nonzero(changed)[0]
+        return np.concatenate((changed_rows, np.arange(number_cached, len(cells))))
+
+    @staticmethod
+    def update(session_id, current_cells, rows, new_predictions, model_version):
+        cached_predictions = PredictionCache.get(session_id)
+        if cached_predictions is None or len(rows) == len(current_cells):
+            cells = current_cells
+            predictions = np.asarray(new_predictions)
+        else:
+            number_cached = len(cached_predictions.cells)
+            cells = np.concatenate((cached_predictions.cells, current_cells[number_cached:]))
+            cells[rows] = current_cells[rows]
+            predictions = np.zeros(len(current_cells), dtype=cached_predictions.predictions.dtype)
+            predictions[0:number_cached] = cached_predictions.predictions
+            predictions[rows] = new_predictions
+
+        PredictionCache.put(session_id, CachedPredictions(cells=cells, predictions=predictions,
+                                                          model_version=model_version))
+        return predictions
@@ -0,0 +1,120 @@
+import queue
+import threading
+import traceback
+
+from idle_sessions import IdleSessions
+from metrics import Metrics
+
+
+class PredictionQueue(object):
+    METRICS_ENDPOINT = 'prediction'
+
+    def __init__(self, predict, number_of_workers=2, store=None, on_result=None, on_trace=None):
+        self.predict = predict
+        self.store = store
+        self.on_result = on_result
+        self.on_trace = on_trace
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.pending_uploads = {}
+        self.scheduled_sessions = set()
+        self.sequence_numbers = {}
+        self.results = {}
+        self.idle_sessions = IdleSessions()
+
+        self.workers = [threading.Thread(target=self.work, daemon=True) for _ in range(number_of_workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def ingest(self, session_id, upload, absolute_start_time=None):
+        if self.store is not None:
+            accel_data, hr_data = upload
+            self.store(session_id, accel_data, hr_data, absolute_start_time)
+        return self.submit(session_id, upload)
+
+    def submit(self, session_id, upload):
+        with self.lock:
+            self.evict_idle_sessions()
+            self.idle_sessions.touch(session_id)
+            sequence_number = self.sequence_numbers.get(session_id, 0) + 1
+            self.sequence_numbers[session_id] = sequence_number
+            self.pending_uploads.setdefault(session_id, []).append(upload)
+
+            # A session is queued at most once, so only one worker touches its state at a time and
+            # uploads that arrive while it is being processed are picked up together on the next pass
+            if session_id not in self.scheduled_sessions:
+                self.scheduled_sessions.add(session_id)
+                self.queue.put(session_id)
+
+        return sequence_number
+
+    def evict_idle_sessions(self):
+        for session_id in self.idle_sessions.pop_expired():
+            # a session still queued or being processed is not idle, whenever its last upload arrived
+            if session_id in self.scheduled_sessions:
+                self.idle_sessions.touch(session_id)
+                continue
+            self.sequence_numbers.pop(session_id, None)
+            self.results.pop(session_id, None)
+            self.pending_uploads.pop(session_id, None)
+
+    def work(self):
+        while True:
+            session_id = self.queue.get()
+            if session_id is None:
+                self.queue.task_done()
+                return
+
+            with self.lock:
+                uploads = self.pending_uploads.pop(session_id, [])
+                sequence_number = self.sequence_numbers[session_id]
+
+            try:
+                self.process(session_id, uploads, sequence_number)
+            except Exception:
+                traceback.print_exc()
+
+            with self.lock:
+                if session_id in self.pending_uploads:
+                    self.queue.put(session_id)
+                else:
+                    self.scheduled_sessions.discard(session_id)
+            self.queue.task_done()
+
+    def process(self, session_id, uploads, sequence_number):
+        Metrics.start_trace()
+        try:
+            result = self.predict(session_id, uploads)
+        finally:
+            trace = Metrics.end_trace()
+            Metrics.record_trace(PredictionQueue.METRICS_ENDPOINT, trace)
+            # also for uploads that gave no prediction or failed, so their stage timings are not lost
+            if self.on_trace is not None:
+                self.on_trace(session_id, trace)
+        if result is None:
+            return
+
+        predictions, model_version = result
+        result = {'sequence': sequence_number, 'predictions': predictions, 'model_version': model_version,
+                  'trace': trace}
+        with self.lock:
+            self.results[session_id] = result
+        if self.on_result is not None:
+            self.on_result(session_id, result)
+
+    def get_sequence_number(self, session_id):
+        with self.lock:
+            return self.sequence_numbers.get(session_id)
+
+    def get_result(self, session_id):
+        with self.lock:
+            return self.results.get(session_id)
+
+    def wait_until_idle(self):
+        self.queue.join()
+
+    def stop(self):
+        for _ in self.workers:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.join()
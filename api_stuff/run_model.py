@@ -1,25 +1,33 @@
-import os
-import joblib
 import numpy as np
-from tensorflow.keras.models import load_model
+
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache
 
 class Model:
     def run_model(data, file_number_as_str):
-        models_dir = "model_stuff/saved_models/hella_features"
+        rf_predictions, _ = Model.predict(data, file_number_as_str)
+        return rf_predictions
 
-        if not os.path.exists(models_dir):
-            print(f"Models directory not found at '{models_dir}'")
-            print("Run notebook first to train and save the models.")
-        else:
-            rf_model_path = os.path.join(models_dir, "Random_Forest.joblib")
-            loaded_rf_model = joblib.load(rf_model_path)
+    def predict(data, file_number_as_str, model_name=None):
+        loaded_model = ModelRegistry.get(model_name)
+        cells = PredictionCache.get_cells(loaded_model, data.to_numpy(dtype=float))
 
-        rf_predictions = loaded_rf_model.predict(data)
-        rf_predictions = np.where(rf_predictions == 4, 5, rf_predictions)
+        # only epochs that are new, or whose features crossed a split since they were predicted, go through the model
+        cached_predictions = PredictionCache.get(file_number_as_str)
+        rows = PredictionCache.get_rows_to_predict(cached_predictions, cells, loaded_model.version)
+        if len(rows) > 0:
+            new_predictions = loaded_model.get_predictor(len(rows)).predict(data.iloc[rows])
+            new_predictions = np.where(new_predictions == 4, 5, new_predictions)
+        else:
+            new_predictions = np.zeros(0, dtype=int)
+        rf_predictions = PredictionCache.update(file_number_as_str, cells, rows, new_predictions,
+                                                loaded_model.version)
 
-        with open('model_stuff/model_results/' + file_number_as_str + '_model_results.txt', 'w') as file:
-            for index, i in enumerate(rf_predictions):
-                line = str(rf_predictions[index]) + '\n'
+        # append-only log of "<epoch index> <stage>"; a later line for the same epoch supersedes earlier ones
+        file_mode = 'a' if cached_predictions is not None else 'w'
+        with open('model_stuff/model_results/' + file_number_as_str + '_model_results.txt', file_mode) as file:
+            for index, i in enumerate(rows):
+                line = str(i) + ' ' + str(new_predictions[index]) + '\n'
                 file.write(line)
         
-        return rf_predictions        
\ No newline at end of file
+        return rf_predictions, loaded_model.version
@@ -0,0 +1,40 @@
+import numpy as np
+
+
+class SampleBuffer(object):
+    INITIAL_CAPACITY = 4096
+
+    def __init__(self, number_of_columns, dtype=np.float32):
+        # Column 0 is the timestamp and stays float64: float32 rounds it to ~4 ms after a few hours of recording,
+        # which is a fifth of the 50 Hz sample spacing. Only the sample values are stored in the narrower dtype
+        self.timestamps = np.empty(SampleBuffer.INITIAL_CAPACITY, dtype=np.float64)
+        self.data = np.empty((SampleBuffer.INITIAL_CAPACITY, number_of_columns - 1), dtype=dtype)
+        self.size = 0
+
+    def append(self, rows):
+        rows = np.asarray(rows, dtype=np.float64)
+        if len(rows) == 0:
+            return
+
+        required = self.size + len(rows)
+        if required > len(self.data):
+            # Grow geometrically so a night of uploads costs amortized O(1) copies per sample
+            capacity = len(self.data)
+            while capacity < required:
+                capacity = capacity * 2
+            grown_timestamps = np.empty(capacity, dtype=self.timestamps.dtype)
+            grown_timestamps[0:self.size] = self.timestamps[0:self.size]
+            self.timestamps = grown_timestamps
+            grown = np.empty((capacity, self.data.shape[1]), dtype=self.data.dtype)
+            grown[0:self.size] = self.data[0:self.size]
+            self.data = grown
+
+        self.timestamps[self.size:required] = rows[:, 0]
+        self.data[self.size:required] = rows[:, 1:]
+        self.size = required
+
+    def clear(self):
+        self.size = 0
+
+    def values(self):
+        return np.column_stack((self.timestamps[0:self.size], self.data[0:self.size]))
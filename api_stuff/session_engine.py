@@ -0,0 +1,228 @@
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+from source import utils
+from source.preprocessing.activity_count.activity_count_feature_service import ActivityCountFeatureService
+from source.preprocessing.activity_count.activity_count_service import ActivityCountService
+from source.preprocessing.epoch import Epoch
+from source.preprocessing.heart_rate.heart_rate_feature_service import HeartRateFeatureService
+from source.preprocessing.time.time_based_feature_service import TimeBasedFeatureService
+from idle_sessions import IdleSessions
+from load_data import LoadData
+from metrics import Metrics
+from session_state import SessionState
+
+
+class SessionEngine(object):
+    MINIMUM_EPOCHS = 10
+    sessions = {}
+    sessions_lock = threading.Lock()
+    idle_sessions = IdleSessions()
+
+    @staticmethod
+    def get_session(session_id):
+        with SessionEngine.sessions_lock:
+            SessionEngine.evict_idle_sessions()
+            SessionEngine.idle_sessions.touch(session_id)
+            if session_id not in SessionEngine.sessions:
+                SessionEngine.sessions[session_id] = SessionState(session_id)
+            return SessionEngine.sessions[session_id]
+
+    @staticmethod
+    def reset_session(session_id):
+        with SessionEngine.sessions_lock:
+            SessionEngine.evict_idle_sessions()
+            SessionEngine.idle_sessions.touch(session_id)
+            SessionEngine.sessions[session_id] = SessionState(session_id)
+
+    @staticmethod
+    def evict_idle_sessions():
+        # an evicted session that comes back is rebuilt from the samples kept by SessionStore
+        for session_id in SessionEngine.idle_sessions.pop_expired():
+            SessionEngine.sessions.pop(session_id, None)
+
+    @staticmethod
+    def append(session_id, accel_data, hr_data):
+        state = SessionEngine.get_session(session_id)
+        with Metrics.stage('crop'):
+            motion = SessionEngine.to_samples(accel_data['timestamp'], accel_data['z'])
+            heart_rate = SessionEngine.to_samples(hr_data['timestamp'], hr_data['HR'])
+
+        with state.lock:
+            number_of_epochs = len(state.epoch_timestamps)
+
+            if state.start_time is None:
+                state.pending_motion = np.vstack((state.pending_motion, motion))
+                state.pending_heart_rate = np.vstack((state.pending_heart_rate, heart_rate))
+                if len(state.pending_motion) == 0 or len(state.pending_heart_rate) == 0:
+                    return 0
+
+                state.start_time = max(np.amin(state.pending_motion[:, 0]),
+                                       np.amin(state.pending_heart_rate[:, 0]), 0)
+                state.next_epoch_timestamp = math.ceil(state.start_time / Epoch.DURATION) * Epoch.DURATION
+                motion = state.pending_motion
+                heart_rate = state.pending_heart_rate
+                state.pending_motion = np.zeros((0, 2))
+                state.pending_heart_rate = np.zeros((0, 2))
+
+            with Metrics.stage('activity_counts'):
+                SessionEngine.consume_motion(state, motion)
+            with Metrics.stage('hr_features'):
+                SessionEngine.consume_heart_rate(state, heart_rate)
+            with Metrics.stage('epoch_features'):
+                SessionEngine.finalize_epochs(state)
+
+            return len(state.epoch_timestamps) - number_of_epochs
+
+    @staticmethod
+    def to_samples(timestamps, values):
+        samples = np.column_stack((np.asarray(timestamps, dtype=float), np.asarray(values, dtype=float)))
+        if len(samples) == 0:
+            return np.zeros((0, 2))
+        return utils.remove_repeats(samples)
+
+    @staticmethod
+    def get_new_samples(state, samples, last_sample):
+        samples = samples[samples[:, 0] >= state.start_time]
+        if last_sample is not None:
+            samples = samples[samples[:, 0] > last_sample[0]]
+        return samples
+
+    @staticmethod
+    def get_occupied_epochs(timestamps):
+        return set(np.unique(timestamps - np.mod(timestamps, Epoch.DURATION)).tolist())
+
+    @staticmethod
+    def interpolate_new(origin, first_index, step, known_samples):
+        last_index = int(np.floor((known_samples[-1, 0] - origin) / step)) + 1
+        grid = origin + np.arange(first_index, max(last_index, first_index)) * step
+        grid = grid[grid <= known_samples[-1, 0]]
+        return np.interp(grid, known_samples[:, 0], known_samples[:, 1])
+
+    @staticmethod
+    def consume_motion(state, samples):
+        samples = SessionEngine.get_new_samples(state, samples, state.last_motion_sample)
+        if len(samples) == 0:
+            return
+
+        state.motion_epochs.update(SessionEngine.get_occupied_epochs(samples[:, 0]))
+
+        if state.motion_origin is None:
+            state.motion_origin = samples[0, 0]
+            known_samples = samples
+        else:
+            known_samples = np.vstack((state.last_motion_sample, samples))
+
+        step = 1.0 / ActivityCountService.SAMPLING_FREQUENCY
+        z_new = SessionEngine.interpolate_new(state.motion_origin, state.resampled_count, step, known_samples)
+
+        state.resampled_count = state.resampled_count + len(z_new)
+        state.last_motion_sample = samples[-1]
+
+        state.activity_counter.append(z_new)
+
+    @staticmethod
+    def consume_heart_rate(state, samples):
+        samples = SessionEngine.get_new_samples(state, samples, state.last_heart_rate_sample)
+        if len(samples) == 0:
+            return
+
+        state.heart_rate_epochs.update(SessionEngine.get_occupied_epochs(samples[:, 0]))
+
+        if state.heart_rate_origin is None:
+            state.heart_rate_origin = samples[0, 0]
+            known_samples = samples
+        else:
+            known_samples = np.vstack((state.last_heart_rate_sample, samples))
+
+        hr_new = SessionEngine.interpolate_new(state.heart_rate_origin, state.heart_rate_count, 1.0, known_samples)
+
+        state.heart_rate_count = state.heart_rate_count + len(hr_new)
+        state.heart_rate_sum = state.heart_rate_sum + np.sum(hr_new)
+        state.last_heart_rate_sample = samples[-1]
+
+        state.heart_rate_convolution.append(hr_new)
+
+    @staticmethod
+    def get_window_indices(origin, epoch_timestamp):
+        start_time = epoch_timestamp - ActivityCountFeatureService.WINDOW_SIZE
+        end_time = epoch_timestamp + Epoch.DURATION + ActivityCountFeatureService.WINDOW_SIZE
+        first_index = max(0, int(np.floor(start_time - origin)) + 1)
+        last_index = int(np.ceil(end_time - origin))
+        return first_index, last_index
+
+    @staticmethod
+    def finalize_epochs(state):
+        counts = state.activity_counter.counts
+        if state.motion_origin is None or state.heart_rate_origin is None or len(counts) == 0:
+            return
+
+        # Counts are placed on their true 15 s cadence. The batch pipeline spreads them with
+        # np.linspace(first, last sample, n) instead, which stretches the grid by up to one count interval by the
+        # end of the night; matching it would move every finalized count whenever a new sample arrives
+        count_timestamps = state.motion_origin + np.arange(len(counts)) * ActivityCountService.EPOCH_DURATION
+        last_count_second = count_timestamps[-1] - state.motion_origin
+
+        while True:
+            epoch_timestamp = state.next_epoch_timestamp
+            count_first, count_last = SessionEngine.get_window_indices(state.motion_origin, epoch_timestamp)
+            hr_first, hr_last = SessionEngine.get_window_indices(state.heart_rate_origin, epoch_timestamp)
+
+            if count_last - 1 > last_count_second or hr_last > len(state.heart_rate_convolution.convolved):
+                return
+
+            if epoch_timestamp in state.motion_epochs and epoch_timestamp in state.heart_rate_epochs:
+                count_grid = state.motion_origin + np.arange(count_first, count_last)
+                count_values = np.interp(count_grid, count_timestamps, counts)
+                hr_values = state.heart_rate_convolution.convolved[hr_first:hr_last]
+
+                state.epoch_timestamps.append(epoch_timestamp)
+                state.count_features.append(utils.smooth_gauss(count_values, len(count_values)))
+                state.heart_rate_std_features.append(np.std(hr_values))
+                state.heart_rate_mean_features.append(np.mean(hr_values))
+
+            state.next_epoch_timestamp = epoch_timestamp + Epoch.DURATION
+
+    @staticmethod
+    def get_features(session_id):
+        state = SessionEngine.get_session(session_id)
+
+        with state.lock:
+            if len(state.epoch_timestamps) < SessionEngine.MINIMUM_EPOCHS:
+                return None
+
+            epoch_timestamps = np.array(state.epoch_timestamps)
+            with Metrics.stage('hr_features'):
+                hr_std, hr_mean = SessionEngine.normalize_heart_rate(state)
+            count_features = np.array(state.count_features)
+
+        with Metrics.stage('time_features'):
+            elapsed = epoch_timestamps - epoch_timestamps[0]
+            df = pd.DataFrame({
+                'cosine_feature': TimeBasedFeatureService.cosine_proxy(elapsed),
+                'count_feature': count_features,
+                'hr_std': hr_std,
+                'hr_mean': hr_mean,
+                'time_feature': elapsed / 3600.0,
+            })
+
+        with Metrics.stage('lag_engineering'):
+            return LoadData.engineer_features(df)
+
+    @staticmethod
+    def normalize_heart_rate(state):
+        # The batch pipeline subtracts the night mean before the DoG convolution and divides by the 90th
+        # percentile afterwards; both are applied here so earlier epochs track the growing night exactly
+        box = utils.get_dog_kernel(HeartRateFeatureService.WINDOW_SIZE)
+        offset = state.heart_rate_sum / state.heart_rate_count * np.sum(box)
+
+        scalar = np.percentile(np.abs(state.heart_rate_convolution.convolved - offset), 90)
+        if scalar == 0:
+            scalar = 1.0
+
+        hr_std = np.array(state.heart_rate_std_features) / scalar
+        hr_mean = (np.array(state.heart_rate_mean_features) - offset) / scalar
+        return hr_std, hr_mean
@@ -0,0 +1,24 @@
+import re
+from datetime import datetime
+
+
+class SessionKey(object):
+    VALID_SESSION_ID = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+    legacy_session_id = datetime.now().strftime("%Y%m%d")
+
+    @staticmethod
+    def get_session_id(record, default=None):
+        session_id = record.get('sessionId', record.get('deviceId', default))
+
+        if session_id is None:
+            # older watch builds send no id; a new night starts when their timestamps restart
+            accel_timestamp = record['accel_timestamp']
+            if len(accel_timestamp) > 0 and accel_timestamp[0] < 10:
+                SessionKey.legacy_session_id = datetime.now().strftime("%Y%m%d")
+            return SessionKey.legacy_session_id
+
+        session_id = str(session_id)
+        if not SessionKey.VALID_SESSION_ID.match(session_id):
+            # ids end up in file names, so only allow a conservative character set
+            raise ValueError(f"invalid session id {session_id!r}")
+        return session_id
@@ -0,0 +1,29 @@
+from metrics import Metrics
+from prediction_cache import PredictionCache
+from run_model import Model
+from session_engine import SessionEngine
+from session_store import SessionStore
+
+
+class SessionPredictor(object):
+
+    @staticmethod
+    def predict(session_id, uploads):
+        for accel_data, hr_data in uploads:
+            # if new data session, reset the incremental state
+            if len(accel_data['timestamp']) > 0 and accel_data['timestamp'][0] < 10:
+                SessionEngine.reset_session(session_id)
+                PredictionCache.reset_session(session_id)
+            elif session_id not in SessionEngine.sessions:
+                # server restarted mid-night: rebuild the features from the recovered samples
+                restored_accel_data, restored_hr_data = SessionStore.get_samples(session_id)
+                SessionEngine.append(session_id, restored_accel_data, restored_hr_data)
+            SessionEngine.append(session_id, accel_data, hr_data)
+
+        data = SessionEngine.get_features(session_id)
+        if data is None:
+            print(f"not enough data for session {session_id}")
+            return None
+
+        with Metrics.stage('model_predict'):
+            return Model.predict(data, session_id)
@@ -0,0 +1,42 @@
+import threading
+
+import numpy as np
+
+from source.preprocessing.activity_count.streaming_activity_counter import StreamingActivityCounter
+from source.preprocessing.heart_rate.heart_rate_feature_service import HeartRateFeatureService
+from source.preprocessing.heart_rate.incremental_dog_convolution import IncrementalDogConvolution
+
+
+class SessionState(object):
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.lock = threading.Lock()
+
+        # Crop interval start; fixed once both motion and heart rate have arrived
+        self.start_time = None
+        self.pending_motion = np.zeros((0, 2))
+        self.pending_heart_rate = np.zeros((0, 2))
+
+        # Activity counts: 50 Hz resampled z axis streamed through the band-pass filter into finalized counts
+        self.motion_origin = None
+        self.last_motion_sample = None
+        self.resampled_count = 0
+        self.activity_counter = StreamingActivityCounter()
+
+        # Heart rate: 1 Hz interpolation tail and the finalized (unshifted) DoG convolution
+        self.heart_rate_origin = None
+        self.last_heart_rate_sample = None
+        self.heart_rate_count = 0
+        self.heart_rate_sum = 0.0
+        self.heart_rate_convolution = IncrementalDogConvolution(HeartRateFeatureService.WINDOW_SIZE)
+
+        # Epochs that contain at least one sample of each stream
+        self.motion_epochs = set()
+        self.heart_rate_epochs = set()
+
+        # Per-epoch features, stored before the night-level heart rate normalization
+        self.next_epoch_timestamp = None
+        self.epoch_timestamps = []
+        self.count_features = []
+        self.heart_rate_std_features = []
+        self.heart_rate_mean_features = []
@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from idle_sessions import IdleSessions
+from stored_session import StoredSession
+
+
+class SessionStore(object):
+    SNAPSHOT_DIRECTORY = 'data/sessions/'
+    START_TIME_DIRECTORY = 'sleep_data_logs/'
+    SNAPSHOT_INTERVAL = 300  # seconds between crash-recovery snapshots of a session
+    sessions = {}
+    sessions_lock = threading.Lock()
+    idle_sessions = IdleSessions()
+
+    @staticmethod
+    def get_session(session_id):
+        with SessionStore.sessions_lock:
+            SessionStore.evict_idle_sessions()
+            SessionStore.idle_sessions.touch(session_id)
+            if session_id not in SessionStore.sessions:
+                SessionStore.sessions[session_id] = SessionStore.restore(session_id)
+            return SessionStore.sessions[session_id]
+
+    @staticmethod
+    def reset_session(session_id):
+        with SessionStore.sessions_lock:
+            SessionStore.evict_idle_sessions()
+            SessionStore.idle_sessions.touch(session_id)
+            SessionStore.sessions[session_id] = StoredSession()
+
+    @staticmethod
+    def evict_idle_sessions():
+        # a final snapshot keeps an evicted session recoverable if it uploads again
+        for session_id in SessionStore.idle_sessions.pop_expired():
+            session = SessionStore.sessions.pop(session_id, None)
+            if session is not None:
+                with session.lock:
+                    SessionStore.write_snapshot(session_id, session)
+
+    @staticmethod
+    def append(session_id, accel_data, hr_data, absolute_start_time=None):
+        # if new data session, reset the stored samples
+        if len(accel_data['timestamp']) > 0 and accel_data['timestamp'][0] < 10:
+            SessionStore.reset_session(session_id)
+        session = SessionStore.get_session(session_id)
+
+        with session.lock:
+            session.motion.append(np.column_stack((accel_data['timestamp'], accel_data['x'],
+                                                   accel_data['y'], accel_data['z'])))
+            session.heart_rate.append(np.column_stack((hr_data['timestamp'], hr_data['HR'])))
+
+            if absolute_start_time is not None and absolute_start_time != session.absolute_start_time:
+                session.absolute_start_time = absolute_start_time
+                SessionStore.write_start_time(session_id, absolute_start_time)
+
+            if time.time() - session.last_snapshot_time >= SessionStore.SNAPSHOT_INTERVAL:
+                SessionStore.write_snapshot(session_id, session)
+
+    @staticmethod
+    def get_samples(session_id):
+        session = SessionStore.get_session(session_id)
+        with session.lock:
+            motion = session.motion.values()
+            heart_rate = session.heart_rate.values()
+
+        accel_data = {'timestamp': motion[:, 0], 'x': motion[:, 1], 'y': motion[:, 2], 'z': motion[:, 3]}
+        hr_data = {'timestamp': heart_rate[:, 0], 'HR': heart_rate[:, 1]}
+        return accel_data, hr_data
+
+    @staticmethod
+    def get_snapshot_path(session_id):
+        return SessionStore.SNAPSHOT_DIRECTORY + session_id + '_session.npz'
+
+    @staticmethod
+    def write_snapshot(session_id, session):
+        os.makedirs(SessionStore.SNAPSHOT_DIRECTORY, exist_ok=True)
+        path = SessionStore.get_snapshot_path(session_id)
+        temporary_path = path + '.tmp'
+
+        with open(temporary_path, 'wb') as file:
+            np.savez(file, motion=session.motion.values(), heart_rate=session.heart_rate.values())
+        os.replace(temporary_path, path)
+        session.last_snapshot_time = time.time()
+
+    @staticmethod
+    def snapshot(session_id):
+        session = SessionStore.get_session(session_id)
+        with session.lock:
+            SessionStore.write_snapshot(session_id, session)
+
+    @staticmethod
+    def restore(session_id):
+        session = StoredSession()
+        path = SessionStore.get_snapshot_path(session_id)
+        if os.path.exists(path):
+            with np.load(path) as snapshot:
+                session.motion.append(snapshot['motion'])
+                session.heart_rate.append(snapshot['heart_rate'])
+        return session
+
+    @staticmethod
+    def write_start_time(session_id, absolute_start_time):
+        os.makedirs(SessionStore.START_TIME_DIRECTORY, exist_ok=True)
+        with open(SessionStore.START_TIME_DIRECTORY + 'start_time_' + session_id + '.json', 'w') as f:
+            json.dump({"startTime": absolute_start_time}, f)
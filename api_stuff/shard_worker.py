@@ -0,0 +1,26 @@
+from prediction_queue import PredictionQueue
+from session_predictor import SessionPredictor
+from session_store import SessionStore
+
+
+class ShardWorker(object):
+
+    @staticmethod
+    def run(shard_index, upload_queue, result_queue, number_of_workers):
+        print(f"session shard {shard_index} started")
+        prediction_queue = PredictionQueue(SessionPredictor.predict, number_of_workers=number_of_workers,
+                                           store=SessionStore.append,
+                                           on_result=lambda session_id, result: result_queue.put(
+                                               ('result', session_id, result)),
+                                           on_trace=lambda session_id, trace: result_queue.put(
+                                               ('trace', session_id, trace)))
+
+        while True:
+            message = upload_queue.get()
+            if message is None:
+                break
+            session_id, upload, absolute_start_time = message
+            prediction_queue.ingest(session_id, upload, absolute_start_time)
+
+        prediction_queue.wait_until_idle()
+        prediction_queue.stop()
@@ -0,0 +1,76 @@
+import multiprocessing
+import threading
+
+from hash_ring import HashRing
+from idle_sessions import IdleSessions
+from metrics import Metrics
+from prediction_queue import PredictionQueue
+from shard_worker import ShardWorker
+
+
+class ShardedPredictionQueue(object):
+    def __init__(self, number_of_shards, number_of_workers=2):
+        # fork so the shards inherit the already loaded models; must run before any other threads start
+        context = multiprocessing.get_context('fork')
+        self.ring = HashRing(range(number_of_shards))
+        self.lock = threading.Lock()
+        self.sequence_numbers = {}
+        self.results = {}
+        self.idle_sessions = IdleSessions()
+
+        self.upload_queues = [context.Queue() for _ in range(number_of_shards)]
+        self.result_queue = context.Queue()
+        self.shards = [context.Process(target=ShardWorker.run,
+                                       args=(shard_index, self.upload_queues[shard_index], self.result_queue,
+                                             number_of_workers),
+                                       daemon=True)
+                       for shard_index in range(number_of_shards)]
+        for shard in self.shards:
+            shard.start()
+
+        self.listener = threading.Thread(target=self.collect_results, daemon=True)
+        self.listener.start()
+
+    def get_shard(self, session_id):
+        return self.ring.get_node(session_id)
+
+    def ingest(self, session_id, upload, absolute_start_time=None):
+        # sequence numbers are assigned here, in arrival order; the shard sees the uploads in the same order
+        with self.lock:
+            for idle_session_id in self.idle_sessions.pop_expired():
+                self.sequence_numbers.pop(idle_session_id, None)
+                self.results.pop(idle_session_id, None)
+            self.idle_sessions.touch(session_id)
+            sequence_number = self.sequence_numbers.get(session_id, 0) + 1
+            self.sequence_numbers[session_id] = sequence_number
+            self.upload_queues[self.get_shard(session_id)].put((session_id, upload, absolute_start_time))
+        return sequence_number
+
+    def collect_results(self):
+        while True:
+            message = self.result_queue.get()
+            if message is None:
+                return
+            kind, session_id, value = message
+            if kind == 'trace':
+                # stage timings are recorded in the shard process; copy every trace into this process's /metrics
+                Metrics.record_trace(PredictionQueue.METRICS_ENDPOINT, value)
+            else:
+                with self.lock:
+                    self.results[session_id] = value
+
+    def get_sequence_number(self, session_id):
+        with self.lock:
+            return self.sequence_numbers.get(session_id)
+
+    def get_result(self, session_id):
+        with self.lock:
+            return self.results.get(session_id)
+
+    def stop(self):
+        for upload_queue in self.upload_queues:
+            upload_queue.put(None)
+        for shard in self.shards:
+            shard.join()
+        self.result_queue.put(None)
+        self.listener.join()
@@ -0,0 +1,13 @@
+import threading
+import time
+
+from sample_buffer import SampleBuffer
+
+
+class StoredSession(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.motion = SampleBuffer(4)  # timestamp, x, y, z
+        self.heart_rate = SampleBuffer(2)  # timestamp, heart rate
+        self.absolute_start_time = None
+        self.last_snapshot_time = time.time()
@@ -2,34 +2,99 @@ import sys
 import os
 import json
 import math
-from datetime import datetime
-from flask import Flask, jsonify, request
+import time
+from flask import Flask, Response, g, jsonify, request
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
-file_number = datetime.now().strftime("%Y%m%d")
-# file_number = "20241222"
-# file_number = "20251225"
-print(f"date: {file_number}")
 
-from source.preprocessing2.preprocessing_runner import runner
-from load_data import LoadData
-from run_model import Model
+from binary_payload import BinaryPayload
+from metrics import Metrics
+from model_registry import ModelRegistry
+from prediction_queue import PredictionQueue
+from session_key import SessionKey
+from session_predictor import SessionPredictor
+from session_store import SessionStore
+from sharded_prediction_queue import ShardedPredictionQueue
+
+ModelRegistry.preload()
+number_of_shards = int(os.environ.get('SESSION_SHARDS', 1))
+number_of_workers = int(os.environ.get('PREDICTION_WORKERS', 2))
+if number_of_shards > 1:
+    # each session is pinned to one shard process by a consistent hash of its id
+    prediction_queue = ShardedPredictionQueue(number_of_shards, number_of_workers=number_of_workers)
+else:
+    prediction_queue = PredictionQueue(SessionPredictor.predict, number_of_workers=number_of_workers,
+                                       store=SessionStore.append)
 
 app = Flask(__name__)
 
+@app.before_request
+def start_request_trace():
+    g.request_start_time = time.perf_counter()
+    Metrics.start_trace()
+
+@app.after_request
+def record_request_trace(response):
+    trace = Metrics.end_trace()
+    if trace is None or request.url_rule is None:
+        return response
+    trace['total'] = time.perf_counter() - g.request_start_time
+    Metrics.record_trace(request.url_rule.rule, trace)
+
+    # optional per-request breakdown, e.g. curl -H 'X-Trace: 1'
+    if request.headers.get('X-Trace'):
+        response.headers['Server-Timing'] = Metrics.format_server_timing(trace)
+    return response
+
+@app.route('/metrics')
+def metrics():
+    return Response(Metrics.to_prometheus(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/hello')
 def hello_world():
-    # runner.run_preprocessing(["20251213", "20251214", "20251215", "20251217"])
     return jsonify(message='Hello World')
 
 @app.route('/data', methods=["POST"])
 def receive():
-    if request.is_json:
+    with Metrics.stage('decode'):
+        uploads = get_uploads()
+    if not isinstance(uploads, list):
+        return uploads
+
+    with Metrics.stage('storage'):
+        for session_id, upload, absolute_start_time in uploads:
+            sequence_number = prediction_queue.ingest(session_id, upload, absolute_start_time)
+
+    # featurization and inference run on the prediction workers; reply with the latest finished result
+    response = {'session': session_id, 'sequence': sequence_number}
+    result = prediction_queue.get_result(session_id)
+    if result is not None:
+        response['predictions'] = result['predictions'][-10:].tolist()
+        response['model_version'] = result['model_version']
+        response['predictions_sequence'] = result['sequence']
+        if request.headers.get('X-Trace'):
+            response['prediction_trace'] = {stage: seconds * 1000 for stage, seconds in result['trace'].items()}
+    return jsonify(response), 202
+
+def get_uploads():
+    if request.mimetype == BinaryPayload.CONTENT_TYPE:
+        try:
+            data_list = [BinaryPayload.to_record(BinaryPayload.decode(request.get_data()))]
+        except (ValueError, KeyError) as error:
+            return jsonify(message=f"Invalid binary payload: {error}"), 400
+    elif request.is_json:
         json_data = request.get_json()
         data_list = json_data if isinstance(json_data, list) else [json_data]
+    else:
+        return jsonify(message="Request was not JSON"), 400
+    if len(data_list) == 0:
+        return jsonify(message="Request had no uploads"), 400
 
-        for JSONData in data_list:
+    uploads = []
+    for JSONData in data_list:
+        try:
+            session_id = SessionKey.get_session_id(JSONData, default=request.headers.get('X-Session-Id'))
             accelData = {
                 'x': JSONData['x'],
                 'y': JSONData['y'],
@@ -40,37 +105,46 @@ def receive():
                 'HR': JSONData['heartRate'],
                 'timestamp': JSONData['heartRate_timestamp']
             }
-            absolute_start_time = JSONData.get('absoluteStartTime', None)
-
-            print(f"x length: {len(accelData['x'])}")
-            print(f"y length: {len(accelData['y'])}")
-            print(f"z length: {len(accelData['z'])}")
-            print(f"time length: {len(accelData['timestamp'])}")
-            print(f"hr length: {len(HRData['HR'])}")
-            print(f"hr time length: {len(HRData['timestamp'])}")
-
-            file_number_as_str = str(file_number)
-
-            LoadData.write_data_to_files(accelData, HRData, file_number_as_str, absolute_start_time)
-        runner.run_preprocessing([file_number_as_str])
-        data = LoadData.get_features(file_number_as_str)
-
-        if data is not None:
-            predictions = Model.run_model(data, file_number_as_str)
-            predictions = predictions[-10:]
-            print(predictions)
-            return jsonify(predictions=predictions.tolist())
-        print("not enough data")
-        return jsonify(message="not enough data to make prediction"), 500
+        except KeyError as error:
+            return jsonify(message=f"Upload is missing field {error}"), 400
+        except (ValueError, TypeError) as error:
+            return jsonify(message=str(error)), 400
+        absolute_start_time = JSONData.get('absoluteStartTime', None)
+
+        print(f"x length: {len(accelData['x'])}")
+        print(f"y length: {len(accelData['y'])}")
+        print(f"z length: {len(accelData['z'])}")
+        print(f"time length: {len(accelData['timestamp'])}")
+        print(f"hr length: {len(HRData['HR'])}")
+        print(f"hr time length: {len(HRData['timestamp'])}")
+
+        uploads.append((session_id, (accelData, HRData), absolute_start_time))
+    return uploads
+
+@app.route('/predictions/<session_id>', methods=["GET"])
+def get_predictions(session_id):
+    result = prediction_queue.get_result(session_id)
+    if result is None:
+        return jsonify(message="no predictions for session yet", session=session_id,
+                       sequence=prediction_queue.get_sequence_number(session_id)), 404
+
+    return jsonify(session=session_id,
+                   predictions=result['predictions'][-10:].tolist(),
+                   model_version=result['model_version'],
+                   predictions_sequence=result['sequence'],
+                   sequence=prediction_queue.get_sequence_number(session_id))
     
 @app.route('/sleep_data', methods=["POST"])
 def receive_sleep_data():
     if request.is_json:
         sleep_data = request.get_json()
+        session_id = sleep_data.get('sessionId', request.headers.get('X-Session-Id', SessionKey.legacy_session_id))
+        if not SessionKey.VALID_SESSION_ID.match(str(session_id)):
+            return jsonify(message=f"invalid session id {session_id!r}"), 400
         sleep_data = sleep_data['sleepSegments']
         
         save_dir = 'sleep_data_logs'            
-        filename = f"{save_dir}/sleep_data_{file_number}.json"
+        filename = f"{save_dir}/sleep_data_{session_id}.json"
         
         with open(filename, 'w') as f:
             json.dump(sleep_data, f, indent=4)
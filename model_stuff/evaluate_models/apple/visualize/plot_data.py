@@ -18,8 +18,14 @@ class PlotData():
         with open(apple_file_path, 'r') as f:
             apple_data = json.load(f)
 
+        # results are an append-only log of "<epoch index> <stage>" lines; the last line for an epoch wins
+        model_results = {}
         with open(model_results_path, 'r') as f:
-            model_raw_values = [int(line.strip()) for line in f if line.strip().isdigit()]
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    model_results[int(parts[0])] = int(parts[1])
+        model_raw_values = [model_results[i] for i in sorted(model_results)]
 
         df_apple = pd.DataFrame(apple_data)
         # Ensure Apple data is also treated as UTC (it usually is by default if 'Z' is present)
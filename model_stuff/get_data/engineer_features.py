@@ -1,7 +1,14 @@
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')))
+
+from source.preprocessing.feature_store import FeatureStore
+
 subjects_as_ints = [
     46343, 759667, 781756, 844359, 1066528, 1360686, 1449548, 1455390,
     1818471, 2598705, 2638030, 3509524, 3997827, 4018081, 4314139, 4426783,
@@ -14,39 +21,17 @@ data = []
 
 for i in subjects_as_ints:
     subject_number = str(i)
-    cosine_features = []
-    count_features = []
-    hr_std_features = []
-    hr_mean_features = []
-    time_features = []
-    psg_labels = []
-
-    cosine = np.load("outputs_lab/features/" + subject_number + "_cosine_feature.npy")
-    cosine_features = cosine.tolist()
-
-    count = np.load("outputs_lab/features/" + subject_number + "_count_feature.npy")
-    count_features = count.tolist()
-
-    hr_std = np.load("outputs_lab/features/" + subject_number + "_hr_feature.npy")
-    hr_std_features = hr_std.tolist()
-    
-    hr_mean = np.load("outputs_lab/features/" + subject_number + "_hr_mean_feature.npy")
-    hr_mean_features = hr_mean.tolist()
-            
-    time = np.load("outputs_lab/features/" + subject_number + "_time_feature.npy")
-    time_features = time.tolist()
-
-    psg = np.load("outputs_lab/features/" + subject_number + "_psg_labels.npy")
-    psg = np.where(psg == 4, 3, psg)  
-    psg_labels = psg.astype(int).tolist()
-    
+    features = FeatureStore.load(subject_number)
+
+    psg = np.where(features['psg_label'] == 4, 3, features['psg_label'])
+
     df = pd.DataFrame({
-        'cosine_feature': cosine_features,
-        'count_feature': count_features,
-        'hr_std': hr_std_features,
-        'hr_mean': hr_mean_features,
-        'time_feature': time_features,
-        'psg_label': psg_labels
+        'cosine_feature': features['cosine_feature'],
+        'count_feature': features['count_feature'],
+        'hr_std': features['hr_std'],
+        'hr_mean': features['hr_mean'],
+        'time_feature': features['time_feature'],
+        'psg_label': psg.astype(int)
     })
 
     # hr_mean_diff = df['hr_mean'] - df['hr_mean'].shift(1)
@@ -1,4 +1,12 @@
 import csv
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')))
+
+from source.preprocessing.feature_store import FeatureStore
 
 subjects_as_ints = [
     9106476, 9618981, 9961348
@@ -23,34 +31,15 @@ psg_labels = []
 for i in subjects_as_ints:
     subject_number = str(i)
 
-    with open("outputs_lab/features/" + subject_number + "_cosine_feature.out", 'r') as file:
-        for line in file:
-            cosine_features.append(float(line))
-
-    with open("outputs_lab/features/" + subject_number + "_count_feature.out", 'r') as file:
-        for line in file:
-            count_features.append(float(line))
-
-    with open("outputs_lab/features/" + subject_number + "_hr_feature.out", 'r') as file:
-        for line in file:
-            parts = line.strip().split()
-            hr_std_features.append(float(parts[0]))
-            if len(parts) > 1:
-                hr_mean_features.append(float(parts[1]))
-            else:
-                hr_mean_features.append(0.0)
-            
-    with open("outputs_lab/features/" + subject_number + "_time_feature.out", 'r') as file:
-        for line in file:
-            time_features.append(float(line))
-
-    with open("outputs_lab/features/" + subject_number + "_psg_labels.out", 'r') as file:
-        for line in file:
-            line = line.strip()
-            psg_labels.append(3 if int(float(line)) == 4 else int(float(line)))
-            # if int(float(line)) == 4:
-            #     print(f'subject {subject_number}')
-            #     print(line)
+    features = FeatureStore.load(subject_number)
+    cosine_features += features['cosine_feature'].tolist()
+    count_features += features['count_feature'].tolist()
+    hr_std_features += features['hr_std'].tolist()
+    hr_mean_features += features['hr_mean'].tolist()
+    time_features += features['time_feature'].tolist()
+
+    psg = np.where(features['psg_label'] == 4, 3, features['psg_label'])
+    psg_labels += psg.astype(int).tolist()
 
     # print(len(cosine_features))
     # print(len(count_features))
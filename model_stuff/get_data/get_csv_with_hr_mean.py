@@ -1,5 +1,12 @@
-import numpy as np
 import csv
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')))
+
+from source.preprocessing.feature_store import FeatureStore
 
 subjects_as_ints = [
     9106476, 9618981, 9961348
@@ -24,23 +31,14 @@ psg_labels = []
 for i in subjects_as_ints:
     subject_number = str(i)
 
-    cosine = np.load("outputs_lab/features/" + subject_number + "_cosine_feature.npy")
-    cosine_features += cosine.tolist()
-
-    count = np.load("outputs_lab/features/" + subject_number + "_count_feature.npy")
-    count_features += count.tolist()
-
-    hr_std = np.load("outputs_lab/features/" + subject_number + "_hr_feature.npy")
-    hr_std_features += hr_std.tolist()
-    
-    hr_mean = np.load("outputs_lab/features/" + subject_number + "_hr_mean_feature.npy")
-    hr_mean_features += hr_mean.tolist()
-            
-    time = np.load("outputs_lab/features/" + subject_number + "_time_feature.npy")
-    time_features += time.tolist()
+    features = FeatureStore.load(subject_number)
+    cosine_features += features['cosine_feature'].tolist()
+    count_features += features['count_feature'].tolist()
+    hr_std_features += features['hr_std'].tolist()
+    hr_mean_features += features['hr_mean'].tolist()
+    time_features += features['time_feature'].tolist()
 
-    psg = np.load("outputs_lab/features/" + subject_number + "_psg_labels.npy")
-    psg = np.where(psg == 4, 3, psg)  
+    psg = np.where(features['psg_label'] == 4, 3, features['psg_label'])
     psg_labels += psg.astype(int).tolist()
 
     # print(f"Finished subject {subject_number}")
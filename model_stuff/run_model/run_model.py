@@ -5,6 +5,7 @@ from datetime import datetime
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(current_dir, '..', '..'))
 sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'api_stuff'))
 
 from api_stuff.load_data import LoadData
 from api_stuff.run_model import Model
@@ -3,6 +3,7 @@ import time
 from sklearn.neural_network import MLPClassifier
 
 from source import utils
+from source.analysis.classification.classifier_pool import ClassifierPool
 from source.analysis.classification.classifier_summary_builder import SleepWakeClassifierSummaryBuilder, \
     ThreeClassClassifierSummaryBuilder
 from source.analysis.figures.curve_plot_builder import CurvePlotBuilder
@@ -195,6 +196,7 @@ if __name__ == "__main__":
     # figures_mesa_three_class()
     #
     # figures_compare_time_based_features()
+    ClassifierPool.close()
     end_time = time.time()
 
     print('Elapsed time to generate figure: ' + str((end_time - start_time) / 60) + ' minutes')
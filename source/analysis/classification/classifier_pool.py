@@ -0,0 +1,50 @@
+import atexit
+from multiprocessing import Pool, cpu_count
+
+from source.analysis.classification.classifier_input_builder import ClassifierInputBuilder
+from source.analysis.classification.shared_design_matrix import SharedDesignMatrix
+
+
+class ClassifierPool(object):
+    pool = None
+    published = {}
+
+    @staticmethod
+    def get_pool():
+        # One pool serves every classifier and feature set until close, which also runs at exit
+        if ClassifierPool.pool is None:
+            ClassifierPool.pool = Pool(cpu_count())
+            atexit.register(ClassifierPool.close)
+        return ClassifierPool.pool
+
+    @staticmethod
+    def publish(subject_dictionary, feature_set):
+        key = tuple(feature_set)
+        cached_dictionary, shared_design_matrix, _ = ClassifierPool.published.get(key, (None, None, None))
+        if cached_dictionary is not subject_dictionary:
+            ClassifierPool.release(key)
+            design_matrix = ClassifierInputBuilder.get_design_matrix(subject_dictionary, feature_set)
+            shared_design_matrix, shared_memories = SharedDesignMatrix.publish(design_matrix)
+            ClassifierPool.published[key] = (subject_dictionary, shared_design_matrix, shared_memories)
+        return shared_design_matrix
+
+    @staticmethod
+    def release(key):
+        if key not in ClassifierPool.published:
+            return
+        _, shared_design_matrix, shared_memories = ClassifierPool.published.pop(key)
+        shared_design_matrix.detach()
+        for shared_memory in shared_memories:
+            shared_memory.close()
+            shared_memory.unlink()
+
+    @staticmethod
+    def close():
+        if ClassifierPool.pool is not None:
+            ClassifierPool.pool.close()
+            ClassifierPool.pool.join()
+            ClassifierPool.pool = None
+            atexit.unregister(ClassifierPool.close)
+
+        for key in list(ClassifierPool.published.keys()):
+            ClassifierPool.release(key)
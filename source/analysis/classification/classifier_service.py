@@ -1,29 +1,30 @@
 import time
 from functools import partial
-from multiprocessing import Pool, cpu_count
 
 import numpy as np
 from sklearn.utils import class_weight
 
 from source.analysis.classification.classifier_input_builder import ClassifierInputBuilder
+from source.analysis.classification.classifier_pool import ClassifierPool
 from source.analysis.classification.parameter_search import ParameterSearch
 from source.analysis.performance.raw_performance import RawPerformance
+from source.analysis.setup.sleep_labeler import SleepLabeler
 from source.constants import Constants
 
 
 class ClassifierService(object):
 
     @staticmethod
-    def run_sw(data_splits, classifier, subject_dictionary, feature_set):
-        return ClassifierService.run_in_parallel(ClassifierService.run_single_data_split_sw,
+    def run_sw(data_splits, classifier, subject_dictionary, feature_set, checkpoint=None):
+        return ClassifierService.run_in_parallel(ClassifierService.run_shared_data_split_sw,
                                                  data_splits, classifier,
-                                                 subject_dictionary, feature_set)
+                                                 subject_dictionary, feature_set, checkpoint)
 
     @staticmethod
-    def run_three_class(data_splits, classifier, subject_dictionary, feature_set):
-        return ClassifierService.run_in_parallel(ClassifierService.run_single_data_split_three_class,
+    def run_three_class(data_splits, classifier, subject_dictionary, feature_set, checkpoint=None):
+        return ClassifierService.run_in_parallel(ClassifierService.run_shared_data_split_three_class,
                                                  data_splits, classifier,
-                                                 subject_dictionary, feature_set)
+                                                 subject_dictionary, feature_set, checkpoint)
 
     @staticmethod
     def run_three_class_with_loaded_model(data_splits, classifier, subject_dictionary, feature_set):
@@ -48,17 +49,61 @@ class ClassifierService(object):
         return raw_performances
 
     @staticmethod
-    def run_in_parallel(function, data_splits, classifier, subject_dictionary, feature_set):
-        pool = Pool(cpu_count())
+    def run_in_parallel(function, data_splits, classifier, subject_dictionary, feature_set, checkpoint=None):
+        raw_performances = [None] * len(data_splits)
+        if checkpoint is not None:
+            design_matrix = ClassifierInputBuilder.get_design_matrix(subject_dictionary, feature_set)
+            unit_directory = checkpoint.get_unit_directory(classifier, feature_set, design_matrix)
+            raw_performances = checkpoint.load_performances(unit_directory, len(data_splits))
+        pending = [index for index, raw_performance in enumerate(raw_performances) if raw_performance is None]
+        if len(pending) == 0:
+            return raw_performances
+
+        # Features are published to shared memory once per feature set; tasks carry only subject positions
+        shared_design_matrix = ClassifierPool.publish(subject_dictionary, feature_set)
+        tasks = [(index, (shared_design_matrix,
+                          shared_design_matrix.get_positions(data_splits[index].training_set),
+                          shared_design_matrix.get_positions(data_splits[index].testing_set))) for index in pending]
+
+        single_run_wrapper = partial(ClassifierService.run_indexed_task, function=function,
+                                     attributed_classifier=classifier)
+
+        # Each split is checkpointed as soon as it finishes, so an interrupted sweep loses only running splits
+        for index, raw_performance in ClassifierPool.get_pool().imap_unordered(single_run_wrapper, tasks):
+            raw_performances[index] = raw_performance
+            if checkpoint is not None:
+                checkpoint.save(unit_directory, index, raw_performance)
 
-        single_run_wrapper = partial(function,
-                                     attributed_classifier=classifier,
-                                     subject_dictionary=subject_dictionary,
-                                     feature_set=feature_set)
+        return raw_performances
+
+    @staticmethod
+    def run_indexed_task(indexed_task, function, attributed_classifier):
+        index, task = indexed_task
+        return index, function(task, attributed_classifier)
 
-        results = pool.map(single_run_wrapper, data_splits)
+    @staticmethod
+    def run_shared_data_split_sw(task, attributed_classifier):
+        training_x, training_y, testing_x, testing_y = ClassifierService.get_shared_inputs(task)
+
+        return ClassifierService.run_single_data_split(training_x, SleepLabeler.label_sleep_wake(training_y),
+                                                       testing_x, SleepLabeler.label_sleep_wake(testing_y),
+                                                       attributed_classifier)
 
-        return results
+    @staticmethod
+    def run_shared_data_split_three_class(task, attributed_classifier):
+        training_x, training_y, testing_x, testing_y = ClassifierService.get_shared_inputs(task)
+
+        return ClassifierService.run_single_data_split(training_x, SleepLabeler.label_three_class(training_y),
+                                                       testing_x, SleepLabeler.label_three_class(testing_y),
+                                                       attributed_classifier, 'neg_log_loss')
+
+    @staticmethod
+    def get_shared_inputs(task):
+        shared_design_matrix, training_positions, testing_positions = task
+        design_matrix = shared_design_matrix.attach()
+        training_x, training_y = design_matrix.get_array_at(training_positions)
+        testing_x, testing_y = design_matrix.get_array_at(testing_positions)
+        return training_x, training_y, testing_x, testing_y
 
     @staticmethod
     def run_single_data_split_sw(data_split, attributed_classifier, subject_dictionary, feature_set):
@@ -1,5 +1,6 @@
 from source.analysis.classification.classifier_service import ClassifierService
 from source.analysis.classification.classifier_summary import ClassifierSummary
+from source.analysis.classification.sweep_checkpoint import SweepCheckpoint
 from source.analysis.setup.attributed_classifier import AttributedClassifier
 from source.analysis.setup.data_split import DataSplit
 from source.analysis.setup.feature_type import FeatureType
@@ -12,35 +13,48 @@ class SleepWakeClassifierSummaryBuilder(object):
 
     @staticmethod
     def build_monte_carlo(attributed_classifier: AttributedClassifier, feature_sets: [[FeatureType]],
-                          number_of_splits: int) -> ClassifierSummary:
+                          number_of_splits: int, resume=False) -> ClassifierSummary:
         subject_ids = SubjectBuilder.get_all_subject_ids()
         subject_dictionary = SubjectBuilder.get_subject_dictionary()
 
-        data_splits = TrainTestSplitter.by_fraction(subject_ids, test_fraction=0.3, number_of_splits=number_of_splits)
+        # Resuming reuses the splits persisted by the interrupted run instead of drawing new ones
+        checkpoint = None
+        if resume:
+            checkpoint = SweepCheckpoint.for_sweep('sleep_wake_monte_carlo_' + str(number_of_splits), subject_ids)
+            data_splits = checkpoint.get_data_splits(lambda: TrainTestSplitter.by_fraction(
+                subject_ids, test_fraction=0.3, number_of_splits=number_of_splits))
+        else:
+            data_splits = TrainTestSplitter.by_fraction(subject_ids, test_fraction=0.3,
+                                                        number_of_splits=number_of_splits)
 
         return SleepWakeClassifierSummaryBuilder.run_feature_sets(data_splits, subject_dictionary,
                                                                   attributed_classifier,
-                                                                  feature_sets)
+                                                                  feature_sets, checkpoint=checkpoint)
 
     @staticmethod
     def build_leave_one_out(attributed_classifier: AttributedClassifier,
-                            feature_sets: [[FeatureType]]) -> ClassifierSummary:
+                            feature_sets: [[FeatureType]], resume=False) -> ClassifierSummary:
         subject_ids = SubjectBuilder.get_all_subject_ids()
         subject_dictionary = SubjectBuilder.get_subject_dictionary()
 
-        data_splits = TrainTestSplitter.leave_one_out(subject_ids)
+        checkpoint = None
+        if resume:
+            checkpoint = SweepCheckpoint.for_sweep('sleep_wake_leave_one_out', subject_ids)
+            data_splits = checkpoint.get_data_splits(lambda: TrainTestSplitter.leave_one_out(subject_ids))
+        else:
+            data_splits = TrainTestSplitter.leave_one_out(subject_ids)
 
         return SleepWakeClassifierSummaryBuilder.run_feature_sets(data_splits, subject_dictionary,
                                                                   attributed_classifier,
-                                                                  feature_sets)
+                                                                  feature_sets, checkpoint=checkpoint)
 
     @staticmethod
     def run_feature_sets(data_splits: [DataSplit], subject_dictionary, attributed_classifier: AttributedClassifier,
-                         feature_sets: [[FeatureType]]):
+                         feature_sets: [[FeatureType]], checkpoint=None):
         performance_dictionary = {}
         for feature_set in feature_sets:
             raw_performance_results = ClassifierService.run_sw(data_splits, attributed_classifier,
-                                                               subject_dictionary, feature_set)
+                                                               subject_dictionary, feature_set, checkpoint)
             performance_dictionary[tuple(feature_set)] = raw_performance_results
 
         return ClassifierSummary(attributed_classifier, performance_dictionary)
@@ -73,31 +87,44 @@ class ThreeClassClassifierSummaryBuilder(object):
 
     @staticmethod
     def build_monte_carlo(attributed_classifier: AttributedClassifier, feature_sets: [[FeatureType]],
-                          number_of_splits: int) -> ClassifierSummary:
+                          number_of_splits: int, resume=False) -> ClassifierSummary:
         subject_ids = SubjectBuilder.get_all_subject_ids()
         subject_dictionary = SubjectBuilder.get_subject_dictionary()
 
-        data_splits = TrainTestSplitter.by_fraction(subject_ids, test_fraction=0.3, number_of_splits=number_of_splits)
+        # Resuming reuses the splits persisted by the interrupted run instead of drawing new ones
+        checkpoint = None
+        if resume:
+            checkpoint = SweepCheckpoint.for_sweep('three_class_monte_carlo_' + str(number_of_splits), subject_ids)
+            data_splits = checkpoint.get_data_splits(lambda: TrainTestSplitter.by_fraction(
+                subject_ids, test_fraction=0.3, number_of_splits=number_of_splits))
+        else:
+            data_splits = TrainTestSplitter.by_fraction(subject_ids, test_fraction=0.3,
+                                                        number_of_splits=number_of_splits)
 
         return ThreeClassClassifierSummaryBuilder.run_feature_sets(data_splits, subject_dictionary,
                                                                    attributed_classifier,
-                                                                   feature_sets)
+                                                                   feature_sets, checkpoint=checkpoint)
 
     @staticmethod
     def build_leave_one_out(attributed_classifier: AttributedClassifier,
-                            feature_sets: [[FeatureType]]) -> ClassifierSummary:
+                            feature_sets: [[FeatureType]], resume=False) -> ClassifierSummary:
         subject_ids = SubjectBuilder.get_all_subject_ids()
         subject_dictionary = SubjectBuilder.get_subject_dictionary()
 
-        data_splits = TrainTestSplitter.leave_one_out(subject_ids)
+        checkpoint = None
+        if resume:
+            checkpoint = SweepCheckpoint.for_sweep('three_class_leave_one_out', subject_ids)
+            data_splits = checkpoint.get_data_splits(lambda: TrainTestSplitter.leave_one_out(subject_ids))
+        else:
+            data_splits = TrainTestSplitter.leave_one_out(subject_ids)
 
         return ThreeClassClassifierSummaryBuilder.run_feature_sets(data_splits, subject_dictionary,
                                                                    attributed_classifier,
-                                                                   feature_sets)
+                                                                   feature_sets, checkpoint=checkpoint)
 
     @staticmethod
     def run_feature_sets(data_splits: [DataSplit], subject_dictionary, attributed_classifier: AttributedClassifier,
-                         feature_sets: [[FeatureType]], use_preloaded=False):
+                         feature_sets: [[FeatureType]], use_preloaded=False, checkpoint=None):
         performance_dictionary = {}
         for feature_set in feature_sets:
             if use_preloaded:
@@ -107,7 +134,8 @@ class ThreeClassClassifierSummaryBuilder(object):
                                                                                               feature_set)
             else:
                 raw_performance_results = ClassifierService.run_three_class(data_splits, attributed_classifier,
-                                                                            subject_dictionary, feature_set)
+                                                                            subject_dictionary, feature_set,
+                                                                            checkpoint)
             performance_dictionary[tuple(feature_set)] = raw_performance_results
 
         return ClassifierSummary(attributed_classifier, performance_dictionary)
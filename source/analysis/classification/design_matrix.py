@@ -0,0 +1,71 @@
+import hashlib
+import json
+
+import numpy as np
+
+
+class DesignMatrix(object):
+    def __init__(self, subject_ids, features, labels, offsets):
+        self.subject_ids = subject_ids
+        self.features = features
+        self.labels = labels
+        self.offsets = offsets
+        self.positions = {subject_id: position for position, subject_id in enumerate(subject_ids)}
+        self.digest = None
+
+    @staticmethod
+    def build(subject_ids, subject_dictionary, feature_set):
+        subjects = [subject_dictionary[subject_id] for subject_id in subject_ids]
+        offsets = np.concatenate(([0], np.cumsum([len(subject.labeled_sleep) for subject in subjects])))
+
+        feature_arrays = [[DesignMatrix.as_columns(subject.feature_dictionary[feature]) for feature in feature_set]
+                          for subject in subjects]
+        number_of_columns = sum(np.shape(array)[1] for array in feature_arrays[0])
+        features = np.empty((offsets[-1], number_of_columns),
+                            dtype=np.result_type(*[array for arrays in feature_arrays for array in arrays]))
+
+        # Each subject is written into place once; splits are then served as slices or row gathers
+        for position, arrays in enumerate(feature_arrays):
+            column = 0
+            for array in arrays:
+                features[offsets[position]:offsets[position + 1], column:column + np.shape(array)[1]] = array
+                column = column + np.shape(array)[1]
+        labels = np.concatenate([subject.labeled_sleep for subject in subjects])
+
+        features.setflags(write=False)
+        labels.setflags(write=False)
+        return DesignMatrix(list(subject_ids), features, labels, offsets)
+
+    @staticmethod
+    def as_columns(feature):
+        if len(np.shape(feature)) < 2:
+            return np.reshape(feature, (-1, 1))
+        return feature
+
+    def get_digest(self):
+        if self.digest is None:
+            digest = hashlib.sha256(json.dumps(list(self.subject_ids)).encode())
+            for array in [self.features, self.labels, np.asarray(self.offsets)]:
+                array = np.ascontiguousarray(array)
+                digest.update(str((array.dtype.str, array.shape)).encode())
+                digest.update(array.data)
+            self.digest = digest.hexdigest()
+        return self.digest
+
+    def get_positions(self, subject_ids):
+        return np.array([self.positions[subject_id] for subject_id in subject_ids], dtype=int)
+
+    def get_rows(self, positions):
+        ranges = [np.arange(self.offsets[position], self.offsets[position + 1]) for position in positions]
+        return np.concatenate(ranges) if len(ranges) > 0 else np.zeros(0, dtype=int)
+
+    def get_array(self, subject_ids):
+        return self.get_array_at(self.get_positions(subject_ids))
+
+    def get_array_at(self, positions):
+        if len(positions) > 0 and np.all(np.diff(positions) == 1):
+            start, end = self.offsets[positions[0]], self.offsets[positions[-1] + 1]
+            return self.features[start:end], self.labels[start:end]
+
+        rows = self.get_rows(positions)
+        return self.features[rows], self.labels[rows]
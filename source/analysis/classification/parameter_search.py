@@ -1,7 +1,11 @@
 from sklearn.model_selection import GridSearchCV
 
+from source.analysis.classification.parameter_search_cache import ParameterSearchCache
+from source.constants import Constants
+
 
 class ParameterSearch(object):
+    HALVING_FACTOR = 3
     parameter_dictionary = {
         'Logistic Regression': {'C': [0.001, 0.01, 0.1, 1, 10, 100], 'penalty': ['l1', 'l2']},
         'Random Forest': {'max_depth': [10, 50, 100]},
@@ -12,6 +16,29 @@ class ParameterSearch(object):
     @staticmethod
     def run_search(attributed_classifier, training_x, training_y, scoring):
         parameter_range = ParameterSearch.parameter_dictionary[attributed_classifier.name]
-        grid_search = GridSearchCV(attributed_classifier.classifier, parameter_range, scoring=scoring, cv=3)
+        search_mode = 'halving_' + str(ParameterSearch.HALVING_FACTOR) if Constants.SUCCESSIVE_HALVING_SEARCH \
+            else 'grid'
+
+        cache_key = ParameterSearchCache.get_key(attributed_classifier, parameter_range, scoring, search_mode,
+                                                 training_x, training_y)
+        best_parameters = ParameterSearchCache.load(cache_key)
+        if best_parameters is not None:
+            return best_parameters
+
+        if Constants.SUCCESSIVE_HALVING_SEARCH:
+            grid_search = ParameterSearch.get_halving_search(attributed_classifier, parameter_range, scoring)
+        else:
+            grid_search = GridSearchCV(attributed_classifier.classifier, parameter_range, scoring=scoring, cv=3)
         grid_search.fit(training_x, training_y)
+
+        ParameterSearchCache.save(cache_key, attributed_classifier, grid_search.best_params_, grid_search.best_score_)
         return grid_search.best_params_
+
+    @staticmethod
+    def get_halving_search(attributed_classifier, parameter_range, scoring):
+        # Fits every grid point on a subsample first and keeps the best 1 / HALVING_FACTOR for each larger round
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingGridSearchCV
+
+        return HalvingGridSearchCV(attributed_classifier.classifier, parameter_range, scoring=scoring, cv=3,
+                                   factor=ParameterSearch.HALVING_FACTOR, min_resources='exhaust')
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from source.constants import Constants
+
+
+class ParameterSearchCache(object):
+    VERSION = 1  # Bump when the search itself changes in a way the key does not capture
+
+    @staticmethod
+    def get_directory():
+        return Constants.CROPPED_FILE_PATH.parent.joinpath('parameter_search')
+
+    @staticmethod
+    def get_path(key):
+        return ParameterSearchCache.get_directory().joinpath(key + '.json')
+
+    @staticmethod
+    def get_key(attributed_classifier, parameter_range, scoring, search_mode, training_x, training_y):
+        # The training matrix digest stands in for the feature set and the training subjects, and also changes
+        # when their features are rebuilt
+        fixed_parameters = ParameterSearchCache.get_fixed_parameters(attributed_classifier, parameter_range)
+        description = json.dumps([ParameterSearchCache.VERSION, attributed_classifier.name, parameter_range, scoring,
+                                  search_mode, fixed_parameters, ParameterSearchCache.hash_array(training_x),
+                                  ParameterSearchCache.hash_array(training_y)], sort_keys=True, default=str)
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    @staticmethod
+    def get_fixed_parameters(attributed_classifier, parameter_range):
+        # Searched parameters are overwritten by every search, so only the others identify the estimator
+        return {name: value for name, value in attributed_classifier.classifier.get_params().items()
+                if name not in parameter_range}
+
+    @staticmethod
+    def hash_array(array):
+        array = np.ascontiguousarray(array)
+        digest = hashlib.sha256(str((array.dtype.str, array.shape)).encode())
+        digest.update(array.data)
+        return digest.hexdigest()
+
+    @staticmethod
+    def load(key):
+        path = ParameterSearchCache.get_path(key)
+        if not path.is_file():
+            return None
+        with open(str(path)) as cache_file:
+            return json.load(cache_file)['best_parameters']
+
+    @staticmethod
+    def save(key, attributed_classifier, best_parameters, best_score):
+        path = ParameterSearchCache.get_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Pool workers may finish the same search; each writes its own file and the rename is atomic
+        temporary_path = str(path) + '.' + str(os.getpid()) + '.tmp'
+        with open(temporary_path, 'w') as cache_file:
+            json.dump({'classifier': attributed_classifier.name, 'best_parameters': best_parameters,
+                       'best_score': float(best_score)}, cache_file, indent=1, sort_keys=True, default=str)
+        os.replace(temporary_path, str(path))
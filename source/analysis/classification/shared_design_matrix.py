@@ -0,0 +1,86 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from source.analysis.classification.design_matrix import DesignMatrix
+
+
+class SharedDesignMatrix(object):
+    attached = {}
+
+    def __init__(self, subject_ids, offsets, features_name, features_shape, features_dtype, labels_name,
+                 labels_shape, labels_dtype):
+        self.subject_ids = subject_ids
+        self.offsets = offsets
+        self.features_name = features_name
+        self.features_shape = features_shape
+        self.features_dtype = features_dtype
+        self.labels_name = labels_name
+        self.labels_shape = labels_shape
+        self.labels_dtype = labels_dtype
+
+    @staticmethod
+    def publish(design_matrix):
+        features_memory = SharedDesignMatrix.copy_to_shared_memory(design_matrix.features)
+        labels_memory = SharedDesignMatrix.copy_to_shared_memory(design_matrix.labels)
+        shared_design_matrix = SharedDesignMatrix(design_matrix.subject_ids, design_matrix.offsets,
+                                                  features_memory.name, design_matrix.features.shape,
+                                                  design_matrix.features.dtype.str, labels_memory.name,
+                                                  design_matrix.labels.shape, design_matrix.labels.dtype.str)
+
+        # The publishing process keeps reading its own copy
+        SharedDesignMatrix.attached[features_memory.name] = (design_matrix, [])
+        return shared_design_matrix, [features_memory, labels_memory]
+
+    @staticmethod
+    def copy_to_shared_memory(array):
+        memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[...] = array
+        return memory
+
+    @staticmethod
+    def open_shared_memory(name):
+        # Workers only read; the publisher owns the block and unlinks it
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13 has no track argument; pool workers share the publisher's tracker
+            return shared_memory.SharedMemory(name=name)
+
+    @staticmethod
+    def as_array(memory, shape, dtype):
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf)
+        array.setflags(write=False)
+        return array
+
+    def get_positions(self, subject_ids):
+        positions = {subject_id: position for position, subject_id in enumerate(self.subject_ids)}
+        return np.array([positions[subject_id] for subject_id in subject_ids], dtype=int)
+
+    def attach(self):
+        if self.features_name not in SharedDesignMatrix.attached:
+            SharedDesignMatrix.close_attached()
+            features_memory = SharedDesignMatrix.open_shared_memory(self.features_name)
+            labels_memory = SharedDesignMatrix.open_shared_memory(self.labels_name)
+            design_matrix = DesignMatrix(self.subject_ids,
+                                         SharedDesignMatrix.as_array(features_memory, self.features_shape,
+                                                                     self.features_dtype),
+                                         SharedDesignMatrix.as_array(labels_memory, self.labels_shape,
+                                                                     self.labels_dtype),
+                                         self.offsets)
+            SharedDesignMatrix.attached[self.features_name] = (design_matrix, [features_memory, labels_memory])
+        return SharedDesignMatrix.attached[self.features_name][0]
+
+    def detach(self):
+        SharedDesignMatrix.attached.pop(self.features_name, None)
+
+    @staticmethod
+    def close_attached():
+        # Workers keep only the matrix of the current run mapped, so blocks the publisher unlinks are freed
+        for name in [name for name, (_, memories) in SharedDesignMatrix.attached.items() if len(memories) > 0]:
+            design_matrix, memories = SharedDesignMatrix.attached.pop(name)
+            del design_matrix
+            for memory in memories:
+                try:
+                    memory.close()
+                except BufferError:  # A fitted classifier still holds a view; the mapping goes with the process
+                    pass
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from source.analysis.classification.classifier_input_builder import ClassifierInputBuilder
+from source.analysis.classification.classifier_summary import ClassifierSummary
+from source.analysis.classification.parameter_search import ParameterSearch
+from source.analysis.classification.parameter_search_cache import ParameterSearchCache
+from source.analysis.performance.raw_performance import RawPerformance
+from source.analysis.setup.data_split import DataSplit
+from source.constants import Constants
+
+
+class SweepCheckpoint(object):
+    def __init__(self, directory):
+        self.directory = directory
+
+    @staticmethod
+    def for_sweep(name, subject_ids):
+        # Each subject set gets its own directory, so splits persisted for other subjects are never reused
+        subject_digest = hashlib.sha256(json.dumps(sorted(subject_ids)).encode()).hexdigest()[0:12]
+        return SweepCheckpoint(Constants.CROPPED_FILE_PATH.parent.joinpath('checkpoints',
+                                                                           name + '_' + subject_digest))
+
+    def get_data_splits(self, build_data_splits):
+        splits_path = self.directory.joinpath('data_splits.json')
+        if splits_path.is_file():
+            with open(str(splits_path)) as splits_file:
+                return [DataSplit(training_set=data_split['training_set'], testing_set=data_split['testing_set'])
+                        for data_split in json.load(splits_file)]
+
+        data_splits = build_data_splits()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temporary_path = str(splits_path) + '.tmp'
+        with open(temporary_path, 'w') as splits_file:
+            json.dump([{'training_set': list(data_split.training_set), 'testing_set': list(data_split.testing_set)}
+                       for data_split in data_splits], splits_file)
+        os.replace(temporary_path, str(splits_path))
+        return data_splits
+
+    def get_unit_directory(self, attributed_classifier, feature_set, design_matrix):
+        # Results are only reused for the same estimator settings and the same feature contents
+        parameter_range = ParameterSearch.parameter_dictionary.get(attributed_classifier.name, {})
+        fixed_parameters = ParameterSearchCache.get_fixed_parameters(attributed_classifier, parameter_range)
+        description = json.dumps([fixed_parameters, design_matrix.get_digest()], sort_keys=True, default=str)
+        unit_digest = hashlib.sha256(description.encode()).hexdigest()[0:12]
+
+        feature_names = '-'.join(feature.name for feature in feature_set)
+        return self.directory.joinpath(attributed_classifier.name.lower().replace(' ', '_'),
+                                       feature_names + '_' + unit_digest)
+
+    @staticmethod
+    def get_path(unit_directory, split_index):
+        return unit_directory.joinpath('split_' + str(split_index).zfill(4) + '.npz')
+
+    @staticmethod
+    def save(unit_directory, split_index, raw_performance):
+        path = SweepCheckpoint.get_path(unit_directory, split_index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = str(path) + '.tmp'
+        with open(temporary_path, 'wb') as performance_file:
+            np.savez(performance_file, true_labels=raw_performance.true_labels,
+                     class_probabilities=raw_performance.class_probabilities)
+        os.replace(temporary_path, str(path))
+
+    @staticmethod
+    def load(unit_directory, split_index):
+        path = SweepCheckpoint.get_path(unit_directory, split_index)
+        if not path.is_file():
+            return None
+        with np.load(str(path)) as performance_file:
+            return RawPerformance(true_labels=performance_file['true_labels'],
+                                  class_probabilities=performance_file['class_probabilities'])
+
+    @staticmethod
+    def load_performances(unit_directory, number_of_splits):
+        return [SweepCheckpoint.load(unit_directory, split_index) for split_index in range(number_of_splits)]
+
+    def load_summary(self, attributed_classifier, feature_sets, number_of_splits, subject_dictionary):
+        performance_dictionary = {}
+        for feature_set in feature_sets:
+            design_matrix = ClassifierInputBuilder.get_design_matrix(subject_dictionary, feature_set)
+            unit_directory = self.get_unit_directory(attributed_classifier, feature_set, design_matrix)
+            raw_performances = SweepCheckpoint.load_performances(unit_directory, number_of_splits)
+            if None in raw_performances:
+                raise ValueError(f"Sweep in {self.directory} is missing splits for {attributed_classifier.name} "
+                                 f"with {[feature.name for feature in feature_set]}")
+            performance_dictionary[tuple(feature_set)] = raw_performances
+
+        return ClassifierSummary(attributed_classifier, performance_dictionary)
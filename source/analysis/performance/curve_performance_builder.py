@@ -1,5 +1,5 @@
 import numpy as np
-from sklearn.metrics import roc_curve, precision_recall_curve, accuracy_score, cohen_kappa_score
+from sklearn.metrics import roc_curve, precision_recall_curve, cohen_kappa_score
 
 from source.analysis.performance.curve_performance import ROCPerformance, PrecisionRecallPerformance
 from source.analysis.performance.epoch_performance import ThreeClassPerformance
@@ -104,122 +104,31 @@ class CurvePerformanceBuilder(object):
             nrem_class_accuracies = []
             rem_class_accuracies = []
 
-            true_wake_indices = np.where(true_labels == 0)[0]
-            true_nrem_indices = np.where(true_labels == 1)[0]
-            true_rem_indices = np.where(true_labels == 2)[0]
+            # Both searches below replay the original bisection steps exactly, but each step is answered by a
+            # searchsorted count on sorted scores instead of relabeling every epoch
+            sleep_scores = 1 - np.array(class_probabilities[:, 0])
+            sorted_wake_sleep_scores = np.sort(sleep_scores[true_labels == 0])
 
             #  Try to find a threshold that matches a target fraction wake scored as sleep
-            for goal_fraction_wake_scored_as_sleep in goal_fraction_wake_scored_as_sleep_spread:
-
-                fraction_wake_scored_as_sleep = -1
-                binary_search_counter = 0
-
-                # While we haven't found the target wake false positive rate
-                # (and haven't exceeded the number of allowable searches), keep searching:
-                while (fraction_wake_scored_as_sleep < goal_fraction_wake_scored_as_sleep - false_positive_buffer
-                       or fraction_wake_scored_as_sleep >= goal_fraction_wake_scored_as_sleep + false_positive_buffer) \
-                        and binary_search_counter < max_attempts_binary_search_wake:
-
-                    # If this is the first iteration on the binary search, initialize.
-                    if binary_search_counter == 0:
-                        threshold_for_sleep = 0.5
-                        threshold_delta = 0.25
-                    else:
-                        if fraction_wake_scored_as_sleep < goal_fraction_wake_scored_as_sleep - false_positive_buffer:
-                            threshold_for_sleep = threshold_for_sleep - threshold_delta
-                            threshold_delta = threshold_delta / 2
-                        if fraction_wake_scored_as_sleep >= goal_fraction_wake_scored_as_sleep + false_positive_buffer:
-                            threshold_for_sleep = threshold_for_sleep + threshold_delta
-                            threshold_delta = threshold_delta / 2
-
-                    if goal_fraction_wake_scored_as_sleep == 1:  # Edge cases
-                        threshold_for_sleep = 0.0
-                    if goal_fraction_wake_scored_as_sleep == 0:
-                        threshold_for_sleep = 1.0
-
-                    predicted_sleep_indices = np.where(1 - np.array(class_probabilities[:, 0]) >= threshold_for_sleep)[0]
-
-                    predicted_labels = np.zeros(np.shape(true_labels))
-                    predicted_labels[predicted_sleep_indices] = 1
-                    predicted_labels_at_true_wake_indices = predicted_labels[true_wake_indices]
-
-                    number_wake_correct = len(true_wake_indices) - np.count_nonzero(
-                        predicted_labels_at_true_wake_indices)
-                    fraction_wake_correct = number_wake_correct / (len(true_wake_indices) * 1.0)
-                    fraction_wake_scored_as_sleep = 1.0 - fraction_wake_correct
-
-                    binary_search_counter = binary_search_counter + 1
+            thresholds_for_sleep, fractions_wake_scored_as_sleep, found = \
+                CurvePerformanceBuilder.search_wake_thresholds(sorted_wake_sleep_scores,
+                                                               goal_fraction_wake_scored_as_sleep_spread,
+                                                               false_positive_buffer, max_attempts_binary_search_wake)
 
+            for goal_index in np.where(found)[0]:
                 # Next, try to find a threshold that balances the REM and NREM class accuracies
-                if binary_search_counter < max_attempts_binary_search_wake:
-
-                    smallest_accuracy_difference = 2
-                    sleep_accuracy = 0
-                    rem_accuracy = 0
-                    nrem_accuracy = 0
-                    best_accuracy = -1
-                    kappa_at_best_accuracy = -1
-
-                    count_thresh = 0
-                    threshold_for_rem = 0.5
-                    threshold_delta_rem = 0.5
-
-                    # While we're outside the tolerance window for equalizing REM/NREM accuracies and
-                    # we haven't exceed the maximum number of search attempts, keep hunting
-                    while count_thresh < max_attempts_binary_search_rem_nrem and \
-                            smallest_accuracy_difference > rem_nrem_accuracy_tolerance:
-
-                        count_thresh = count_thresh + 1
-
-                        for predicted_sleep_index in range(len(predicted_sleep_indices)):
-                            predicted_sleep_epoch = predicted_sleep_indices[predicted_sleep_index]
-
-                            # Apply the threshold to split REM and NREM sleep
-                            if class_probabilities[predicted_sleep_epoch, 2] > threshold_for_rem:
-                                predicted_labels[predicted_sleep_epoch] = 2  # Set to REM sleep
-                            else:
-                                predicted_labels[predicted_sleep_epoch] = 1  # Set to NREM sleep
-
-                        accuracy = accuracy_score(predicted_labels, true_labels)
-                        kappa = cohen_kappa_score(predicted_labels, true_labels)
-
-                        if accuracy > best_accuracy:
-                            best_accuracy = accuracy
-                            kappa_at_best_accuracy = kappa
-
-                        # Assess accuracy at the current threshold
-                        predicted_nrem_indices = np.where(predicted_labels == 1)[0]
-                        predicted_rem_indices = np.where(predicted_labels == 2)[0]
-
-                        correct_nrem_indices = np.intersect1d(predicted_nrem_indices, true_nrem_indices)
-                        correct_rem_indices = np.intersect1d(predicted_rem_indices, true_rem_indices)
-
-                        nrem_accuracy = len(correct_nrem_indices) / (1.0 * len(true_nrem_indices))
-
-                        if len(true_rem_indices) > 0:
-                            rem_accuracy = len(correct_rem_indices) / (1.0 * len(true_rem_indices))
-                        else:
-                            rem_accuracy = 0
-
-                        # Update current accuracy difference and adjust the threshold for REM sleep
-                        sleep_accuracy = (len(correct_nrem_indices) + len(correct_rem_indices)) / (
-                                1.0 * len(true_nrem_indices) + 1.0 * len(true_rem_indices))
-
-                        smallest_accuracy_difference = np.abs(nrem_accuracy - rem_accuracy)
-
-                        if rem_accuracy < nrem_accuracy:
-                            threshold_for_rem = threshold_for_rem - threshold_delta_rem / 2.0
-                        else:
-                            threshold_for_rem = threshold_for_rem + threshold_delta_rem / 2.0
-
-                        threshold_delta_rem = threshold_delta_rem / 2.0
-
-                    wake_scored_as_sleep_spread.append(fraction_wake_scored_as_sleep)
-                    sleep_accuracy_spread.append(sleep_accuracy)
-                    nrem_class_accuracies.append(nrem_accuracy)
-                    rem_class_accuracies.append(rem_accuracy)
-                    accuracies.append(best_accuracy)
-                    kappas.append(kappa_at_best_accuracy)
+                predicted_sleep = sleep_scores >= thresholds_for_sleep[goal_index]
+                sleep_accuracy, nrem_accuracy, rem_accuracy, best_accuracy, kappa_at_best_accuracy = \
+                    CurvePerformanceBuilder.balance_rem_nrem(true_labels, class_probabilities[:, 2], predicted_sleep,
+                                                             rem_nrem_accuracy_tolerance,
+                                                             max_attempts_binary_search_rem_nrem)
+
+                wake_scored_as_sleep_spread.append(fractions_wake_scored_as_sleep[goal_index])
+                sleep_accuracy_spread.append(sleep_accuracy)
+                nrem_class_accuracies.append(nrem_accuracy)
+                rem_class_accuracies.append(rem_accuracy)
+                accuracies.append(best_accuracy)
+                kappas.append(kappa_at_best_accuracy)
 
             wake_scored_as_sleep_spread = np.array(wake_scored_as_sleep_spread)
             sleep_accuracy_spread = np.array(sleep_accuracy_spread)
@@ -281,3 +190,109 @@ class CurvePerformanceBuilder(object):
                                               true_positive_rates=cumulative_nrem_accuracies)
 
         return sleep_wake_roc_performance, rem_roc_performance, nrem_roc_performance, three_class_performances
+
+    @staticmethod
+    def search_wake_thresholds(sorted_wake_sleep_scores, goal_fractions_wake_scored_as_sleep, false_positive_buffer,
+                               max_attempts):
+        # Bisects the sleep threshold for every goal at once; a goal is found if it lands within the buffer
+        # before max_attempts steps
+        goals = goal_fractions_wake_scored_as_sleep
+        number_of_wake = len(sorted_wake_sleep_scores)
+        thresholds_for_sleep = np.full(len(goals), 0.5)
+        threshold_deltas = np.full(len(goals), 0.25)
+        fractions_wake_scored_as_sleep = np.full(len(goals), -1.0)
+        counters = np.zeros(len(goals), dtype=int)
+
+        while True:
+            too_few = fractions_wake_scored_as_sleep < goals - false_positive_buffer
+            too_many = fractions_wake_scored_as_sleep >= goals + false_positive_buffer
+            searching = (too_few | too_many) & (counters < max_attempts)
+            if not np.any(searching):
+                break
+
+            lower = searching & (counters > 0) & too_few
+            thresholds_for_sleep[lower] = thresholds_for_sleep[lower] - threshold_deltas[lower]
+            threshold_deltas[lower] = threshold_deltas[lower] / 2
+            higher = searching & (counters > 0) & too_many
+            thresholds_for_sleep[higher] = thresholds_for_sleep[higher] + threshold_deltas[higher]
+            threshold_deltas[higher] = threshold_deltas[higher] / 2
+
+            thresholds_for_sleep[searching & (goals == 1)] = 0.0  # Edge cases
+            thresholds_for_sleep[searching & (goals == 0)] = 1.0
+
+            number_wake_scored_as_sleep = number_of_wake - np.searchsorted(sorted_wake_sleep_scores,
+                                                                           thresholds_for_sleep[searching],
+                                                                           side='left')
+            fraction_wake_correct = (number_of_wake - number_wake_scored_as_sleep) / (number_of_wake * 1.0)
+            fractions_wake_scored_as_sleep[searching] = 1.0 - fraction_wake_correct
+            counters[searching] = counters[searching] + 1
+
+        return thresholds_for_sleep, fractions_wake_scored_as_sleep, counters < max_attempts
+
+    @staticmethod
+    def balance_rem_nrem(true_labels, rem_probabilities, predicted_sleep, rem_nrem_accuracy_tolerance, max_attempts):
+        # Predicted sleep epochs are REM when their REM probability is above the threshold, so each true class
+        # only needs its sorted REM probabilities to count every cell of the confusion matrix
+        classes = [0, 1, 2]
+        sorted_rem_probabilities = [np.sort(rem_probabilities[predicted_sleep & (true_labels == label)])
+                                    for label in classes]
+        number_predicted_wake = np.array([np.count_nonzero(~predicted_sleep & (true_labels == label))
+                                          for label in classes])
+        number_true_nrem = int(np.count_nonzero(true_labels == 1))
+        number_true_rem = int(np.count_nonzero(true_labels == 2))
+
+        smallest_accuracy_difference = 2
+        sleep_accuracy = 0
+        rem_accuracy = 0
+        nrem_accuracy = 0
+        best_accuracy = -1
+        kappa_at_best_accuracy = -1
+
+        count_thresh = 0
+        threshold_for_rem = 0.5
+        threshold_delta_rem = 0.5
+
+        while count_thresh < max_attempts and smallest_accuracy_difference > rem_nrem_accuracy_tolerance:
+            count_thresh = count_thresh + 1
+
+            number_predicted_rem = np.array([len(probabilities) - np.searchsorted(probabilities, threshold_for_rem,
+                                                                                  side='right')
+                                             for probabilities in sorted_rem_probabilities])
+            number_predicted_nrem = np.array([len(probabilities) for probabilities in sorted_rem_probabilities]) \
+                - number_predicted_rem
+            confusion = np.array([number_predicted_wake, number_predicted_nrem, number_predicted_rem])
+
+            accuracy = int(np.trace(confusion)) / len(true_labels)
+            if accuracy > best_accuracy:
+                best_accuracy = accuracy
+                kappa_at_best_accuracy = CurvePerformanceBuilder.get_kappa(confusion)
+
+            correct_nrem = int(number_predicted_nrem[1])
+            correct_rem = int(number_predicted_rem[2])
+            nrem_accuracy = correct_nrem / (1.0 * number_true_nrem)
+
+            if number_true_rem > 0:
+                rem_accuracy = correct_rem / (1.0 * number_true_rem)
+            else:
+                rem_accuracy = 0
+
+            sleep_accuracy = (correct_nrem + correct_rem) / (1.0 * number_true_nrem + 1.0 * number_true_rem)
+
+            smallest_accuracy_difference = np.abs(nrem_accuracy - rem_accuracy)
+
+            if rem_accuracy < nrem_accuracy:
+                threshold_for_rem = threshold_for_rem - threshold_delta_rem / 2.0
+            else:
+                threshold_for_rem = threshold_for_rem + threshold_delta_rem / 2.0
+
+            threshold_delta_rem = threshold_delta_rem / 2.0
+
+        return sleep_accuracy, nrem_accuracy, rem_accuracy, best_accuracy, kappa_at_best_accuracy
+
+    @staticmethod
+    def get_kappa(confusion):
+        # Same value as cohen_kappa_score(predicted_labels, true_labels): one weighted sample per confusion cell
+        present = np.where((np.sum(confusion, axis=0) + np.sum(confusion, axis=1)) > 0)[0]
+        predicted_labels, true_labels = [label.ravel() for label in np.meshgrid(present, present, indexing='ij')]
+        return cohen_kappa_score(predicted_labels, true_labels,
+                                 sample_weight=confusion[np.ix_(present, present)].ravel())
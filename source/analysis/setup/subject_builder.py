@@ -1,10 +1,7 @@
 from source.analysis.setup.feature_type import FeatureType
 from source.analysis.setup.subject import Subject
 from source.constants import Constants
-from source.preprocessing.activity_count.activity_count_feature_service import ActivityCountFeatureService
-from source.preprocessing.heart_rate.heart_rate_feature_service import HeartRateFeatureService
-from source.preprocessing.psg.psg_label_service import PSGLabelService
-from source.preprocessing.time.time_based_feature_service import TimeBasedFeatureService
+from source.preprocessing.feature_store import FeatureStore
 
 
 class SubjectBuilder(object):
@@ -34,15 +31,16 @@ class SubjectBuilder(object):
 
     @staticmethod
     def build(subject_id):
-        feature_count = ActivityCountFeatureService.load(subject_id)
-        feature_hr = HeartRateFeatureService.load(subject_id)
-        feature_time = TimeBasedFeatureService.load_time(subject_id)
+        features = FeatureStore.load(subject_id)
+        feature_count = features['count_feature']
+        feature_hr = features['hr_std']
+        feature_time = features['time_feature']
         if Constants.INCLUDE_CIRCADIAN:
-            feature_circadian = TimeBasedFeatureService.load_circadian_model(subject_id)
+            feature_circadian = features['circadian_feature']
         else:
             feature_circadian = None
-        feature_cosine = TimeBasedFeatureService.load_cosine(subject_id)
-        labeled_sleep = PSGLabelService.load(subject_id)
+        feature_cosine = features['cosine_feature']
+        labeled_sleep = features['psg_label']
 
         feature_dictionary = {FeatureType.count: feature_count,
                               FeatureType.heart_rate: feature_hr,
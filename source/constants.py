@@ -13,6 +13,8 @@ class Constants(object):
     SECONDS_PER_DAY = 3600 * 24
     SECONDS_PER_HOUR = 3600
     VERBOSE = True
+    PREPROCESSING_WORKERS = None  # Worker processes for preprocessing; None uses every core
+    SUCCESSIVE_HALVING_SEARCH = False  # Prune hyperparameter grid points on subsamples before full-size fits
     CROPPED_FILE_PATH = utils.get_project_root().joinpath('outputs_lab/cropped/')
     FEATURE_FILE_PATH = utils.get_project_root().joinpath('outputs_lab/features/')
     FIGURE_FILE_PATH = utils.get_project_root().joinpath('outputs_lab/figures/')
@@ -5,6 +5,7 @@ from source import utils
 from source.constants import Constants
 from source.preprocessing.activity_count.activity_count_service import ActivityCountService
 from source.preprocessing.epoch import Epoch
+from source.preprocessing.epoch_array import EpochArray
 
 
 class ActivityCountFeatureService(object):
@@ -40,25 +41,29 @@ class ActivityCountFeatureService(object):
         return ActivityCountFeatureService.build_from_collection(activity_count_collection, valid_epochs)
 
     @staticmethod
-    def build_from_collection(activity_count_collection, valid_epochs):
-        count_features = []
+    def get_window_bounds(timestamps, epoch_timestamps):
+        # Vectorized get_window for sorted timestamps: returns [first, last) index bounds of every epoch's window
+        start_times = epoch_timestamps - ActivityCountFeatureService.WINDOW_SIZE
+        end_times = epoch_timestamps + Epoch.DURATION
+        first_indices = np.searchsorted(timestamps, start_times, side='right')
+        last_indices = np.searchsorted(timestamps, end_times, side='left')
+        return first_indices, np.maximum(last_indices, first_indices)
 
+    @staticmethod
+    def build_from_collection(activity_count_collection, valid_epochs):
         interpolated_timestamps, interpolated_counts = ActivityCountFeatureService.interpolate(
             activity_count_collection)
 
         min_timestamp = np.amin(interpolated_timestamps)
 
-        for epoch in valid_epochs:
-            if epoch.timestamp - min_timestamp < ActivityCountFeatureService.WINDOW_SIZE:
-                continue
-
-            indices_in_range = ActivityCountFeatureService.get_window(interpolated_timestamps, epoch)
-            activity_counts_in_range = interpolated_counts[indices_in_range]
-
-            feature = ActivityCountFeatureService.get_feature(activity_counts_in_range)
-            count_features.append(feature)
+        epoch_timestamps = EpochArray.get_timestamps(valid_epochs)
+        if len(epoch_timestamps) == 0:
+            return np.array([])
+        epoch_timestamps = epoch_timestamps[epoch_timestamps - min_timestamp >= ActivityCountFeatureService.WINDOW_SIZE]
 
-        return np.array(count_features)
+        first_indices, last_indices = ActivityCountFeatureService.get_window_bounds(interpolated_timestamps,
+                                                                                    epoch_timestamps)
+        return utils.smooth_gauss_windows(interpolated_counts, first_indices, last_indices, causal=True)
 
     @staticmethod
     def get_feature(count_values):
@@ -0,0 +1,75 @@
+import numpy as np
+from scipy.signal import sosfilt, sosfilt_zi
+
+from source.preprocessing.activity_count.activity_count_service import ActivityCountService
+
+
+class StreamingActivityCounter(object):
+    # Forward pass runs causally with carried sos state and starts exactly like filtfilt (odd extension of the
+    # first PADDING samples). The backward pass is redone from the newest sample over the unfinalized tail, so
+    # a count is emitted once LOOKAHEAD seconds follow its bin. Its filtered samples then differ from the
+    # offline filtfilt result by at most the backward impulse response mass beyond LOOKAHEAD (~5e-10 times
+    # the signal amplitude), far below the 5/128 bin width used to digitize them.
+    LOOKAHEAD = 6  # seconds
+    PADDING = 3 * (2 * ActivityCountService.FILTER_ORDER + 1)  # filtfilt's default padlen for the b, a filter
+
+    def __init__(self):
+        self.sos = ActivityCountService.get_sos_filter()
+        self.initial_state = sosfilt_zi(self.sos)
+        self.state = None
+        self.head = np.array([])
+        self.raw_tail = np.array([])
+        self.forward = np.array([])
+        self.forward_start = 0
+        self.sample_count = 0
+        self.counts = np.array([])
+
+    def append(self, values):
+        values = np.asarray(values, dtype=float)
+        self.sample_count = self.sample_count + len(values)
+
+        if self.state is None:
+            self.head = np.concatenate((self.head, values))
+            if len(self.head) <= self.PADDING:
+                return np.array([])
+            values = self.head
+            left_extension = 2 * values[0] - values[self.PADDING:0:-1]
+            _, self.state = sosfilt(self.sos, left_extension, zi=self.initial_state * left_extension[0])
+
+        forward, self.state = sosfilt(self.sos, values, zi=self.state)
+        self.forward = np.concatenate((self.forward, forward))
+        self.raw_tail = np.concatenate((self.raw_tail, values))[-(self.PADDING + 1):]
+
+        lookahead = self.LOOKAHEAD * ActivityCountService.SAMPLING_FREQUENCY
+        return self.emit(self.sample_count - lookahead)
+
+    def finish(self):
+        if self.state is None:
+            return np.array([])
+        return self.emit(self.sample_count)
+
+    def emit(self, final_sample_count):
+        samples_per_count = ActivityCountService.SAMPLING_FREQUENCY * ActivityCountService.EPOCH_DURATION
+        first_count = len(self.counts)
+        last_count = final_sample_count // samples_per_count
+        if last_count <= first_count:
+            return np.array([])
+
+        filtered = self.get_backward()
+        offset = first_count * samples_per_count - self.forward_start
+        filtered = filtered[offset:offset + (last_count - first_count) * samples_per_count]
+        new_counts = ActivityCountService.get_counts_from_filtered(filtered)
+        self.counts = np.concatenate((self.counts, new_counts))
+
+        new_forward_start = last_count * samples_per_count
+        self.forward = self.forward[new_forward_start - self.forward_start:]
+        self.forward_start = new_forward_start
+        return new_counts
+
+    def get_backward(self):
+        right_extension = 2 * self.raw_tail[-1] - self.raw_tail[-2::-1]
+        forward_extension, _ = sosfilt(self.sos, right_extension, zi=self.state)
+
+        reversed_forward = np.concatenate((self.forward, forward_extension))[::-1]
+        backward, _ = sosfilt(self.sos, reversed_forward, zi=self.initial_state * reversed_forward[0])
+        return backward[::-1][0:len(self.forward)]
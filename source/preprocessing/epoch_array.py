@@ -0,0 +1,48 @@
+import numpy as np
+
+from source.preprocessing.epoch import Epoch
+from source.sleep_stage import SleepStage
+
+
+class EpochArray(object):
+    def __init__(self, timestamps, indices, stages=None):
+        self.timestamps = np.asarray(timestamps, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        if stages is None:
+            stages = np.full(len(self.timestamps), SleepStage.unscored.value)
+        self.stages = np.asarray(stages, dtype=np.int64)
+
+    @staticmethod
+    def from_epochs(epochs):
+        if isinstance(epochs, EpochArray):
+            return epochs
+        return EpochArray(timestamps=[epoch.timestamp for epoch in epochs],
+                          indices=[epoch.index for epoch in epochs])
+
+    @staticmethod
+    def get_timestamps(epochs):
+        if isinstance(epochs, EpochArray):
+            return epochs.timestamps
+        return np.array([epoch.timestamp for epoch in epochs], dtype=float)
+
+    def select(self, selection):
+        return EpochArray(timestamps=self.timestamps[selection], indices=self.indices[selection],
+                          stages=self.stages[selection])
+
+    def is_scored(self):
+        return self.stages != SleepStage.unscored.value
+
+    def get_epochs(self):
+        return [Epoch(timestamp=timestamp, index=index)
+                for timestamp, index in zip(self.timestamps.tolist(), self.indices.tolist())]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __iter__(self):
+        return iter(self.get_epochs())
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return Epoch(timestamp=float(self.timestamps[item]), index=int(self.indices[item]))
+        return self.select(item)
@@ -4,6 +4,7 @@ import pandas as pd
 from source import utils
 from source.constants import Constants
 from source.preprocessing.epoch import Epoch
+from source.preprocessing.epoch_array import EpochArray
 from source.preprocessing.heart_rate.heart_rate_service import HeartRateService
 
 
@@ -54,54 +55,54 @@ class HeartRateFeatureService(object):
         return HeartRateFeatureService.build_mean_from_collection(heart_rate_collection, valid_epochs)
 
     @staticmethod
-    def build_from_collection(heart_rate_collection, valid_epochs):
-        heart_rate_features = []
-
-        interpolated_timestamps, interpolated_hr = HeartRateFeatureService.interpolate_and_normalize(
-            heart_rate_collection)
+    def build_statistics(subject_id, valid_epochs):
+        heart_rate_collection = HeartRateService.load_cropped(subject_id)
+        return HeartRateFeatureService.build_statistics_from_collection(heart_rate_collection, valid_epochs)
 
-        min_timestamp = np.amin(interpolated_timestamps)
+    @staticmethod
+    def build_from_collection(heart_rate_collection, valid_epochs):
+        heart_rate_std, _, _ = HeartRateFeatureService.build_statistics_from_collection(heart_rate_collection,
+                                                                                        valid_epochs)
+        return heart_rate_std
 
-        for epoch in valid_epochs:
-            if epoch.timestamp - min_timestamp < HeartRateFeatureService.WINDOW_SIZE:
-                continue
+    @staticmethod
+    def build_mean_from_collection(heart_rate_collection, valid_epochs):
+        _, raw_mean, normalized_mean = HeartRateFeatureService.build_statistics_from_collection(
+            heart_rate_collection, valid_epochs)
+        return raw_mean, normalized_mean
 
-            indices_in_range = HeartRateFeatureService.get_window(interpolated_timestamps, epoch)
-            heart_rate_values_in_range = interpolated_hr[indices_in_range]
+    @staticmethod
+    def build_statistics_from_collection(heart_rate_collection, valid_epochs, safe=True):
+        # One interpolation feeds both the DoG-normalized series (std feature) and the raw series (mean features)
+        interpolated_timestamps, raw_hr = HeartRateFeatureService.interpolate_raw(heart_rate_collection)
+        normalized_hr = HeartRateFeatureService.normalize(raw_hr)
 
-            feature = HeartRateFeatureService.get_feature(heart_rate_values_in_range)
+        min_timestamp = np.amin(interpolated_timestamps)
 
-            heart_rate_features.append(feature)
+        epoch_timestamps = EpochArray.get_timestamps(valid_epochs)
+        if len(epoch_timestamps) == 0:
+            return np.array([]), np.array([]), np.array([])
+        epoch_timestamps = epoch_timestamps[epoch_timestamps - min_timestamp >= HeartRateFeatureService.WINDOW_SIZE]
 
-        return np.array(heart_rate_features)
-
-    @staticmethod
-    def build_mean_from_collection(heart_rate_collection, valid_epochs):
-        raw_mean_features = []
-        normalized_mean_features = []
-
-        raw_timestamps, raw_hr = HeartRateFeatureService.interpolate_raw(heart_rate_collection)
+        first_indices, last_indices = HeartRateFeatureService.get_window_bounds(interpolated_timestamps,
+                                                                                epoch_timestamps)
+        _, heart_rate_std = utils.get_window_statistics(normalized_hr, first_indices, last_indices, safe=safe)
+        raw_mean, _ = utils.get_window_statistics(raw_hr, first_indices, last_indices, safe=safe)
 
         scalar = np.percentile(np.abs(raw_hr), 90)
         if scalar == 0:
             scalar = 1.0
 
-        min_timestamp = np.amin(raw_timestamps)
-
-        for epoch in valid_epochs:
-            if epoch.timestamp - min_timestamp < HeartRateFeatureService.WINDOW_SIZE:
-                continue
-
-            indices_in_range = HeartRateFeatureService.get_window(raw_timestamps, epoch)
-            hr_values_in_range = raw_hr[indices_in_range]
-
-            raw_mean = np.mean(hr_values_in_range)
-            normalized_mean = raw_mean / scalar
-
-            raw_mean_features.append(raw_mean)
-            normalized_mean_features.append(normalized_mean)
+        return heart_rate_std, raw_mean, raw_mean / scalar
 
-        return np.array(raw_mean_features), np.array(normalized_mean_features)
+    @staticmethod
+    def get_window_bounds(timestamps, epoch_timestamps):
+        # Vectorized get_window for sorted timestamps: returns [first, last) index bounds of every epoch's window
+        start_times = epoch_timestamps - HeartRateFeatureService.WINDOW_SIZE
+        end_times = epoch_timestamps + Epoch.DURATION
+        first_indices = np.searchsorted(timestamps, start_times, side='right')
+        last_indices = np.searchsorted(timestamps, end_times, side='left')
+        return first_indices, np.maximum(last_indices, first_indices)
 
     @staticmethod
     def get_window(timestamps, epoch):
@@ -127,12 +128,14 @@ class HeartRateFeatureService(object):
                                             np.amax(timestamps), 1)
         interpolated_hr = np.interp(interpolated_timestamps, timestamps, heart_rate_values)
 
+        return interpolated_timestamps, HeartRateFeatureService.normalize(interpolated_hr)
+
+    @staticmethod
+    def normalize(interpolated_hr):
         interpolated_hr = utils.convolve_with_dog(interpolated_hr, HeartRateFeatureService.WINDOW_SIZE)
 
         scalar = np.percentile(np.abs(interpolated_hr), 90)
-        interpolated_hr = interpolated_hr / scalar
-
-        return interpolated_timestamps, interpolated_hr
+        return interpolated_hr / scalar
 
     @staticmethod
     def interpolate_raw(heart_rate_collection):
@@ -0,0 +1,48 @@
+import numpy as np
+
+from source import utils
+
+
+class IncrementalDogConvolution(object):
+    # Convolves an unshifted, growing 1 Hz series the way utils.convolve_with_dog pads it. Only outputs whose
+    # window is fully known are final; the last half_width + 1 depend on the end padding and are recomputed
+    # from the saved tail when requested
+    def __init__(self, box_pts):
+        self.box_pts = box_pts
+        self.half_width = int(box_pts / 2)
+        self.count = 0
+        self.head = np.array([])
+        self.padded_tail = np.array([])
+        self.convolved = np.array([])
+
+    def append(self, values):
+        values = np.asarray(values, dtype=float)
+        self.count = self.count + len(values)
+
+        if len(self.head) < self.half_width:
+            self.head = np.concatenate((self.head, values))
+            if len(self.head) < self.half_width:
+                return np.array([])
+            values = self.head
+            self.padded_tail = np.flip(self.head[0:self.half_width])
+
+        padded = np.concatenate((self.padded_tail, values))
+        number_new = self.count - self.half_width - 1 - len(self.convolved)
+        if number_new <= 0:
+            self.padded_tail = padded
+            return np.array([])
+
+        box = utils.get_dog_kernel(self.box_pts)
+        convolution = utils.convolve_valid(padded[0:number_new + self.box_pts - 1], box)
+        self.convolved = np.concatenate((self.convolved, convolution))
+        self.padded_tail = padded[number_new:]
+        return convolution
+
+    def get_output(self):
+        box = utils.get_dog_kernel(self.box_pts)
+        if len(self.head) < self.half_width:
+            return utils.convolve_valid(utils.pad_reflective(self.head, self.box_pts), box)
+
+        padded = np.concatenate((self.padded_tail[:-1], np.flip(self.padded_tail[-self.half_width:]),
+                                 self.padded_tail[-1:]))
+        return np.concatenate((self.convolved, utils.convolve_valid(padded, box)))
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+
+from source import utils
+from source.constants import Constants
+from source.preprocessing.activity_count.activity_count_feature_service import ActivityCountFeatureService
+from source.preprocessing.activity_count.activity_count_service import ActivityCountService
+from source.preprocessing.epoch import Epoch
+from source.preprocessing.feature_store import FeatureStore
+from source.preprocessing.heart_rate.heart_rate_feature_service import HeartRateFeatureService
+from source.preprocessing.heart_rate.heart_rate_service import HeartRateService
+from source.preprocessing.motion.motion_service import MotionService
+from source.preprocessing.psg.psg_service import PSGService
+from source.preprocessing.raw_data_processor import RawDataProcessor
+
+
+class PreprocessingCache(object):
+    VERSION = 1  # Bump when a stage changes in a way its parameters do not capture
+    STAGES = ('crop', 'counts', 'features')
+    HASH_CHUNK_SIZE = 1 << 20
+
+    @staticmethod
+    def get_manifest_path():
+        return Constants.CROPPED_FILE_PATH.parent.joinpath('manifest.json')
+
+    @staticmethod
+    def load():
+        manifest_path = PreprocessingCache.get_manifest_path()
+        if manifest_path.is_file():
+            with open(str(manifest_path)) as manifest_file:
+                manifest = json.load(manifest_file)
+            if manifest.get('version') == PreprocessingCache.VERSION:
+                return manifest
+        return {'version': PreprocessingCache.VERSION, 'inputs': {}, 'subjects': {}, 'artifacts': {}}
+
+    @staticmethod
+    def save(manifest):
+        manifest_path = PreprocessingCache.get_manifest_path()
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = str(manifest_path) + '.tmp'
+        with open(temporary_path, 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+        os.replace(temporary_path, str(manifest_path))
+
+    @staticmethod
+    def get_input_paths(subject_id):
+        input_paths = [MotionService.get_raw_file_path(subject_id),
+                       HeartRateService.get_raw_file_path(subject_id),
+                       PSGService.get_precleaned_file_path(subject_id)]
+        return [str(path) for path in input_paths]
+
+    @staticmethod
+    def get_artifact_paths(subject_id, stage):
+        if stage == 'crop':
+            paths = [PSGService.get_cropped_file_path(subject_id),
+                     MotionService.get_cropped_file_path(subject_id),
+                     HeartRateService.get_cropped_file_path(subject_id)]
+        elif stage == 'counts':
+            paths = [ActivityCountService.get_cropped_file_path(subject_id)]
+        else:
+            paths = [FeatureStore.get_path(subject_id)]
+        return [str(path) for path in paths]
+
+    @staticmethod
+    def get_parameters(stage):
+        if stage == 'crop':
+            return {}
+        if stage == 'counts':
+            return {'sampling_frequency': ActivityCountService.SAMPLING_FREQUENCY,
+                    'cutoff_low': ActivityCountService.CUTOFF_LOW,
+                    'cutoff_high': ActivityCountService.CUTOFF_HIGH,
+                    'filter_order': ActivityCountService.FILTER_ORDER,
+                    'bins': [ActivityCountService.BIN_BOTTOM_EDGE, ActivityCountService.BIN_TOP_EDGE,
+                             ActivityCountService.NUMBER_OF_BINS],
+                    'epoch_duration': ActivityCountService.EPOCH_DURATION,
+                    'count_offset': ActivityCountService.COUNT_OFFSET,
+                    'count_scale': ActivityCountService.COUNT_SCALE}
+        return {'count_window_size': ActivityCountFeatureService.WINDOW_SIZE,
+                'heart_rate_window_size': HeartRateFeatureService.WINDOW_SIZE,
+                'epoch_duration': Epoch.DURATION,
+                'minimum_motion_samples': RawDataProcessor.MINIMUM_MOTION_SAMPLES,
+                'minimum_heart_rate_samples': RawDataProcessor.MINIMUM_HEART_RATE_SAMPLES,
+                'include_circadian': Constants.INCLUDE_CIRCADIAN,
+                'feature_schema_version': FeatureStore.SCHEMA_VERSION,
+                'lower_bound': Constants.LOWER_BOUND}
+
+    @staticmethod
+    def hash_file(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as input_file:
+            for chunk in iter(lambda: input_file.read(PreprocessingCache.HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_file_hash(manifest, path):
+        # Content hashes are reused while the file's size and mtime are unchanged
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        recorded = manifest['inputs'].get(path)
+        if recorded is not None and recorded['size'] == stat.st_size and recorded['mtime_ns'] == stat.st_mtime_ns:
+            return recorded['sha256']
+
+        sha256 = PreprocessingCache.hash_file(path)
+        manifest['inputs'][path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+        return sha256
+
+    @staticmethod
+    def get_stage_keys(manifest, subject_id):
+        input_paths = PreprocessingCache.get_input_paths(subject_id)
+        if Constants.INCLUDE_CIRCADIAN:
+            input_paths.append(str(utils.get_project_root().joinpath('data/circadian_predictions/' + subject_id +
+                                                                     '_clock_proxy.txt')))
+
+        file_hashes = [PreprocessingCache.get_file_hash(manifest, path) for path in input_paths]
+        if None in file_hashes[0:3]:
+            return None
+
+        stage_keys = {}
+        previous_key = file_hashes
+        for stage in PreprocessingCache.STAGES:
+            description = json.dumps([PreprocessingCache.VERSION, stage, previous_key,
+                                      PreprocessingCache.get_parameters(stage)], sort_keys=True)
+            stage_keys[stage] = previous_key = hashlib.sha256(description.encode()).hexdigest()
+        return stage_keys
+
+    @staticmethod
+    def get_stale_stages(manifest, subject_id, stage_keys):
+        if stage_keys is None:
+            return list(PreprocessingCache.STAGES)
+
+        recorded_stages = manifest['subjects'].get(subject_id, {})
+        for index, stage in enumerate(PreprocessingCache.STAGES):
+            recorded = recorded_stages.get(stage)
+            if recorded is None or recorded['key'] != stage_keys[stage] \
+                    or not PreprocessingCache.artifacts_exist(recorded['artifacts']):
+                return list(PreprocessingCache.STAGES[index:])
+        return []
+
+    @staticmethod
+    def artifacts_exist(artifacts):
+        for path, recorded in artifacts.items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if stat.st_size != recorded['size'] or stat.st_mtime_ns != recorded['mtime_ns']:
+                return False
+        return True
+
+    @staticmethod
+    def record(manifest, subject_id, stage_keys, stages):
+        if stage_keys is None:
+            return
+
+        recorded_stages = manifest['subjects'].setdefault(subject_id, {})
+        for stage in stages:
+            artifacts = {}
+            for path in PreprocessingCache.get_artifact_paths(subject_id, stage):
+                stat = os.stat(path)
+                artifacts[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+                manifest['artifacts'][path] = {'subject_id': subject_id, 'stage': stage, 'key': stage_keys[stage]}
+            recorded_stages[stage] = {'key': stage_keys[stage], 'artifacts': artifacts}
@@ -3,33 +3,44 @@ import time
 from source.analysis.figures.data_plot_builder import DataPlotBuilder
 from source.analysis.setup.subject_builder import SubjectBuilder
 from source.constants import Constants
-from source.preprocessing.activity_count.activity_count_service import ActivityCountService
-from source.preprocessing.feature_builder import FeatureBuilder
-from source.preprocessing.raw_data_processor import RawDataProcessor
+from source.preprocessing.subject_preprocessor import SubjectPreprocessor
 from source.preprocessing.time.circadian_service import CircadianService
 
 
-def run_preprocessing(subject_set):
+def run_preprocessing(subject_set, number_of_workers=Constants.PREPROCESSING_WORKERS):
     start_time = time.time()
 
-    for subject in subject_set:
-        print("Cropping data from subject " + str(subject) + "...")
-        RawDataProcessor.crop_all(str(subject))
-
     if Constants.INCLUDE_CIRCADIAN:
-        ActivityCountService.build_activity_counts()  # This uses MATLAB, but has been replaced with a python implementation
+        crop_results = SubjectPreprocessor.run_all(subject_set, number_of_workers, stages=('crop', 'counts'))
+
+        # The MATLAB counts script is not run: the python counts stage above already wrote (and cached) the counts
         CircadianService.build_circadian_model()      # Both of the circadian lines require MATLAB to run
         CircadianService.build_circadian_mesa()       # INCLUDE_CIRCADIAN = False by default because most people don't have MATLAB
 
-    for subject in subject_set:
-        FeatureBuilder.build(str(subject))
+        cropped_subjects = [result.subject_id for result in crop_results if result.succeeded()]
+        feature_results = iter(SubjectPreprocessor.run_all(cropped_subjects, number_of_workers, stages=('features',)))
+
+        results = []
+        for crop_result in crop_results:
+            result = crop_result
+            if crop_result.succeeded():
+                result = next(feature_results)
+                result.crop_time = crop_result.crop_time
+                result.count_time = crop_result.count_time
+            results.append(result)
+    else:
+        results = SubjectPreprocessor.run_all(subject_set, number_of_workers)
+
+    SubjectPreprocessor.print_report(results)
 
     end_time = time.time()
     print("Execution took " + str((end_time - start_time) / 60) + " minutes")
+    return results
 
 
-subject_ids = SubjectBuilder.get_all_subject_ids()
-run_preprocessing(subject_ids)
+if __name__ == '__main__':
+    subject_ids = SubjectBuilder.get_all_subject_ids()
+    run_preprocessing(subject_ids)
 
 # for subject_id in subject_ids:
 #     DataPlotBuilder.make_data_demo(subject_id, False)
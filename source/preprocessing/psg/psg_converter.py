@@ -1,3 +1,5 @@
+import numpy as np
+
 from source.sleep_stage import SleepStage
 
 
@@ -35,3 +37,11 @@ class PSGConverter(object):
     def get_label_from_int(stage_int):
         if stage_int in PSGConverter.ints_to_labels:
             return PSGConverter.ints_to_labels[stage_int]
+
+    @staticmethod
+    def get_values_from_ints(stage_ints):
+        stage_ints = np.asarray(stage_ints)
+        values = np.full(len(stage_ints), SleepStage.unscored.value)
+        for stage_int, label in PSGConverter.ints_to_labels.items():
+            values[stage_ints == stage_int] = label.value
+        return values
@@ -2,6 +2,7 @@ import numpy as np
 import pandas as pd
 
 from source.constants import Constants
+from source.preprocessing.epoch_array import EpochArray
 from source.preprocessing.psg.psg_service import PSGService
 
 
@@ -19,11 +20,7 @@ class PSGLabelService(object):
     @staticmethod
     def build(subject_id, valid_epochs):
         psg_array = PSGService.load_cropped_array(subject_id)
-        labels = []
-        for epoch in valid_epochs:
-            value = np.interp(epoch.timestamp, psg_array[:, 0], psg_array[:, 1])
-            labels.append(value)
-        return np.array(labels)
+        return np.interp(EpochArray.get_timestamps(valid_epochs), psg_array[:, 0], psg_array[:, 1])
 
     @staticmethod
     def write(subject_id, labels):
@@ -6,6 +6,7 @@ import pandas as pd
 from source import utils
 from source.constants import Constants
 from source.preprocessing.epoch import Epoch
+from source.preprocessing.epoch_array import EpochArray
 from source.preprocessing.psg.compumedics_processor import CompumedicsProcessor
 from source.preprocessing.psg.psg_converter import PSGConverter
 from source.preprocessing.psg.psg_file_type import PSGFileType
@@ -57,15 +58,19 @@ class PSGService(object):
             data = VitaportProcessor.parse(report_summary, psg_stage_path)
             return PSGRawDataCollection(subject_id=subject_id, data=data)
 
+    @staticmethod
+    def get_precleaned_file_path(subject_id):
+        return utils.get_project_root().joinpath('data/labels/' + subject_id + '_labeled_sleep.npy')
+
     @staticmethod
     def get_original_start_time(subject_id):
-        psg_path = str(utils.get_project_root().joinpath('data/labels/' + subject_id + '_labeled_sleep.npy'))
+        psg_path = str(PSGService.get_precleaned_file_path(subject_id))
         raw_data = np.load(psg_path, mmap_mode='r')
         return raw_data[0, 0]
 
     @staticmethod
     def read_precleaned(subject_id):
-        psg_path = str(utils.get_project_root().joinpath('data/labels/' + subject_id + '_labeled_sleep.npy'))
+        psg_path = str(PSGService.get_precleaned_file_path(subject_id))
         data = []
 
         raw_data = np.load(psg_path)
@@ -99,13 +104,17 @@ class PSGService(object):
             data_array.append([stage_item.epoch.timestamp, stage_item.stage.value])
 
         np_psg_array = np.array(data_array)
-        psg_output_path = Constants.CROPPED_FILE_PATH.joinpath(psg_raw_data_collection.subject_id + "_cleaned_psg.npy")
+        psg_output_path = PSGService.get_cropped_file_path(psg_raw_data_collection.subject_id)
 
         np.save(psg_output_path, np_psg_array)
 
+    @staticmethod
+    def get_cropped_file_path(subject_id):
+        return Constants.CROPPED_FILE_PATH.joinpath(subject_id + "_cleaned_psg.npy")
+
     @staticmethod
     def load_cropped_array(subject_id):
-        cropped_psg_path = Constants.CROPPED_FILE_PATH.joinpath(subject_id + "_cleaned_psg.npy")
+        cropped_psg_path = PSGService.get_cropped_file_path(subject_id)
         return np.load(str(cropped_psg_path))
 
     @staticmethod
@@ -119,3 +128,9 @@ class PSGService(object):
                                          stage=PSGConverter.get_label_from_int(value)))
 
         return PSGRawDataCollection(subject_id=subject_id, data=stage_items)
+
+    @staticmethod
+    def load_cropped_epoch_array(subject_id):
+        cropped_array = PSGService.load_cropped_array(subject_id)
+        return EpochArray(timestamps=cropped_array[:, 0], indices=np.arange(np.shape(cropped_array)[0]),
+                          stages=PSGConverter.get_values_from_ints(cropped_array[:, 1]))
@@ -7,14 +7,20 @@ from source.preprocessing.heart_rate.heart_rate_service import HeartRateService
 from source.preprocessing.interval import Interval
 from source.preprocessing.motion.motion_service import MotionService
 from source.preprocessing.psg.psg_service import PSGService
-from source.sleep_stage import SleepStage
 
 
 class RawDataProcessor:
     BASE_FILE_PATH = utils.get_project_root().joinpath('outputs/cropped/')
+    MINIMUM_MOTION_SAMPLES = 1  # samples an epoch needs from each stream to count as valid
+    MINIMUM_HEART_RATE_SAMPLES = 1
 
     @staticmethod
     def crop_all(subject_id):
+        motion_collection = RawDataProcessor.crop(subject_id)
+        ActivityCountService.build_activity_counts_without_matlab(subject_id, motion_collection.data)  # Builds activity counts with python, not MATLAB
+
+    @staticmethod
+    def crop(subject_id):
         # psg_raw_collection = PSGService.read_raw(subject_id)       # Used to extract PSG details from the reports
         psg_raw_collection = PSGService.read_precleaned(subject_id)  # Loads already extracted PSG data
         motion_collection = MotionService.load_raw(subject_id)
@@ -31,7 +37,7 @@ class RawDataProcessor:
         PSGService.write(psg_raw_collection)
         MotionService.write(motion_collection)
         HeartRateService.write(heart_rate_collection)
-        ActivityCountService.build_activity_counts_without_matlab(subject_id, motion_collection.data)  # Builds activity counts with python, not MATLAB
+        return motion_collection
 
     @staticmethod
     def get_intersecting_interval(collection_list):
@@ -47,34 +53,29 @@ class RawDataProcessor:
     @staticmethod
     def get_valid_epochs(subject_id):
 
-        psg_collection = PSGService.load_cropped(subject_id)
+        epoch_array = PSGService.load_cropped_epoch_array(subject_id)
         motion_collection = MotionService.load_cropped(subject_id)
         heart_rate_collection = HeartRateService.load_cropped(subject_id)
 
-        start_time = psg_collection.data[0].epoch.timestamp
-        motion_epoch_dictionary = RawDataProcessor.get_valid_epoch_dictionary(motion_collection.timestamps,
-                                                                              start_time)
-        hr_epoch_dictionary = RawDataProcessor.get_valid_epoch_dictionary(heart_rate_collection.timestamps,
-                                                                          start_time)
-
-        valid_epochs = []
-        for stage_item in psg_collection.data:
-            epoch = stage_item.epoch
+        start_time = epoch_array.timestamps[0]
+        motion_counts = RawDataProcessor.get_epoch_sample_counts(motion_collection.timestamps,
+                                                                 epoch_array.timestamps, start_time)
+        hr_counts = RawDataProcessor.get_epoch_sample_counts(heart_rate_collection.timestamps,
+                                                             epoch_array.timestamps, start_time)
 
-            if epoch.timestamp in motion_epoch_dictionary and epoch.timestamp in hr_epoch_dictionary \
-                    and stage_item.stage != SleepStage.unscored:
-                valid_epochs.append(epoch)
+        valid = (motion_counts >= RawDataProcessor.MINIMUM_MOTION_SAMPLES) \
+            & (hr_counts >= RawDataProcessor.MINIMUM_HEART_RATE_SAMPLES) & epoch_array.is_scored()
 
-        return valid_epochs
+        return epoch_array.select(valid)
 
     @staticmethod
-    def get_valid_epoch_dictionary(timestamps, start_time):
-        epoch_dictionary = {}
-
-        for ind in range(np.shape(timestamps)[0]):
-            time = timestamps[ind]
-            floored_timestamp = time - np.mod(time - start_time, Epoch.DURATION)
+    def get_epoch_sample_counts(timestamps, epoch_timestamps, start_time):
+        sample_epochs = np.floor((np.asarray(timestamps) - start_time) / Epoch.DURATION).astype(np.int64)
+        occupied_epochs, sample_counts = np.unique(sample_epochs, return_counts=True)
 
-            epoch_dictionary[floored_timestamp] = True
+        epoch_indices = np.round((np.asarray(epoch_timestamps) - start_time) / Epoch.DURATION).astype(np.int64)
+        if len(occupied_epochs) == 0:
+            return np.zeros(len(epoch_indices), dtype=np.int64)
 
-        return epoch_dictionary
+        positions = np.minimum(np.searchsorted(occupied_epochs, epoch_indices), len(occupied_epochs) - 1)
+        return np.where(occupied_epochs[positions] == epoch_indices, sample_counts[positions], 0)
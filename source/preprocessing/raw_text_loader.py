@@ -0,0 +1,64 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from source import utils
+
+
+class RawTextLoader(object):
+    CHUNK_ROWS = 1 << 18
+    BYTES_PER_ROW_ESTIMATE = 32
+
+    @staticmethod
+    def load(path, delimiter=' ', write_sidecar=False):
+        # Parses a raw recording and removes repeated rows. The cleaned array can be kept as a .npy sidecar
+        # that later loads map straight from disk while it is newer than the text file
+        sidecar_path = RawTextLoader.get_sidecar_path(path)
+        if RawTextLoader.is_sidecar_current(path, sidecar_path):
+            return np.load(str(sidecar_path), mmap_mode='r')
+
+        array = utils.remove_repeats(RawTextLoader.parse(path, delimiter))
+
+        if write_sidecar:
+            temporary_path = str(sidecar_path) + '.tmp'
+            with open(temporary_path, 'wb') as sidecar_file:
+                np.save(sidecar_file, array)
+            os.replace(temporary_path, str(sidecar_path))
+        return array
+
+    @staticmethod
+    def get_sidecar_path(path):
+        return Path(str(path) + '.npy')
+
+    @staticmethod
+    def is_sidecar_current(path, sidecar_path):
+        try:
+            return os.stat(str(sidecar_path)).st_mtime_ns >= os.stat(str(path)).st_mtime_ns
+        except OSError:
+            return False
+
+    @staticmethod
+    def parse(path, delimiter=' '):
+        capacity = max(os.path.getsize(str(path)) // RawTextLoader.BYTES_PER_ROW_ESTIMATE, 1)
+        array = None
+        number_of_rows = 0
+
+        # The first line is a header, as with pd.read_csv's default
+        for chunk in pd.read_csv(str(path), delimiter=delimiter, dtype=np.float64, chunksize=RawTextLoader.CHUNK_ROWS):
+            values = chunk.values
+            if array is None:
+                array = np.empty((capacity, values.shape[1]))
+            if number_of_rows + len(values) > len(array):
+                grown_array = np.empty((max(2 * len(array), number_of_rows + len(values)), values.shape[1]))
+                grown_array[0:number_of_rows] = array[0:number_of_rows]
+                array = grown_array
+            array[number_of_rows:number_of_rows + len(values)] = values
+            number_of_rows = number_of_rows + len(values)
+
+        if array is None:
+            return np.zeros((0, 0))
+        if number_of_rows < len(array) // 2:
+            return array[0:number_of_rows].copy()
+        return array[0:number_of_rows]
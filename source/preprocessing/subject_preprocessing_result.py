@@ -0,0 +1,11 @@
+class SubjectPreprocessingResult(object):
+    def __init__(self, subject_id, crop_time=0.0, count_time=0.0, feature_time=0.0, error=None, cached=False):
+        self.subject_id = subject_id
+        self.crop_time = crop_time
+        self.count_time = count_time
+        self.feature_time = feature_time
+        self.error = error
+        self.cached = cached
+
+    def succeeded(self):
+        return self.error is None
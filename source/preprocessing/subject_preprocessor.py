@@ -0,0 +1,99 @@
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from source.preprocessing.activity_count.activity_count_service import ActivityCountService
+from source.preprocessing.feature_builder import FeatureBuilder
+from source.preprocessing.motion.motion_service import MotionService
+from source.preprocessing.preprocessing_cache import PreprocessingCache
+from source.preprocessing.raw_data_processor import RawDataProcessor
+from source.preprocessing.subject_preprocessing_result import SubjectPreprocessingResult
+
+
+class SubjectPreprocessor(object):
+
+    @staticmethod
+    def run(subject_id, stages=PreprocessingCache.STAGES):
+        result = SubjectPreprocessingResult(subject_id)
+        try:
+            if 'crop' in stages:
+                start_time = time.time()
+                print("Cropping data from subject " + subject_id + "...")
+                RawDataProcessor.crop(subject_id)
+                result.crop_time = time.time() - start_time
+
+            if 'counts' in stages:
+                start_time = time.time()
+                motion_collection = MotionService.load_cropped(subject_id)
+                ActivityCountService.build_activity_counts_without_matlab(subject_id, motion_collection.data)
+                result.count_time = time.time() - start_time
+
+            if 'features' in stages:
+                start_time = time.time()
+                FeatureBuilder.build(subject_id)
+                result.feature_time = time.time() - start_time
+        except Exception:
+            result.error = traceback.format_exc()
+
+        return result
+
+    @staticmethod
+    def run_all(subject_ids, number_of_workers=None, stages=PreprocessingCache.STAGES, use_cache=True):
+        subject_ids = [str(subject_id) for subject_id in subject_ids]
+        manifest = PreprocessingCache.load() if use_cache else None
+
+        tasks = []
+        for subject_id in subject_ids:
+            stage_keys = None
+            stages_to_run = list(stages)
+            if use_cache:
+                stage_keys = PreprocessingCache.get_stage_keys(manifest, subject_id)
+                stale_stages = PreprocessingCache.get_stale_stages(manifest, subject_id, stage_keys)
+                stages_to_run = [stage for stage in stages if stage in stale_stages]
+            tasks.append((subject_id, stage_keys, stages_to_run))
+
+        results = SubjectPreprocessor.run_tasks(tasks, number_of_workers)
+
+        if use_cache:
+            for (subject_id, stage_keys, stages_to_run), result in zip(tasks, results):
+                if result.succeeded():
+                    PreprocessingCache.record(manifest, subject_id, stage_keys, stages_to_run)
+            PreprocessingCache.save(manifest)
+
+        return results
+
+    @staticmethod
+    def run_tasks(tasks, number_of_workers):
+        results = [SubjectPreprocessingResult(subject_id, cached=True) for subject_id, _, _ in tasks]
+        pending = [index for index, (_, _, stages_to_run) in enumerate(tasks) if len(stages_to_run) > 0]
+
+        if number_of_workers == 1 or len(pending) <= 1:
+            for index in pending:
+                subject_id, _, stages_to_run = tasks[index]
+                results[index] = SubjectPreprocessor.run(subject_id, stages_to_run)
+            return results
+
+        with ProcessPoolExecutor(max_workers=number_of_workers) as executor:
+            futures = [executor.submit(SubjectPreprocessor.run, tasks[index][0], tasks[index][2])
+                       for index in pending]
+
+            for index, future in zip(pending, futures):
+                try:
+                    results[index] = future.result()
+                except Exception:  # The worker process died, e.g. BrokenProcessPool
+                    results[index] = SubjectPreprocessingResult(tasks[index][0], error=traceback.format_exc())
+        return results
+
+    @staticmethod
+    def print_report(results):
+        for result in results:
+            if result.cached:
+                status = "cached"
+            else:
+                status = "ok" if result.succeeded() else "FAILED"
+            print(f"{result.subject_id}: {status} (crop {result.crop_time:.1f} s, counts {result.count_time:.1f} s, "
+                  f"features {result.feature_time:.1f} s)")
+
+        for result in results:
+            if not result.succeeded():
+                print(f"Subject {result.subject_id} failed:\n{result.error}")
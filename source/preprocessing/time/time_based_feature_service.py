@@ -3,6 +3,7 @@ import pandas as pd
 
 from source import utils
 from source.constants import Constants
+from source.preprocessing.epoch_array import EpochArray
 
 
 class TimeBasedFeatureService(object):
@@ -53,15 +54,10 @@ class TimeBasedFeatureService(object):
 
     @staticmethod
     def build_time(valid_epochs, start_time=None):
-        features = []
-        first_timestamp = start_time if start_time is not None else valid_epochs[0].timestamp
-        for epoch in valid_epochs:
-            value = epoch.timestamp - first_timestamp
+        timestamps = EpochArray.get_timestamps(valid_epochs)
+        first_timestamp = start_time if start_time is not None else timestamps[0]
 
-            value = value / 3600.0  # Changing units to hours improves performance
-
-            features.append(value)
-        return np.array(features)
+        return (timestamps - first_timestamp) / 3600.0  # Changing units to hours improves performance
 
     @staticmethod
     def build_circadian_model(subject_id, valid_epochs):
@@ -80,33 +76,18 @@ class TimeBasedFeatureService(object):
 
     @staticmethod
     def build_cosine(valid_epochs, start_time=None):
-        features = []
-        first_timestamp = start_time if start_time is not None else valid_epochs[0].timestamp
-
-        for epoch in valid_epochs:
-            value = TimeBasedFeatureService.cosine_proxy(epoch.timestamp - first_timestamp)
-            normalized_value = value
-            features.append(normalized_value)
+        timestamps = EpochArray.get_timestamps(valid_epochs)
+        first_timestamp = start_time if start_time is not None else timestamps[0]
 
-        return np.array(features)
+        return TimeBasedFeatureService.cosine_proxy(timestamps - first_timestamp)
 
     @staticmethod
     def build_circadian_model_from_raw(circadian_model, valid_epochs):
-        features = []
-
-        first_inactive_epoch = valid_epochs[0]
-        first_value = np.interp(first_inactive_epoch.timestamp, circadian_model[:, 0], circadian_model[:, 1])
-
-        for epoch in valid_epochs:
-            time = epoch.timestamp
-            value = np.interp(time, circadian_model[:, 0], circadian_model[:, 1])
-            normalized_value = (value - first_value) / (np.amin((circadian_model[:, 1] - first_value)))
-
-            if normalized_value < Constants.LOWER_BOUND:
-                normalized_value = Constants.LOWER_BOUND
-
-            features.append([normalized_value])
+        timestamps = EpochArray.get_timestamps(valid_epochs)
+        first_value = np.interp(timestamps[0], circadian_model[:, 0], circadian_model[:, 1])
 
-        feature_array = np.array(features)
+        values = np.interp(timestamps, circadian_model[:, 0], circadian_model[:, 1])
+        normalized_values = (values - first_value) / (np.amin((circadian_model[:, 1] - first_value)))
+        normalized_values[normalized_values < Constants.LOWER_BOUND] = Constants.LOWER_BOUND
 
-        return feature_array
+        return np.expand_dims(normalized_values, axis=1)
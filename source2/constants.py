@@ -13,6 +13,7 @@ class Constants(object):
     SECONDS_PER_DAY = 3600 * 24
     SECONDS_PER_HOUR = 3600
     VERBOSE = True
+    WRITE_RAW_SIDECARS = False  # Keep parsed raw recordings as .npy files next to the text files
     # CROPPED_FILE_PATH = utils.get_project_root().joinpath('outputs_lab/cropped/')
     # FEATURE_FILE_PATH = utils.get_project_root().joinpath('outputs_lab/features/')
     # FIGURE_FILE_PATH = utils.get_project_root().joinpath('outputs_lab/figures/')
@@ -40,20 +40,27 @@ class ActivityCountFeatureService(object):
         return ActivityCountFeatureService.build_from_collection(activity_count_collection, valid_epochs)
 
     @staticmethod
-    def build_from_collection(activity_count_collection, valid_epochs):
-        count_features = []
+    def get_window_bounds(timestamps, epoch_timestamps):
+        # Vectorized get_window for sorted timestamps: returns [first, last) index bounds of every epoch's window
+        start_times = epoch_timestamps - ActivityCountFeatureService.WINDOW_SIZE
+        end_times = epoch_timestamps + Epoch.DURATION + ActivityCountFeatureService.WINDOW_SIZE
+        first_indices = np.searchsorted(timestamps, start_times, side='right')
+        last_indices = np.searchsorted(timestamps, end_times, side='left')
+        return first_indices, np.maximum(last_indices, first_indices)
 
+    @staticmethod
+    def build_from_collection(activity_count_collection, valid_epochs):
         interpolated_timestamps, interpolated_counts = ActivityCountFeatureService.interpolate(
             activity_count_collection)
 
-        for epoch in valid_epochs:
-            indices_in_range = ActivityCountFeatureService.get_window(interpolated_timestamps, epoch)
-            activity_counts_in_range = interpolated_counts[indices_in_range]
-
-            feature = ActivityCountFeatureService.get_feature(activity_counts_in_range)
-            count_features.append(feature)
+        epoch_timestamps = np.array([epoch.timestamp for epoch in valid_epochs], dtype=float)
+        if len(epoch_timestamps) == 0:
+            return np.array([])
 
-        return np.array(count_features)
+        first_indices, last_indices = ActivityCountFeatureService.get_window_bounds(interpolated_timestamps,
+                                                                                    epoch_timestamps)
+        count_features = utils.smooth_gauss_windows(interpolated_counts, first_indices, last_indices)
+        return count_features[:, np.newaxis]
 
     @staticmethod
     def get_feature(count_values):
@@ -10,6 +10,17 @@ from source.preprocessing.activity_count.activity_count_collection import Activi
 
 
 class ActivityCountService(object):
+    SAMPLING_FREQUENCY = 50
+    CUTOFF_LOW = 3
+    CUTOFF_HIGH = 11
+    FILTER_ORDER = 5
+    BIN_TOP_EDGE = 5
+    BIN_BOTTOM_EDGE = 0
+    NUMBER_OF_BINS = 128
+    EPOCH_DURATION = 15
+    COUNT_OFFSET = 18
+    COUNT_SCALE = 3.07
+
     @staticmethod
     def load_cropped(subject_id):
         activity_counts_path = ActivityCountService.get_cropped_file_path(subject_id)
@@ -33,30 +44,14 @@ class ActivityCountService(object):
     @staticmethod
     def build_activity_counts_without_matlab(subject_id, data):
 
-        fs = 50
+        fs = ActivityCountService.SAMPLING_FREQUENCY
         time = np.arange(np.amin(data[:, 0]), np.amax(data[:, 0]), 1.0 / fs)
         z_data = np.interp(time, data[:, 0], data[:, 3])
 
-        cf_low = 3
-        cf_hi = 11
-        order = 5
-        w1 = cf_low / (fs / 2)
-        w2 = cf_hi / (fs / 2)
-        pass_band = [w1, w2]
-        b, a = butter(order, pass_band, 'bandpass')
+        b, a = ActivityCountService.get_filter()
 
         z_filt = filtfilt(b, a, z_data)
-        z_filt = np.abs(z_filt)
-        top_edge = 5
-        bottom_edge = 0
-        number_of_bins = 128
-
-        bin_edges = np.linspace(bottom_edge, top_edge, number_of_bins + 1)
-        binned = np.digitize(z_filt, bin_edges)
-        epoch = 15
-        counts = ActivityCountService.max2epochs(binned, fs, epoch)
-        counts = (counts - 18) * 3.07
-        counts[counts < 0] = 0
+        counts = ActivityCountService.get_counts_from_filtered(z_filt)
 
         time_counts = np.linspace(np.min(data[:, 0]), max(data[:, 0]), np.shape(counts)[0])
         time_counts = np.expand_dims(time_counts, axis=1)
@@ -66,6 +61,34 @@ class ActivityCountService(object):
         activity_count_output_path = ActivityCountService.get_cropped_file_path(subject_id)
         np.savetxt(activity_count_output_path, output, fmt='%f', delimiter=',')
 
+    @staticmethod
+    def get_filter():
+        fs = ActivityCountService.SAMPLING_FREQUENCY
+        w1 = ActivityCountService.CUTOFF_LOW / (fs / 2)
+        w2 = ActivityCountService.CUTOFF_HIGH / (fs / 2)
+        pass_band = [w1, w2]
+        return butter(ActivityCountService.FILTER_ORDER, pass_band, 'bandpass')
+
+    @staticmethod
+    def get_sos_filter():
+        fs = ActivityCountService.SAMPLING_FREQUENCY
+        w1 = ActivityCountService.CUTOFF_LOW / (fs / 2)
+        w2 = ActivityCountService.CUTOFF_HIGH / (fs / 2)
+        pass_band = [w1, w2]
+        return butter(ActivityCountService.FILTER_ORDER, pass_band, 'bandpass', output='sos')
+
+    @staticmethod
+    def get_counts_from_filtered(z_filt):
+        z_filt = np.abs(z_filt)
+        bin_edges = np.linspace(ActivityCountService.BIN_BOTTOM_EDGE, ActivityCountService.BIN_TOP_EDGE,
+                                ActivityCountService.NUMBER_OF_BINS + 1)
+        binned = np.digitize(z_filt, bin_edges)
+        counts = ActivityCountService.max2epochs(binned, ActivityCountService.SAMPLING_FREQUENCY,
+                                                 ActivityCountService.EPOCH_DURATION)
+        counts = (counts - ActivityCountService.COUNT_OFFSET) * ActivityCountService.COUNT_SCALE
+        counts[counts < 0] = 0
+        return counts
+
     @staticmethod
     def max2epochs(data, fs, epoch):
         data = data.flatten()
@@ -1,5 +1,8 @@
+import numpy as np
+
 from source.constants import Constants
 from source.preprocessing.activity_count.activity_count_feature_service import ActivityCountFeatureService
+from source.preprocessing.feature_store import FeatureStore
 from source.preprocessing.heart_rate.heart_rate_feature_service import HeartRateFeatureService
 from source.preprocessing.psg.psg_label_service import PSGLabelService
 from source.preprocessing.raw_data_processor import RawDataProcessor
@@ -16,32 +19,31 @@ class FeatureBuilder(object):
 
         if Constants.VERBOSE:
             print("Building features...")
-        FeatureBuilder.build_labels(subject_id, valid_epochs)
-        FeatureBuilder.build_from_wearables(subject_id, valid_epochs)
-        FeatureBuilder.build_from_time(subject_id, valid_epochs)
+        columns = {'timestamp': [epoch.timestamp for epoch in valid_epochs]}
+        columns.update(FeatureBuilder.build_labels(subject_id, valid_epochs))
+        columns.update(FeatureBuilder.build_from_wearables(subject_id, valid_epochs))
+        columns.update(FeatureBuilder.build_from_time(subject_id, valid_epochs))
+        FeatureStore.write(subject_id, columns)
 
     @staticmethod
     def build_labels(subject_id, valid_epochs):
-        psg_labels = PSGLabelService.build(subject_id, valid_epochs)
-        PSGLabelService.write(subject_id, psg_labels)
+        return {'psg_label': PSGLabelService.build(subject_id, valid_epochs)}
 
     @staticmethod
     def build_from_wearables(subject_id, valid_epochs):
 
         count_feature = ActivityCountFeatureService.build(subject_id, valid_epochs)
-        heart_rate_feature = HeartRateFeatureService.build(subject_id, valid_epochs)
-        ActivityCountFeatureService.write(subject_id, count_feature)
-        HeartRateFeatureService.write(subject_id, heart_rate_feature)
+        heart_rate_feature = np.reshape(HeartRateFeatureService.build(subject_id, valid_epochs), (-1, 2))
+        return {'count_feature': count_feature,
+                'hr_std': heart_rate_feature[:, 0],
+                'hr_mean': heart_rate_feature[:, 1]}
 
     @staticmethod
     def build_from_time(subject_id, valid_epochs):
+        columns = {'cosine_feature': TimeBasedFeatureService.build_cosine(valid_epochs),
+                   'time_feature': TimeBasedFeatureService.build_time(valid_epochs)}
 
         if Constants.INCLUDE_CIRCADIAN:
-            circadian_feature = TimeBasedFeatureService.build_circadian_model(subject_id, valid_epochs)
-            TimeBasedFeatureService.write_circadian_model(subject_id, circadian_feature)
-
-        cosine_feature = TimeBasedFeatureService.build_cosine(valid_epochs)
-        time_feature = TimeBasedFeatureService.build_time(valid_epochs)
+            columns['circadian_feature'] = TimeBasedFeatureService.build_circadian_model(subject_id, valid_epochs)
 
-        TimeBasedFeatureService.write_cosine(subject_id, cosine_feature)
-        TimeBasedFeatureService.write_time(subject_id, time_feature)
+        return columns
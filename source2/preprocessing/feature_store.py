@@ -0,0 +1,33 @@
+import numpy as np
+
+from source.constants import Constants
+
+
+class FeatureStore(object):
+    SCHEMA_VERSION = 1
+    COLUMNS = ('timestamp', 'psg_label', 'count_feature', 'hr_std', 'hr_mean', 'hr_mean_raw', 'time_feature',
+               'cosine_feature', 'circadian_feature')
+
+    @staticmethod
+    def get_path(subject_id):
+        return Constants.FEATURE_FILE_PATH.joinpath(subject_id + '_features.npz')
+
+    @staticmethod
+    def write(subject_id, columns):
+        number_of_epochs = len(columns['timestamp'])
+        features = np.full(number_of_epochs, np.nan, dtype=[(name, np.float64) for name in FeatureStore.COLUMNS])
+        for name, values in columns.items():
+            if values is not None:
+                features[name] = np.ravel(values)
+
+        np.savez(str(FeatureStore.get_path(subject_id)), schema_version=FeatureStore.SCHEMA_VERSION,
+                 features=features)
+
+    @staticmethod
+    def load(subject_id):
+        with np.load(str(FeatureStore.get_path(subject_id))) as store:
+            schema_version = int(store['schema_version'])
+            if schema_version != FeatureStore.SCHEMA_VERSION:
+                raise ValueError(f"Feature store for {subject_id} has schema version {schema_version}, expected "
+                                 f"{FeatureStore.SCHEMA_VERSION}")
+            return store['features']
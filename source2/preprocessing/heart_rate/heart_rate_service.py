@@ -3,6 +3,7 @@ import pandas as pd
 
 from source import utils
 from source.constants import Constants
+from source.preprocessing.raw_text_loader import RawTextLoader
 from source.preprocessing.heart_rate.heart_rate_collection import HeartRateCollection
 
 
@@ -11,8 +12,7 @@ class HeartRateService(object):
     @staticmethod
     def load_raw(subject_id):
         raw_hr_path = HeartRateService.get_raw_file_path(subject_id)
-        heart_rate_array = HeartRateService.load(raw_hr_path, ",")
-        heart_rate_array = utils.remove_repeats(heart_rate_array)
+        heart_rate_array = RawTextLoader.load(raw_hr_path, ",", write_sidecar=Constants.WRITE_RAW_SIDECARS)
         return HeartRateCollection(subject_id=subject_id, data=heart_rate_array)
 
     @staticmethod
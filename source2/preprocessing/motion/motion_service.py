@@ -3,6 +3,7 @@ import pandas as pd
 
 from source import utils
 from source.constants import Constants
+from source.preprocessing.raw_text_loader import RawTextLoader
 from source.preprocessing.motion.motion_collection import MotionCollection
 
 
@@ -11,8 +12,7 @@ class MotionService(object):
     @staticmethod
     def load_raw(subject_id):
         raw_motion_path = MotionService.get_raw_file_path(subject_id)
-        motion_array = MotionService.load(raw_motion_path)
-        motion_array = utils.remove_repeats(motion_array)
+        motion_array = RawTextLoader.load(raw_motion_path, ' ', write_sidecar=Constants.WRITE_RAW_SIDECARS)
         return MotionCollection(subject_id=subject_id, data=motion_array)
 
     @staticmethod
@@ -1,7 +1,5 @@
 import time
 
-from source.analysis.figures.data_plot_builder import DataPlotBuilder
-from source.analysis.setup.subject_builder import SubjectBuilder
 from source.constants import Constants
 from source.preprocessing.activity_count.activity_count_service import ActivityCountService
 from source.preprocessing.feature_builder import FeatureBuilder
@@ -2,14 +2,6 @@ from io import StringIO
 from pathlib import Path
 
 import numpy as np
-from pdfminer.converter import TextConverter
-from pdfminer.layout import LAParams
-from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
-from pdfminer.pdfpage import PDFPage
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.neural_network import MLPClassifier
 
 from source.analysis.setup.attributed_classifier import AttributedClassifier
 from source.analysis.setup.feature_type import FeatureType
@@ -20,6 +12,12 @@ def get_project_root() -> Path:
 
 
 def get_classifiers():
+    # Imported here so that the preprocessing and serving paths do not pay for the classifier stacks
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.neural_network import MLPClassifier
+
     return [AttributedClassifier(name='Random Forest',
                                  classifier=RandomForestClassifier(n_estimators=100, max_features=1.0,
                                                                    max_depth=10,
@@ -46,6 +44,11 @@ def get_base_feature_sets():
 
 
 def convert_pdf_to_txt(pdf_path_string, all_texts):
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+    from pdfminer.pdfpage import PDFPage
+
     resource_manager = PDFResourceManager()
     returned_string = StringIO()
     codec = 'utf-8'
@@ -70,15 +73,27 @@ def convert_pdf_to_txt(pdf_path_string, all_texts):
     return text
 
 
-def smooth_gauss(y, box_pts):
-    box = np.ones(box_pts) / box_pts
-    mu = int(box_pts / 2.0)
-    sigma = 50  # seconds
+gauss_kernels = {}
 
-    for ind in range(0, box_pts):
-        box[ind] = np.exp(-1 / 2 * (((ind - mu) / sigma) ** 2))
 
-    box = box / np.sum(box)
+def get_gauss_kernel(box_pts, mu):
+    # Kernels are memoized per window length; they are built exactly as before so results stay bit-identical
+    key = (box_pts, mu)
+    if key not in gauss_kernels:
+        box = np.ones(box_pts) / box_pts
+        sigma = 50  # seconds
+
+        for ind in range(0, box_pts):
+            box[ind] = np.exp(-1 / 2 * (((ind - mu) / sigma) ** 2))
+
+        box = box / np.sum(box)
+        box.flags.writeable = False
+        gauss_kernels[key] = box
+    return gauss_kernels[key]
+
+
+def smooth_gauss(y, box_pts):
+    box = get_gauss_kernel(box_pts, int(box_pts / 2.0))
     sum_value = 0
     for ind in range(0, box_pts):
         sum_value += box[ind] * y[ind]
@@ -86,30 +101,77 @@ def smooth_gauss(y, box_pts):
     return sum_value
 
 
-def convolve_with_dog(y, box_pts):
-    y = y - np.mean(y)
-    box = np.ones(box_pts) / box_pts
+def smooth_gauss_windows(y, first_indices, last_indices, causal=False):
+    # Same result as calling smooth_gauss(_causal) on y[first:last] for every window. Windows of equal length
+    # share a kernel and are summed together, adding one kernel tap at a time in the same order as the scalar loop
+    lengths = last_indices - first_indices
+    sum_values = np.zeros(len(lengths))
 
-    mu1 = int(box_pts / 2.0)
-    sigma1 = 120
+    for box_pts in np.unique(lengths):
+        rows = np.nonzero(lengths == box_pts)[0]
+        box = get_gauss_kernel(int(box_pts), int(box_pts) - 1 if causal else int(box_pts / 2.0))
+        windows = y[first_indices[rows, np.newaxis] + np.arange(box_pts)]
 
-    mu2 = int(box_pts / 2.0)
-    sigma2 = 600
+        sum_value = np.zeros(len(rows))
+        for ind in range(0, box_pts):
+            sum_value += box[ind] * windows[:, ind]
+        sum_values[rows] = sum_value
 
-    scalar = 0.75
+    return sum_values
 
-    for ind in range(0, box_pts):
-        box[ind] = np.exp(-1 / 2 * (((ind - mu1) / sigma1) ** 2)) - scalar * np.exp(
-            -1 / 2 * (((ind - mu2) / sigma2) ** 2))
 
+dog_kernels = {}
+
+FFT_CONVOLUTION_MINIMUM = 2 ** 23  # signal length times kernel length above which FFT beats direct convolution
+
+
+def get_dog_kernel(box_pts, sigma1=120, sigma2=600, scalar=0.75):
+    key = (box_pts, sigma1, sigma2, scalar)
+    if key not in dog_kernels:
+        box = np.ones(box_pts) / box_pts
+
+        mu1 = int(box_pts / 2.0)
+        mu2 = int(box_pts / 2.0)
+
+        for ind in range(0, box_pts):
+            box[ind] = np.exp(-1 / 2 * (((ind - mu1) / sigma1) ** 2)) - scalar * np.exp(
+                -1 / 2 * (((ind - mu2) / sigma2) ** 2))
+
+        box.flags.writeable = False
+        dog_kernels[key] = box
+    return dog_kernels[key]
+
+
+def convolve_valid(y, box):
+    if len(y) * len(box) < FFT_CONVOLUTION_MINIMUM or len(y) < len(box):
+        return np.convolve(y, box, mode='valid')
+
+    from scipy.signal import oaconvolve
+    return oaconvolve(y, box, mode='valid')
+
+
+def pad_reflective(y, box_pts):
     y = np.insert(y, 0, np.flip(y[0:int(box_pts / 2)]))  # Pad by repeating boundary conditions
-    y = np.insert(y, len(y) - 1, np.flip(y[int(-box_pts / 2):]))
-    y_smooth = np.convolve(y, box, mode='valid')
+    return np.insert(y, len(y) - 1, np.flip(y[int(-box_pts / 2):]))
 
-    return y_smooth
+
+def convolve_with_dog(y, box_pts):
+    y = y - np.mean(y)
+    box = get_dog_kernel(box_pts)
+
+    return convolve_valid(pad_reflective(y, box_pts), box)
 
 
 def remove_repeats(array):
+    # Recordings are almost always in time order already; dropping adjacent duplicate rows then matches the full
+    # unique-and-sort below in O(n)
+    if len(array) > 1:
+        keep = np.ones(len(array), dtype=bool)
+        keep[1:] = np.any(array[1:] != array[:-1], axis=1)
+        array_no_repeats = array[keep]
+        if np.all(array_no_repeats[1:, 0] > array_no_repeats[:-1, 0]):
+            return array_no_repeats
+
     array_no_repeats = np.unique(array, axis=0)
     array_no_repeats = array_no_repeats[np.argsort(array_no_repeats[:, 0])]
     return array_no_repeats
@@ -53,3 +53,19 @@ class TestClassifierInputBuilder(TestCase):
 
         self.assertEqual(np.array([[0, 6], [1, 7], [100, 106], [101, 107]]).tolist(), features.tolist())
         self.assertEqual(np.array([[0], [1], [1], [1]]).tolist(), labels.tolist())
+
+    @mock.patch("source.analysis.classification.classifier_input_builder.DesignMatrix")
+    def test_design_matrix_is_built_once_per_feature_set(self, mock_design_matrix):
+        subject_dictionary = {"subjectA": None, "subjectB": None}
+        mock_design_matrix.build.side_effect = lambda subject_ids, dictionary, feature_set: mock.MagicMock()
+
+        first = ClassifierInputBuilder.get_design_matrix(subject_dictionary, [FeatureType.count])
+        second = ClassifierInputBuilder.get_design_matrix(subject_dictionary, [FeatureType.count])
+        other_feature_set = ClassifierInputBuilder.get_design_matrix(subject_dictionary, [FeatureType.cosine])
+        other_dictionary = ClassifierInputBuilder.get_design_matrix(dict(subject_dictionary), [FeatureType.count])
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other_feature_set)
+        self.assertIsNot(first, other_dictionary)
+        mock_design_matrix.build.assert_any_call(["subjectA", "subjectB"], subject_dictionary, [FeatureType.count])
+        self.assertEqual(3, mock_design_matrix.build.call_count)
@@ -0,0 +1,45 @@
+from unittest import TestCase, mock
+
+from source.analysis.classification.classifier_pool import ClassifierPool
+
+
+class TestClassifierPool(TestCase):
+
+    def tearDown(self):
+        ClassifierPool.published.clear()
+
+    @mock.patch('source.analysis.classification.classifier_pool.SharedDesignMatrix')
+    @mock.patch('source.analysis.classification.classifier_pool.ClassifierInputBuilder')
+    def test_publishes_once_per_feature_set_and_dictionary(self, mock_input_builder, mock_shared_design_matrix):
+        first_memory = mock.MagicMock()
+        second_memory = mock.MagicMock()
+        first_shared_design_matrix = mock.MagicMock()
+        second_shared_design_matrix = mock.MagicMock()
+        mock_shared_design_matrix.publish.side_effect = [(first_shared_design_matrix, [first_memory]),
+                                                         (second_shared_design_matrix, [second_memory])]
+        subject_dictionary = {}
+
+        self.assertIs(first_shared_design_matrix, ClassifierPool.publish(subject_dictionary, ["count"]))
+        self.assertIs(first_shared_design_matrix, ClassifierPool.publish(subject_dictionary, ["count"]))
+        first_memory.unlink.assert_not_called()
+
+        self.assertIs(second_shared_design_matrix, ClassifierPool.publish({}, ["count"]))
+        first_shared_design_matrix.detach.assert_called_once_with()
+        first_memory.close.assert_called_once_with()
+        first_memory.unlink.assert_called_once_with()
+        mock_input_builder.get_design_matrix.assert_called_with({}, ["count"])
+        self.assertEqual(2, mock_input_builder.get_design_matrix.call_count)
+
+    @mock.patch('source.analysis.classification.classifier_pool.cpu_count')
+    @mock.patch('source.analysis.classification.classifier_pool.Pool')
+    def test_pool_persists_until_closed(self, mock_pool_constructor, mock_cpu_count):
+        mock_cpu_count.return_value = 32
+
+        pool = ClassifierPool.get_pool()
+        self.assertIs(pool, ClassifierPool.get_pool())
+        mock_pool_constructor.assert_called_once_with(32)
+
+        ClassifierPool.close()
+        pool.close.assert_called_once_with()
+        pool.join.assert_called_once_with()
+        self.assertIsNone(ClassifierPool.pool)
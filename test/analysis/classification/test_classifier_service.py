@@ -14,36 +14,103 @@ from test.test_helper import TestHelper
 
 class TestClassifierService(TestCase):
 
-    @mock.patch('source.analysis.classification.classifier_service.Pool')
-    @mock.patch('source.analysis.classification.classifier_service.cpu_count')
+    @mock.patch('source.analysis.classification.classifier_service.ClassifierPool')
     @mock.patch('source.analysis.classification.classifier_service.partial')
-    def test_runs_training_and_testing_in_parallel(self, mock_partial, mock_cpu_count, mock_pool_constructor):
+    def test_runs_training_and_testing_in_parallel(self, mock_partial, mock_classifier_pool):
         expected_partial = "I am a partial"
         mock_partial.return_value = expected_partial
 
         mock_pool = MagicMock()
-        mock_pool_constructor.return_value = mock_pool
+        mock_classifier_pool.get_pool.return_value = mock_pool
+        mock_shared_design_matrix = MagicMock()
+        mock_classifier_pool.publish.return_value = mock_shared_design_matrix
+        mock_shared_design_matrix.get_positions.side_effect = lambda subject_ids: subject_ids
 
         data_splits = [DataSplit(training_set=["subjectA", "subjectB", "subjectC"], testing_set=["subjectD"]),
                        DataSplit(training_set=["subjectA", "subjectB", "subjectD"], testing_set=["subjectC"])]
         classifier = RandomForestClassifier()
         subject_dictionary = {}
         feature_set = {}
-        mock_pool.map.return_value = expected_pool_return = [3, 4]
-
-        expected_number_of_cpus = 32
-        mock_cpu_count.return_value = expected_number_of_cpus
+        mock_pool.imap_unordered.return_value = [(1, 4), (0, 3)]
+        expected_pool_return = [3, 4]
 
         results = ClassifierService.run_sw(data_splits, classifier, subject_dictionary, feature_set)
 
-        mock_partial.assert_called_once_with(ClassifierService.run_single_data_split_sw,
-                                             attributed_classifier=classifier,
-                                             subject_dictionary=subject_dictionary, feature_set=feature_set)
-
-        mock_pool_constructor.assert_called_once_with(expected_number_of_cpus)
-        mock_pool.map.assert_called_once_with(expected_partial, data_splits)
+        mock_classifier_pool.publish.assert_called_once_with(subject_dictionary, feature_set)
+        mock_partial.assert_called_once_with(ClassifierService.run_indexed_task,
+                                             function=ClassifierService.run_shared_data_split_sw,
+                                             attributed_classifier=classifier)
+        expected_tasks = [(0, (mock_shared_design_matrix, ["subjectA", "subjectB", "subjectC"], ["subjectD"])),
+                          (1, (mock_shared_design_matrix, ["subjectA", "subjectB", "subjectD"], ["subjectC"]))]
+        mock_pool.imap_unordered.assert_called_once_with(expected_partial, expected_tasks)
         self.assertEqual(expected_pool_return, results)
 
+    @mock.patch('source.analysis.classification.classifier_service.ClassifierInputBuilder')
+    @mock.patch('source.analysis.classification.classifier_service.ClassifierPool')
+    def test_checkpointed_splits_are_skipped_and_new_splits_saved(self, mock_classifier_pool,
+                                                                  mock_classifier_input_builder):
+        mock_pool = mock_classifier_pool.get_pool.return_value
+        mock_shared_design_matrix = mock_classifier_pool.publish.return_value
+        mock_shared_design_matrix.get_positions.side_effect = lambda subject_ids: subject_ids
+        mock_pool.imap_unordered.return_value = [(1, "new performance")]
+        mock_checkpoint = MagicMock()
+        mock_checkpoint.load_performances.return_value = ["saved performance", None]
+
+        data_splits = [DataSplit(training_set=["subjectA"], testing_set=["subjectB"]),
+                       DataSplit(training_set=["subjectB"], testing_set=["subjectA"])]
+        classifier = MagicMock()
+        classifier.name = "Random Forest"
+        feature_set = ["count"]
+
+        results = ClassifierService.run_three_class(data_splits, classifier, {}, feature_set, mock_checkpoint)
+
+        self.assertEqual(["saved performance", "new performance"], results)
+        mock_classifier_input_builder.get_design_matrix.assert_called_once_with({}, feature_set)
+        mock_checkpoint.get_unit_directory.assert_called_once_with(
+            classifier, feature_set, mock_classifier_input_builder.get_design_matrix.return_value)
+        unit_directory = mock_checkpoint.get_unit_directory.return_value
+        mock_checkpoint.load_performances.assert_called_once_with(unit_directory, 2)
+        tasks = mock_pool.imap_unordered.call_args[0][1]
+        self.assertEqual([(1, (mock_shared_design_matrix, ["subjectB"], ["subjectA"]))], tasks)
+        mock_checkpoint.save.assert_called_once_with(unit_directory, 1, "new performance")
+
+        mock_checkpoint.load_performances.return_value = ["saved performance", "new performance"]
+        mock_classifier_pool.reset_mock()
+
+        results = ClassifierService.run_three_class(data_splits, classifier, {}, feature_set, mock_checkpoint)
+
+        self.assertEqual(["saved performance", "new performance"], results)
+        mock_classifier_pool.publish.assert_not_called()
+        mock_classifier_pool.get_pool.assert_not_called()
+
+    def test_run_indexed_task(self):
+        function = MagicMock(return_value="raw performance")
+
+        self.assertEqual((3, "raw performance"), ClassifierService.run_indexed_task((3, "task"), function, "classifier"))
+        function.assert_called_once_with("task", "classifier")
+
+    @mock.patch.object(ClassifierService, 'run_single_data_split')
+    def test_run_shared_data_split_sw(self, mock_run_single_data_split):
+        mock_shared_design_matrix = MagicMock()
+        mock_design_matrix = mock_shared_design_matrix.attach.return_value
+        mock_design_matrix.get_array_at.side_effect = [(np.array([[1], [2]]), np.array([0, 2])),
+                                                       (np.array([[3]]), np.array([5]))]
+        mock_run_single_data_split.return_value = expected_raw_performance = "raw performance"
+        mock_classifier = MagicMock()
+
+        raw_performance = ClassifierService.run_shared_data_split_sw((mock_shared_design_matrix, [0, 1], [2]),
+                                                                     mock_classifier)
+
+        self.assertEqual(expected_raw_performance, raw_performance)
+        mock_design_matrix.get_array_at.assert_has_calls([mock.call([0, 1]), mock.call([2])])
+        training_x, training_y, testing_x, testing_y, attributed_classifier = \
+            mock_run_single_data_split.call_args[0]
+        self.assertEqual([[1], [2]], training_x.tolist())
+        self.assertEqual([0, 1], training_y.tolist())
+        self.assertEqual([[3]], testing_x.tolist())
+        self.assertEqual([1], testing_y.tolist())
+        self.assertEqual(mock_classifier, attributed_classifier)
+
     @mock.patch.object(ClassifierService, 'get_class_weights')
     @mock.patch('source.analysis.classification.classifier_service.ParameterSearch')
     @mock.patch('source.analysis.classification.classifier_service.ClassifierInputBuilder.get_sleep_wake_inputs')
@@ -14,10 +14,12 @@ import numpy as np
 
 class TestClassifierSummaryBuilder(TestCase):
 
+    @mock.patch('source.analysis.classification.classifier_summary_builder.SweepCheckpoint')
     @mock.patch('source.analysis.classification.classifier_summary_builder.SubjectBuilder')
     @mock.patch('source.analysis.classification.classifier_summary_builder.ClassifierService')
     @mock.patch('source.analysis.classification.classifier_summary_builder.TrainTestSplitter')
-    def test_build_summary_by_fraction(self, mock_train_test_splitter, mock_classifier_service, mock_subject_builder):
+    def test_build_summary_by_fraction(self, mock_train_test_splitter, mock_classifier_service, mock_subject_builder,
+                                       mock_sweep_checkpoint):
         attributed_classifier = AttributedClassifier(name="Logistic Regression", classifier=LogisticRegression())
         feature_sets = [[FeatureType.cosine, FeatureType.circadian_model], [FeatureType.count]]
         number_of_splits = 5
@@ -49,25 +51,30 @@ class TestClassifierSummaryBuilder(TestCase):
         mock_subject_builder.get_subject_dictionary.assert_called_once_with()
         mock_train_test_splitter.by_fraction.assert_called_once_with(subject_ids, test_fraction=test_fraction,
                                                                      number_of_splits=number_of_splits)
+        mock_sweep_checkpoint.for_sweep.assert_not_called()
 
         mock_classifier_service.run_sw.assert_has_calls([call(expected_data_splits,
                                                               attributed_classifier,
                                                               subject_dictionary,
-                                                              feature_sets[0]
+                                                              feature_sets[0],
+                                                              None
                                                               ),
                                                          call(expected_data_splits,
                                                               attributed_classifier,
                                                               subject_dictionary,
-                                                              feature_sets[1]
+                                                              feature_sets[1],
+                                                              None
                                                               )])
         self.assertEqual(returned_summary.attributed_classifier, attributed_classifier)
         self.assertEqual(returned_summary.performance_dictionary[tuple(feature_sets[0])], raw_performance_arrays[0])
         self.assertEqual(returned_summary.performance_dictionary[tuple(feature_sets[1])], raw_performance_arrays[1])
 
+    @mock.patch('source.analysis.classification.classifier_summary_builder.SweepCheckpoint')
     @mock.patch('source.analysis.classification.classifier_summary_builder.SubjectBuilder')
     @mock.patch('source.analysis.classification.classifier_summary_builder.ClassifierService')
     @mock.patch('source.analysis.classification.classifier_summary_builder.TrainTestSplitter')
-    def test_leave_one_out(self, mock_train_test_splitter, mock_classifier_service, mock_subject_builder):
+    def test_leave_one_out(self, mock_train_test_splitter, mock_classifier_service, mock_subject_builder,
+                           mock_sweep_checkpoint):
         attributed_classifier = AttributedClassifier(name="Logistic Regression", classifier=LogisticRegression())
         feature_sets = [[FeatureType.cosine, FeatureType.circadian_model], [FeatureType.count]]
 
@@ -95,17 +102,46 @@ class TestClassifierSummaryBuilder(TestCase):
         mock_subject_builder.get_all_subject_ids.assert_called_once_with()
         mock_subject_builder.get_subject_dictionary.assert_called_once_with()
         mock_train_test_splitter.leave_one_out.assert_called_once_with(subject_ids)
+        mock_sweep_checkpoint.for_sweep.assert_not_called()
 
         mock_classifier_service.run_sw.assert_has_calls([call(expected_data_splits,
                                                               attributed_classifier,
                                                               subject_dictionary,
-                                                              feature_sets[0]
+                                                              feature_sets[0],
+                                                              None
                                                               ),
                                                          call(expected_data_splits,
                                                               attributed_classifier,
                                                               subject_dictionary,
-                                                              feature_sets[1]
+                                                              feature_sets[1],
+                                                              None
                                                               )])
         self.assertEqual(returned_summary.attributed_classifier, attributed_classifier)
         self.assertEqual(returned_summary.performance_dictionary[tuple(feature_sets[0])], raw_performance_arrays[0])
         self.assertEqual(returned_summary.performance_dictionary[tuple(feature_sets[1])], raw_performance_arrays[1])
+
+    @mock.patch('source.analysis.classification.classifier_summary_builder.SweepCheckpoint')
+    @mock.patch('source.analysis.classification.classifier_summary_builder.SubjectBuilder')
+    @mock.patch('source.analysis.classification.classifier_summary_builder.ClassifierService')
+    @mock.patch('source.analysis.classification.classifier_summary_builder.TrainTestSplitter')
+    def test_resumed_monte_carlo_uses_checkpoint(self, mock_train_test_splitter, mock_classifier_service,
+                                                 mock_subject_builder, mock_sweep_checkpoint):
+        attributed_classifier = AttributedClassifier(name="Logistic Regression", classifier=LogisticRegression())
+        feature_sets = [[FeatureType.count]]
+
+        mock_subject_builder.get_all_subject_ids.return_value = subject_ids = ["subjectA", "subjectB"]
+        mock_subject_builder.get_subject_dictionary.return_value = subject_dictionary = {"subjectA": [], "subjectB": []}
+        mock_checkpoint = mock_sweep_checkpoint.for_sweep.return_value
+        mock_checkpoint.get_data_splits.return_value = saved_data_splits = [
+            DataSplit(training_set=["subjectA"], testing_set=["subjectB"])]
+        mock_classifier_service.run_sw.return_value = raw_performances = [
+            RawPerformance(true_labels=np.array([1, 0]), class_probabilities=np.array([[0.5, 0.5], [0.2, 0.8]]))]
+
+        returned_summary = SleepWakeClassifierSummaryBuilder.build_monte_carlo(attributed_classifier, feature_sets,
+                                                                               5, resume=True)
+
+        mock_sweep_checkpoint.for_sweep.assert_called_once_with('sleep_wake_monte_carlo_5', subject_ids)
+        mock_train_test_splitter.by_fraction.assert_not_called()
+        mock_classifier_service.run_sw.assert_called_once_with(saved_data_splits, attributed_classifier,
+                                                               subject_dictionary, feature_sets[0], mock_checkpoint)
+        self.assertEqual(raw_performances, returned_summary.performance_dictionary[tuple(feature_sets[0])])
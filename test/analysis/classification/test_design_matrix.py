@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+import numpy as np
+
+from source.analysis.classification.design_matrix import DesignMatrix
+from source.analysis.setup.feature_type import FeatureType
+from source.analysis.setup.subject import Subject
+
+
+class TestDesignMatrix(TestCase):
+
+    def setUp(self):
+        self.subject_dictionary = {
+            "subjectA": Subject(subject_id="subjectA",
+                                labeled_sleep=np.array([0, 1]),
+                                feature_dictionary={FeatureType.count: np.array([0, 1]),
+                                                    FeatureType.circadian_model: np.array([[8, 9], [10, 11]])}),
+            "subjectB": Subject(subject_id="subjectB",
+                                labeled_sleep=np.array([1, 2, 5]),
+                                feature_dictionary={FeatureType.count: np.array([100, 101, 102]),
+                                                    FeatureType.circadian_model: np.array([[108, 109], [110, 111],
+                                                                                           [112, 113]])}),
+            "subjectC": Subject(subject_id="subjectC",
+                                labeled_sleep=np.array([3]),
+                                feature_dictionary={FeatureType.count: np.array([200]),
+                                                    FeatureType.circadian_model: np.array([[208, 209]])})
+        }
+        self.design_matrix = DesignMatrix.build(["subjectA", "subjectB", "subjectC"], self.subject_dictionary,
+                                                [FeatureType.count, FeatureType.circadian_model])
+
+    def test_build(self):
+        self.assertEqual([0, 2, 5, 6], self.design_matrix.offsets.tolist())
+        self.assertEqual([[0, 8, 9], [1, 10, 11], [100, 108, 109], [101, 110, 111], [102, 112, 113],
+                          [200, 208, 209]], self.design_matrix.features.tolist())
+        self.assertEqual([0, 1, 1, 2, 5, 3], self.design_matrix.labels.tolist())
+        self.assertFalse(self.design_matrix.features.flags.writeable)
+
+    def test_contiguous_subjects_are_slices(self):
+        features, labels = self.design_matrix.get_array(["subjectB", "subjectC"])
+
+        self.assertTrue(np.shares_memory(features, self.design_matrix.features))
+        self.assertEqual([[100, 108, 109], [101, 110, 111], [102, 112, 113], [200, 208, 209]], features.tolist())
+        self.assertEqual([1, 2, 5, 3], labels.tolist())
+
+    def test_other_subjects_are_gathered_in_order(self):
+        features, labels = self.design_matrix.get_array(["subjectC", "subjectA"])
+
+        self.assertEqual([[200, 208, 209], [0, 8, 9], [1, 10, 11]], features.tolist())
+        self.assertEqual([3, 0, 1], labels.tolist())
+        self.assertEqual([5, 0, 1], self.design_matrix.get_rows(self.design_matrix.get_positions(["subjectC", "subjectA"])).tolist())
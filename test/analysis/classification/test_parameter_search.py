@@ -1,3 +1,5 @@
+import tempfile
+from pathlib import Path
 from unittest import TestCase, mock
 from unittest.mock import MagicMock
 
@@ -7,6 +9,7 @@ from sklearn.neighbors import KNeighborsClassifier
 from sklearn.neural_network import MLPClassifier
 
 from source.analysis.classification.parameter_search import ParameterSearch
+from source.analysis.classification.parameter_search_cache import ParameterSearchCache
 from source.analysis.setup.attributed_classifier import AttributedClassifier
 
 import numpy as np
@@ -14,6 +17,13 @@ import numpy as np
 
 class TestParameterSearch(TestCase):
 
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patch = mock.patch.object(ParameterSearchCache, 'get_directory', return_value=Path(self.directory.name))
+        patch.start()
+        self.addCleanup(patch.stop)
+
     @mock.patch('source.analysis.classification.parameter_search.GridSearchCV')
     def test_run_best_parameter_search(self, mock_grid_search):
         attributed_classifier = AttributedClassifier(name="Logistic Regression", classifier=LogisticRegression())
@@ -33,3 +43,35 @@ class TestParameterSearch(TestCase):
                                                  cv=3)
         mock_parameter_search_classifier.fit.assert_called_once_with(training_x, training_y)
         self.assertDictEqual(expected_parameters, returned_parameters)
+
+    @mock.patch('source.analysis.classification.parameter_search.GridSearchCV')
+    def test_repeated_search_is_read_from_cache(self, mock_grid_search):
+        attributed_classifier = AttributedClassifier(name="Random Forest", classifier=RandomForestClassifier())
+        training_x = np.array([[1.0], [2.0], [3.0]])
+        training_y = np.array([0, 1, 1])
+        mock_grid_search.return_value.best_params_ = {'max_depth': 50}
+        mock_grid_search.return_value.best_score_ = 0.75
+
+        first_parameters = ParameterSearch.run_search(attributed_classifier, training_x, training_y, scoring='roc_auc')
+        second_parameters = ParameterSearch.run_search(attributed_classifier, training_x, training_y,
+                                                       scoring='roc_auc')
+        ParameterSearch.run_search(attributed_classifier, training_x, np.array([1, 1, 0]), scoring='roc_auc')
+
+        self.assertEqual({'max_depth': 50}, first_parameters)
+        self.assertEqual({'max_depth': 50}, second_parameters)
+        self.assertEqual(2, mock_grid_search.return_value.fit.call_count)
+
+    @mock.patch('source.analysis.classification.parameter_search.Constants')
+    def test_successive_halving_search(self, mock_constants):
+        mock_constants.SUCCESSIVE_HALVING_SEARCH = True
+        attributed_classifier = AttributedClassifier(name="Random Forest",
+                                                     classifier=RandomForestClassifier(n_estimators=5,
+                                                                                       random_state=0))
+        random_state = np.random.RandomState(0)
+        training_y = np.tile([0, 1], 60)
+        training_x = np.column_stack((training_y + random_state.normal(0, 0.5, 120), random_state.normal(0, 1, 120)))
+
+        parameters = ParameterSearch.run_search(attributed_classifier, training_x, training_y, scoring='roc_auc')
+
+        self.assertIn(parameters['max_depth'], ParameterSearch.parameter_dictionary['Random Forest']['max_depth'])
+        self.assertEqual(1, len(list(Path(self.directory.name).glob('*.json'))))
@@ -0,0 +1,49 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+import numpy as np
+from sklearn.neural_network import MLPClassifier
+
+from source.analysis.classification.parameter_search_cache import ParameterSearchCache
+from source.analysis.setup.attributed_classifier import AttributedClassifier
+
+
+class TestParameterSearchCache(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patch = mock.patch.object(ParameterSearchCache, 'get_directory', return_value=Path(self.directory.name))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        self.attributed_classifier = AttributedClassifier(name='Neural Net', classifier=MLPClassifier())
+        self.parameter_range = {'alpha': [0.1, 0.01]}
+        self.training_x = np.array([[1.0, 2.0], [3.0, 4.0]])
+        self.training_y = np.array([0, 1])
+
+    def get_key(self, training_x):
+        return ParameterSearchCache.get_key(self.attributed_classifier, self.parameter_range, 'roc_auc', 'grid',
+                                            training_x, self.training_y)
+
+    def test_save_and_load(self):
+        key = self.get_key(self.training_x)
+        self.assertIsNone(ParameterSearchCache.load(key))
+
+        ParameterSearchCache.save(key, self.attributed_classifier, {'alpha': 0.01}, 0.9)
+
+        self.assertEqual({'alpha': 0.01}, ParameterSearchCache.load(key))
+
+    def test_key_follows_training_data_and_fixed_parameters(self):
+        key = self.get_key(self.training_x)
+
+        self.assertEqual(key, self.get_key(self.training_x.copy()))
+        self.assertNotEqual(key, self.get_key(self.training_x[:, [0]]))
+        self.assertNotEqual(key, self.get_key(self.training_x[::-1]))
+
+        self.attributed_classifier.classifier.set_params(alpha=0.01)
+        self.assertEqual(key, self.get_key(self.training_x))
+
+        self.attributed_classifier.classifier.set_params(hidden_layer_sizes=(15, 15))
+        self.assertNotEqual(key, self.get_key(self.training_x))
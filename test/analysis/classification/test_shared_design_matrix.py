@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+import numpy as np
+
+from source.analysis.classification.design_matrix import DesignMatrix
+from source.analysis.classification.shared_design_matrix import SharedDesignMatrix
+
+
+class TestSharedDesignMatrix(TestCase):
+
+    def setUp(self):
+        self.design_matrix = DesignMatrix(["subjectA", "subjectB"], np.array([[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]]),
+                                          np.array([0, 2, 5]), np.array([0, 1, 3]))
+        self.shared_design_matrix, self.shared_memories = SharedDesignMatrix.publish(self.design_matrix)
+
+    def tearDown(self):
+        SharedDesignMatrix.close_attached()
+        self.shared_design_matrix.detach()
+        for shared_memory in self.shared_memories:
+            shared_memory.close()
+            shared_memory.unlink()
+
+    def test_publisher_reads_its_own_copy(self):
+        self.assertIs(self.design_matrix, self.shared_design_matrix.attach())
+
+    def test_attach_maps_shared_memory(self):
+        self.shared_design_matrix.detach()
+
+        attached_design_matrix = self.shared_design_matrix.attach()
+
+        self.assertIsNot(self.design_matrix, attached_design_matrix)
+        self.assertFalse(attached_design_matrix.features.flags.writeable)
+        self.assertEqual(self.design_matrix.features.tolist(), attached_design_matrix.features.tolist())
+        self.assertEqual(self.design_matrix.labels.tolist(), attached_design_matrix.labels.tolist())
+
+        positions = self.shared_design_matrix.get_positions(["subjectB", "subjectA"])
+        features, labels = attached_design_matrix.get_array_at(positions)
+        self.assertEqual([[2.0, 3.0], [4.0, 5.0], [0.0, 1.0]], features.tolist())
+        self.assertEqual([2, 5, 0], labels.tolist())
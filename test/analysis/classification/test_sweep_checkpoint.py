@@ -0,0 +1,105 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.neural_network import MLPClassifier
+
+from source.analysis.classification.design_matrix import DesignMatrix
+from source.analysis.classification.sweep_checkpoint import SweepCheckpoint
+from source.analysis.performance.raw_performance import RawPerformance
+from source.analysis.setup.attributed_classifier import AttributedClassifier
+from source.analysis.setup.data_split import DataSplit
+from source.analysis.setup.feature_type import FeatureType
+
+
+class TestSweepCheckpoint(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.checkpoint = SweepCheckpoint(Path(self.directory.name))
+        self.feature_set = [FeatureType.count, FeatureType.heart_rate]
+
+    @mock.patch('source.analysis.classification.sweep_checkpoint.Constants')
+    def test_for_sweep_depends_on_subject_set(self, mock_constants):
+        mock_constants.CROPPED_FILE_PATH = Path(self.directory.name).joinpath('cropped')
+
+        checkpoint = SweepCheckpoint.for_sweep('sleep_wake_leave_one_out', ['subjectA', 'subjectB'])
+
+        self.assertEqual(Path(self.directory.name).joinpath('checkpoints'), checkpoint.directory.parent)
+        self.assertTrue(checkpoint.directory.name.startswith('sleep_wake_leave_one_out_'))
+        self.assertEqual(checkpoint.directory,
+                         SweepCheckpoint.for_sweep('sleep_wake_leave_one_out', ['subjectB', 'subjectA']).directory)
+        self.assertNotEqual(checkpoint.directory,
+                            SweepCheckpoint.for_sweep('sleep_wake_leave_one_out', ['subjectA']).directory)
+
+    def test_data_splits_are_built_once(self):
+        build_data_splits = mock.MagicMock(return_value=[DataSplit(training_set=['subjectA', 'subjectB'],
+                                                                   testing_set=['subjectC'])])
+
+        self.checkpoint.get_data_splits(build_data_splits)
+        data_splits = self.checkpoint.get_data_splits(build_data_splits)
+
+        build_data_splits.assert_called_once_with()
+        self.assertEqual(['subjectA', 'subjectB'], data_splits[0].training_set)
+        self.assertEqual(['subjectC'], data_splits[0].testing_set)
+
+    def get_design_matrix(self, features):
+        return DesignMatrix(['subjectA'], np.array(features), np.array([0, 1]), np.array([0, 2]))
+
+    def test_unit_directory_depends_on_fixed_parameters_and_features(self):
+        design_matrix = self.get_design_matrix([[1.0], [2.0]])
+        unit_directory = self.checkpoint.get_unit_directory(
+            AttributedClassifier(name='Logistic Regression', classifier=LogisticRegression()),
+            self.feature_set, design_matrix)
+
+        self.assertEqual(Path(self.directory.name).joinpath('logistic_regression'), unit_directory.parent)
+        self.assertTrue(unit_directory.name.startswith('count-heart_rate_'))
+        self.assertEqual(unit_directory, self.checkpoint.get_unit_directory(
+            AttributedClassifier(name='Logistic Regression', classifier=LogisticRegression(C=0.5)),
+            self.feature_set, self.get_design_matrix([[1.0], [2.0]])))
+        self.assertNotEqual(unit_directory, self.checkpoint.get_unit_directory(
+            AttributedClassifier(name='Logistic Regression', classifier=LogisticRegression(max_iter=10)),
+            self.feature_set, design_matrix))
+        self.assertNotEqual(unit_directory, self.checkpoint.get_unit_directory(
+            AttributedClassifier(name='Logistic Regression', classifier=LogisticRegression()),
+            self.feature_set, self.get_design_matrix([[1.0], [3.0]])))
+
+    def test_save_and_load(self):
+        raw_performance = RawPerformance(true_labels=np.array([0, 1, 2]),
+                                         class_probabilities=np.array([[0.5, 0.25, 0.25], [0.1, 0.8, 0.1],
+                                                                       [1 / 3, 1 / 3, 1 / 3]]))
+        unit_directory = Path(self.directory.name).joinpath('k-nearest_neighbors', 'count-heart_rate_abc')
+
+        self.assertIsNone(SweepCheckpoint.load(unit_directory, 1))
+        SweepCheckpoint.save(unit_directory, 1, raw_performance)
+
+        loaded_performance = SweepCheckpoint.load(unit_directory, 1)
+        self.assertEqual(raw_performance.true_labels.tolist(), loaded_performance.true_labels.tolist())
+        self.assertEqual(raw_performance.class_probabilities.tolist(), loaded_performance.class_probabilities.tolist())
+        self.assertEqual([None, loaded_performance.true_labels.tolist()],
+                         [performance if performance is None else performance.true_labels.tolist()
+                          for performance in SweepCheckpoint.load_performances(unit_directory, 2)])
+
+    @mock.patch('source.analysis.classification.sweep_checkpoint.ClassifierInputBuilder')
+    def test_load_summary(self, mock_classifier_input_builder):
+        mock_classifier_input_builder.get_design_matrix.return_value = design_matrix = \
+            self.get_design_matrix([[1.0], [2.0]])
+        attributed_classifier = AttributedClassifier(name='Neural Net', classifier=MLPClassifier())
+        subject_dictionary = {'subjectA': None}
+        unit_directory = self.checkpoint.get_unit_directory(attributed_classifier, self.feature_set, design_matrix)
+        for split_index in range(2):
+            SweepCheckpoint.save(unit_directory, split_index,
+                                 RawPerformance(true_labels=np.array([split_index]),
+                                                class_probabilities=np.array([[0.5, 0.5]])))
+
+        summary = self.checkpoint.load_summary(attributed_classifier, [self.feature_set], 2, subject_dictionary)
+
+        mock_classifier_input_builder.get_design_matrix.assert_called_with(subject_dictionary, self.feature_set)
+        self.assertEqual(attributed_classifier, summary.attributed_classifier)
+        self.assertEqual([[0], [1]], [raw_performance.true_labels.tolist() for raw_performance in
+                                      summary.performance_dictionary[tuple(self.feature_set)]])
+        self.assertRaises(ValueError, self.checkpoint.load_summary, attributed_classifier, [self.feature_set], 3,
+                          subject_dictionary)
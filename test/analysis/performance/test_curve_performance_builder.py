@@ -1,7 +1,7 @@
 from unittest import TestCase
 
 import numpy as np
-from sklearn.metrics import roc_curve, precision_recall_curve
+from sklearn.metrics import roc_curve, precision_recall_curve, cohen_kappa_score, confusion_matrix
 
 from source.analysis.performance.raw_performance import RawPerformance
 from source.analysis.performance.curve_performance_builder import CurvePerformanceBuilder
@@ -88,3 +88,38 @@ class TestCurvePerformanceBuilder(TestCase):
 
         self.assertListEqual(horizontal_axis_bins.tolist(), pr_performance.recalls.tolist())
         self.assertListEqual(expected_precisions.tolist(), pr_performance.precisions.tolist())
+
+    def test_search_wake_thresholds(self):
+        sorted_wake_sleep_scores = np.arange(10) / 10.0 + 0.05
+        goals = np.array([0, 0.5, 0.52])
+
+        thresholds, fractions, found = CurvePerformanceBuilder.search_wake_thresholds(sorted_wake_sleep_scores, goals,
+                                                                                      0.001, 50)
+
+        self.assertEqual([1.0, 0.5], thresholds[0:2].tolist())
+        self.assertEqual([0.0, 0.5], fractions[0:2].tolist())
+        self.assertEqual([True, True, False], found.tolist())
+
+    def test_balance_rem_nrem(self):
+        true_labels = np.array([1, 1, 2, 2, 0])
+        rem_probabilities = np.array([0.2, 0.7, 0.8, 0.3, 0.9])
+        predicted_sleep = np.array([True, True, True, True, False])
+
+        sleep_accuracy, nrem_accuracy, rem_accuracy, best_accuracy, kappa = \
+            CurvePerformanceBuilder.balance_rem_nrem(true_labels, rem_probabilities, predicted_sleep, 1e-2, 15)
+
+        self.assertEqual(0.5, sleep_accuracy)
+        self.assertEqual(0.5, nrem_accuracy)
+        self.assertEqual(0.5, rem_accuracy)
+        self.assertEqual(0.6, best_accuracy)
+        self.assertEqual(cohen_kappa_score(np.array([1, 2, 2, 1, 0]), true_labels), kappa)
+
+    def test_get_kappa_matches_cohen_kappa_score(self):
+        random_state = np.random.RandomState(0)
+        for labels in [[0, 1, 2], [0, 1]]:
+            predicted_labels = random_state.choice(labels, 200)
+            true_labels = random_state.choice([0, 1, 2], 200)
+            confusion = confusion_matrix(predicted_labels, true_labels, labels=[0, 1, 2])
+
+            self.assertEqual(cohen_kappa_score(predicted_labels, true_labels),
+                             CurvePerformanceBuilder.get_kappa(confusion))
@@ -14,18 +14,23 @@ class TestSubjectBuilder(TestCase):
              '27', '28', '29', '30', '32', '33', '34', '35', '38', '39', '41', '42'],
             SubjectBuilder.get_all_subject_ids())
 
-    @mock.patch('source.analysis.setup.subject_builder.PSGLabelService')
-    @mock.patch('source.analysis.setup.subject_builder.TimeBasedFeatureService')
-    @mock.patch('source.analysis.setup.subject_builder.HeartRateFeatureService')
-    @mock.patch('source.analysis.setup.subject_builder.ActivityCountFeatureService')
-    def test_build(self, mock_activity_count_fs, mock_heart_rate_fs, mock_time_based_fs, mock_psg_label_service):
+    @mock.patch('source.analysis.setup.subject_builder.FeatureStore')
+    def test_build(self, mock_feature_store):
         subject_id = "subjectA"
-        mock_activity_count_fs.get_path_to_file.return_value = activity_count_feature = np.array([1, 2, 3, 4, 5])
-        mock_heart_rate_fs.get_path_to_file.return_value = heart_rate_feature = np.array([6, 7, 8, 9, 10])
-        mock_time_based_fs.load_time.return_value = time_feature = np.array([11])
-        mock_time_based_fs.load_circadian_model.return_value = circadian_feature = np.array([12])
-        mock_time_based_fs.load_cosine.return_value = cosine = np.array([12])
-        mock_psg_label_service.load.return_value = labels = np.array([13])
+        activity_count_feature = np.array([1, 2])
+        heart_rate_feature = np.array([6, 7])
+        time_feature = np.array([11, 12])
+        cosine = np.array([12, 13])
+        labels = np.array([13, 14])
+        circadian_feature = None
+        mock_feature_store.load.return_value = features = np.zeros(2, dtype=[
+            ('count_feature', float), ('hr_std', float), ('time_feature', float), ('cosine_feature', float),
+            ('psg_label', float)])
+        features['count_feature'] = activity_count_feature
+        features['hr_std'] = heart_rate_feature
+        features['time_feature'] = time_feature
+        features['cosine_feature'] = cosine
+        features['psg_label'] = labels
 
         feature_dictionary = {FeatureType.count: activity_count_feature,
                               FeatureType.heart_rate: heart_rate_feature,
@@ -37,6 +42,7 @@ class TestSubjectBuilder(TestCase):
         expected_subject = Subject(subject_id=subject_id, labeled_sleep=labels, feature_dictionary=feature_dictionary)
         returned_subject = SubjectBuilder.build(subject_id)
 
+        mock_feature_store.load.assert_called_once_with(subject_id)
         TestHelper.assert_models_equal(self, expected_subject, returned_subject)
 
     @mock.patch.object(SubjectBuilder, 'build')
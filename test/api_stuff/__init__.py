@@ -0,0 +1,5 @@
+import sys
+
+from source import utils
+
+sys.path.insert(0, str(utils.get_project_root().joinpath('api_stuff')))
@@ -0,0 +1,171 @@
+import json
+import unittest
+from unittest import TestCase, mock
+
+import numpy as np
+
+from binary_payload import BinaryPayload
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class TestBinaryPayload(TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        accel_timestamp = np.arange(0, 60, 0.02) + 0.5
+        heart_rate_timestamp = np.arange(0, 60, 5.0) + 0.5
+        self.columns = {
+            'x': random_state.normal(0, 1, len(accel_timestamp)),
+            'y': random_state.normal(0, 1, len(accel_timestamp)),
+            'z': random_state.normal(0, 1, len(accel_timestamp)),
+            'accel_timestamp': accel_timestamp,
+            'heartRate': random_state.normal(60, 5, len(heart_rate_timestamp)),
+            'heartRate_timestamp': heart_rate_timestamp,
+        }
+
+    def assert_matches_json(self, columns, record):
+        json_record = json.loads(json.dumps({name: values.tolist() for name, values in columns.items()}))
+        for name in columns:
+            np.testing.assert_array_equal(np.asarray(json_record[name], dtype=record[name].dtype), record[name])
+
+    def test_float64_decodes_like_json(self):
+        record = BinaryPayload.to_record(BinaryPayload.decode(BinaryPayload.encode(self.columns)))
+
+        self.assert_matches_json(self.columns, record)
+        self.assertEqual(np.float64, record['x'].dtype)
+
+    def test_float32_columns_keep_their_dtype(self):
+        columns = dict(self.columns)
+        columns['x'] = columns['x'].astype(np.float32)
+        columns['heartRate'] = columns['heartRate'].astype(np.float32)
+
+        record = BinaryPayload.decode(BinaryPayload.encode(columns))
+
+        self.assertEqual(np.float32, record['x'].dtype)
+        np.testing.assert_array_equal(columns['x'], record['x'])
+        np.testing.assert_array_equal(columns['accel_timestamp'], record['accel_timestamp'])
+
+    def test_gzip(self):
+        payload = BinaryPayload.encode(self.columns, compression=BinaryPayload.COMPRESSION_GZIP)
+
+        self.assert_matches_json(self.columns, BinaryPayload.decode(payload))
+
+    @unittest.skipIf(zstandard is None, 'zstandard is not installed')
+    def test_zstd(self):
+        payload = BinaryPayload.encode(self.columns, compression=BinaryPayload.COMPRESSION_ZSTD)
+
+        self.assert_matches_json(self.columns, BinaryPayload.decode(payload))
+
+    def test_scalar_start_time(self):
+        columns = dict(self.columns)
+        columns['absoluteStartTime'] = 1765730181.2749329
+
+        record = BinaryPayload.to_record(BinaryPayload.decode(BinaryPayload.encode(columns)))
+
+        self.assertEqual(1765730181.2749329, record['absoluteStartTime'])
+
+    def test_rejects_truncated_payload(self):
+        payload = BinaryPayload.encode(self.columns)
+
+        with self.assertRaises(ValueError):
+            BinaryPayload.decode(payload[0:len(payload) // 2])
+        with self.assertRaises(ValueError):
+            BinaryPayload.decode(b'not a payload')
+
+    def test_rejects_truncated_directory(self):
+        payload = BinaryPayload.encode(self.columns)
+
+        with self.assertRaises(ValueError):
+            BinaryPayload.decode(payload[0:BinaryPayload.HEADER.size + BinaryPayload.COLUMN.size + 3])
+        with self.assertRaises(ValueError):
+            BinaryPayload.decode(payload[0:BinaryPayload.HEADER.size - 1])
+
+    def test_rejects_corrupt_compressed_body(self):
+        compressions = [BinaryPayload.COMPRESSION_GZIP]
+        if zstandard is not None:
+            compressions.append(BinaryPayload.COMPRESSION_ZSTD)
+
+        for compression in compressions:
+            payload = BinaryPayload.encode(self.columns, compression=compression)
+            header = payload[0:BinaryPayload.HEADER.size]
+
+            with self.assertRaises(ValueError):
+                BinaryPayload.decode(header + b'garbage that is not compressed')
+            with self.assertRaises(ValueError):
+                BinaryPayload.decode(payload[0:len(payload) - 20])
+
+    def test_rejects_missing_columns(self):
+        columns = dict(self.columns)
+        del columns['heartRate']
+
+        with self.assertRaises(ValueError):
+            BinaryPayload.to_record(BinaryPayload.decode(BinaryPayload.encode(columns)))
+
+    def test_rejects_mismatched_column_lengths(self):
+        for name in ['z', 'heartRate_timestamp']:
+            columns = dict(self.columns)
+            columns[name] = columns[name][1:]
+
+            with self.assertRaises(ValueError):
+                BinaryPayload.to_record(BinaryPayload.decode(BinaryPayload.encode(columns)))
+
+    def test_rejects_duplicate_columns(self):
+        payload = bytearray(BinaryPayload.encode(self.columns))
+        second_name = BinaryPayload.HEADER.size + BinaryPayload.COLUMN.size
+        payload[second_name:second_name + 1] = b'x'
+
+        with self.assertRaisesRegex(ValueError, 'duplicate column x'):
+            BinaryPayload.decode(bytes(payload))
+
+    def test_rejects_gzip_body_over_size_limit(self):
+        payload = BinaryPayload.encode(self.columns, compression=BinaryPayload.COMPRESSION_GZIP)
+
+        with mock.patch.object(BinaryPayload, 'MAXIMUM_BODY_SIZE', 1024):
+            with self.assertRaises(ValueError):
+                BinaryPayload.decode(payload)
+
+    def test_server_rejects_bad_uploads(self):
+        import testServer
+
+        gzip_payload = BinaryPayload.encode(self.columns, compression=BinaryPayload.COMPRESSION_GZIP)
+        json_record = {name: values.tolist() for name, values in self.columns.items()}
+        del json_record['heartRate_timestamp']
+
+        with mock.patch.object(testServer, 'prediction_queue') as mock_prediction_queue:
+            client = testServer.app.test_client()
+
+            responses = [client.post('/data', data=gzip_payload[0:len(gzip_payload) // 2],
+                                     content_type=BinaryPayload.CONTENT_TYPE),
+                         client.post('/data', data=gzip_payload[0:BinaryPayload.HEADER.size] + b'not gzip',
+                                     content_type=BinaryPayload.CONTENT_TYPE),
+                         client.post('/data', data=BinaryPayload.encode(self.columns)[0:20],
+                                     content_type=BinaryPayload.CONTENT_TYPE),
+                         client.post('/data', data=BinaryPayload.encode(dict(self.columns, z=self.columns['z'][1:])),
+                                     content_type=BinaryPayload.CONTENT_TYPE),
+                         client.post('/data', json=json_record)]
+
+        self.assertEqual([400, 400, 400, 400, 400], [response.status_code for response in responses])
+        mock_prediction_queue.ingest.assert_not_called()
+
+    def test_server_ingests_both_formats_identically(self):
+        import testServer
+
+        with mock.patch.object(testServer, 'SessionStore'), \
+                mock.patch.object(testServer, 'prediction_queue') as mock_prediction_queue:
+            mock_prediction_queue.ingest.return_value = 1
+            mock_prediction_queue.get_result.return_value = None
+            client = testServer.app.test_client()
+
+            client.post('/data', json={name: values.tolist() for name, values in self.columns.items()})
+            client.post('/data', data=BinaryPayload.encode(self.columns), content_type=BinaryPayload.CONTENT_TYPE)
+
+        appended = [call[0][1] for call in mock_prediction_queue.ingest.call_args_list]
+        (json_accel_data, json_hr_data), (binary_accel_data, binary_hr_data) = appended[-2:]
+        for name in json_accel_data:
+            np.testing.assert_array_equal(np.asarray(json_accel_data[name]), binary_accel_data[name])
+        for name in json_hr_data:
+            np.testing.assert_array_equal(np.asarray(json_hr_data[name]), binary_hr_data[name])
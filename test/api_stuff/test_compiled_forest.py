@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from compiled_forest import CompiledForest
+from source import utils
+
+
+class TestCompiledForest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        data_path = utils.get_project_root().joinpath('model_stuff/data')
+        train = pd.read_csv(data_path.joinpath('train/bigboy_hella_features.csv'))
+        test = pd.read_csv(data_path.joinpath('test/bigboy_hella_features.csv'))
+        cls.model = RandomForestClassifier(n_estimators=20, min_samples_leaf=5, class_weight='balanced',
+                                           random_state=0)
+        cls.model.fit(train.drop(columns=['psg_label']), train['psg_label'])
+        cls.compiled_model = CompiledForest.compile(cls.model)
+        cls.test_features = test.drop(columns=['psg_label'])
+
+    def test_predict_matches_sklearn(self):
+        np.testing.assert_array_equal(self.model.predict(self.test_features),
+                                      self.compiled_model.predict(self.test_features))
+
+    def test_predict_proba_matches_sklearn_exactly(self):
+        np.testing.assert_array_equal(self.model.predict_proba(self.test_features),
+                                      self.compiled_model.predict_proba(self.test_features))
+
+    def test_single_row(self):
+        row = self.test_features.iloc[5:6]
+
+        np.testing.assert_array_equal(self.model.predict(row), self.compiled_model.predict(row))
+
+    def test_rejects_reordered_columns(self):
+        with self.assertRaises(ValueError):
+            self.compiled_model.predict(self.test_features[self.test_features.columns[::-1]])
+
+    def test_supports(self):
+        self.assertTrue(CompiledForest.supports(self.model))
+        self.assertFalse(CompiledForest.supports(object()))
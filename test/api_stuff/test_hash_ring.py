@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from hash_ring import HashRing
+
+
+class TestHashRing(TestCase):
+
+    def test_get_node_is_stable(self):
+        first_ring = HashRing(range(4))
+        second_ring = HashRing(range(4))
+
+        for index in range(100):
+            self.assertEqual(first_ring.get_node(f"watch-{index}"), second_ring.get_node(f"watch-{index}"))
+
+    def test_keys_spread_over_nodes(self):
+        ring = HashRing(range(4))
+
+        counts = [0, 0, 0, 0]
+        for index in range(4000):
+            counts[ring.get_node(f"watch-{index}")] += 1
+
+        for count in counts:
+            self.assertGreater(count, 600)
+
+    def test_adding_node_only_moves_keys_to_it(self):
+        ring = HashRing(range(4))
+        grown_ring = HashRing(range(5))
+
+        for index in range(1000):
+            node = grown_ring.get_node(f"watch-{index}")
+            if node != 4:
+                self.assertEqual(ring.get_node(f"watch-{index}"), node)
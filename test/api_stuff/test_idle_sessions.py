@@ -0,0 +1,24 @@
+from unittest import TestCase, mock
+
+from idle_sessions import IdleSessions
+
+
+class TestIdleSessions(TestCase):
+
+    @mock.patch('idle_sessions.time')
+    def test_expired_sessions_are_popped_in_order_of_last_touch(self, mock_time):
+        idle_sessions = IdleSessions()
+        mock_time.time.return_value = 0
+        idle_sessions.touch('a')
+        idle_sessions.touch('b')
+        idle_sessions.touch('c')
+        mock_time.time.return_value = 100
+        idle_sessions.touch('a')
+        idle_sessions.forget('c')
+
+        mock_time.time.return_value = IdleSessions.TIMEOUT + 50
+        self.assertEqual(['b'], idle_sessions.pop_expired())
+        self.assertEqual([], idle_sessions.pop_expired())
+
+        mock_time.time.return_value = IdleSessions.TIMEOUT + 100
+        self.assertEqual(['a'], idle_sessions.pop_expired())
@@ -0,0 +1,70 @@
+from unittest import TestCase, mock
+
+from histogram import Histogram
+from metrics import Metrics
+
+
+class TestMetrics(TestCase):
+
+    def setUp(self):
+        patch = mock.patch.object(Metrics, 'histograms', {})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_stages_add_up_in_trace(self):
+        Metrics.start_trace()
+        with Metrics.stage('decode'):
+            pass
+        with Metrics.stage('decode'):
+            pass
+        with Metrics.stage('storage'):
+            pass
+        trace = Metrics.end_trace()
+
+        self.assertEqual(['decode', 'storage'], list(trace.keys()))
+        self.assertGreaterEqual(trace['decode'], 0)
+
+    def test_stage_without_trace_is_ignored(self):
+        Metrics.end_trace()
+        with Metrics.stage('decode'):
+            pass
+
+        self.assertEqual({}, Metrics.histograms)
+
+    def test_prometheus_output(self):
+        for value in range(1, 101):
+            Metrics.record_trace('/data', {'decode': value / 1000.0})
+
+        text = Metrics.to_prometheus()
+
+        self.assertIn('# TYPE api_stage_seconds summary', text)
+        self.assertIn('api_stage_seconds{endpoint="/data",stage="decode",quantile="0.5"} 0.0505', text)
+        self.assertIn('api_stage_seconds_count{endpoint="/data",stage="decode"} 100', text)
+
+    def test_histogram_keeps_recent_observations(self):
+        histogram = Histogram()
+        for _ in range(Histogram.RESERVOIR_SIZE):
+            histogram.observe(1.0)
+        for _ in range(Histogram.RESERVOIR_SIZE):
+            histogram.observe(2.0)
+
+        self.assertEqual([2.0], histogram.get_quantiles([0.5]))
+        self.assertEqual(2 * Histogram.RESERVOIR_SIZE, histogram.count)
+
+    def test_server_exposes_stage_timings(self):
+        import testServer
+
+        with mock.patch.object(testServer, 'prediction_queue') as mock_prediction_queue:
+            mock_prediction_queue.ingest.return_value = 1
+            mock_prediction_queue.get_result.return_value = None
+            client = testServer.app.test_client()
+
+            response = client.post('/data', json={'sessionId': 'night', 'x': [0.0], 'y': [0.0], 'z': [0.0],
+                                                  'accel_timestamp': [0.0], 'heartRate': [60.0],
+                                                  'heartRate_timestamp': [0.0]},
+                                   headers={'X-Trace': '1'})
+            metrics = client.get('/metrics').get_data(as_text=True)
+
+        self.assertIn('decode;dur=', response.headers['Server-Timing'])
+        self.assertIn('storage;dur=', response.headers['Server-Timing'])
+        self.assertIn('endpoint="/data",stage="total",quantile="0.99"', metrics)
@@ -0,0 +1,62 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+import joblib
+import numpy as np
+from sklearn.dummy import DummyClassifier
+
+from model_registry import ModelRegistry
+
+
+class TestModelRegistry(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        for patch in [mock.patch.object(ModelRegistry, 'MODELS_DIRECTORY', self.directory.name),
+                      mock.patch.object(ModelRegistry, 'models', {})]:
+            patch.start()
+            self.addCleanup(patch.stop)
+        os.makedirs(os.path.join(self.directory.name, 'model_a'))
+
+    def save_model(self, constant, modified_time):
+        model = DummyClassifier(strategy='constant', constant=constant)
+        model.fit(np.zeros((2, 1)), [0, constant])
+        path = ModelRegistry.get_model_path('model_a')
+        joblib.dump(model, path)
+        os.utime(path, ns=(modified_time, modified_time))
+
+    def test_get_loads_once(self):
+        self.save_model(1, 1000)
+
+        with mock.patch.object(ModelRegistry, 'load', wraps=ModelRegistry.load) as mock_load:
+            first_model = ModelRegistry.get('model_a')
+            second_model = ModelRegistry.get('model_a')
+
+        mock_load.assert_called_once_with('model_a')
+        self.assertIs(first_model, second_model)
+        self.assertTrue(first_model.version.startswith('model_a/' + ModelRegistry.MODEL_FILE + '@'))
+
+    def test_get_reloads_when_file_changes(self):
+        self.save_model(1, 1000)
+        first_model = ModelRegistry.get('model_a')
+
+        self.save_model(2, 2000)
+        second_model = ModelRegistry.get('model_a')
+
+        self.assertEqual([1], first_model.model.predict(np.zeros((1, 1))).tolist())
+        self.assertEqual([2], second_model.model.predict(np.zeros((1, 1))).tolist())
+        self.assertNotEqual(first_model.version, second_model.version)
+
+    def test_get_keeps_old_model_when_reload_fails(self):
+        self.save_model(1, 1000)
+        first_model = ModelRegistry.get('model_a')
+
+        with open(ModelRegistry.get_model_path('model_a'), 'wb') as file:
+            file.write(b'partially written')
+
+        self.assertEqual(first_model.version, ModelRegistry.get('model_a').version)
+        with mock.patch.object(ModelRegistry, 'load') as mock_load:
+            ModelRegistry.get('model_a')
+        mock_load.assert_not_called()
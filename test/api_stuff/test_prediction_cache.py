@@ -0,0 +1,78 @@
+from unittest import TestCase, mock
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from idle_sessions import IdleSessions
+from loaded_model import LoadedModel
+from prediction_cache import PredictionCache
+
+
+class TestPredictionCache(TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        features = random_state.normal(0, 1, (300, 3))
+        labels = (features[:, 0] > 0).astype(int) + (features[:, 1] > 0.5).astype(int)
+        model = RandomForestClassifier(n_estimators=10, max_depth=4, random_state=0).fit(features, labels)
+        self.loaded_model = LoadedModel(name='model', path='path', model=model, modified_time=0, version='v1')
+        self.features = random_state.normal(0, 1, (40, 3))
+        patch = mock.patch.object(PredictionCache, 'sessions', {})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def predict(self, features, version='v1'):
+        cells = PredictionCache.get_cells(self.loaded_model, features)
+        rows = PredictionCache.get_rows_to_predict(PredictionCache.get('night'), cells, version)
+        new_predictions = self.loaded_model.model.predict(features[rows])
+        return rows, PredictionCache.update('night', cells, rows, new_predictions, version)
+
+    def test_rows_in_same_cell_predict_the_same(self):
+        cells = PredictionCache.get_cells(self.loaded_model, self.features)
+        nudged_features = self.features + 1e-9
+        nudged_cells = PredictionCache.get_cells(self.loaded_model, nudged_features)
+
+        same_cell = np.all(cells == nudged_cells, axis=1)
+        self.assertTrue(np.any(same_cell))
+        np.testing.assert_array_equal(self.loaded_model.model.predict(self.features[same_cell]),
+                                      self.loaded_model.model.predict(nudged_features[same_cell]))
+
+    def test_only_new_rows_are_predicted(self):
+        self.predict(self.features[0:30])
+
+        rows, predictions = self.predict(self.features)
+
+        np.testing.assert_array_equal(np.arange(30, 40), rows)
+        np.testing.assert_array_equal(self.loaded_model.model.predict(self.features), predictions)
+
+    def test_recent_rows_that_cross_a_split_are_predicted_again(self):
+        self.predict(self.features)
+        moved_features = self.features + 5
+
+        rows, predictions = self.predict(moved_features)
+
+        first_checked = len(self.features) - PredictionCache.RECHECK_EPOCHS
+        np.testing.assert_array_equal(np.arange(first_checked, len(self.features)), rows)
+        np.testing.assert_array_equal(self.loaded_model.model.predict(moved_features)[first_checked:],
+                                      predictions[first_checked:])
+        np.testing.assert_array_equal(self.loaded_model.model.predict(self.features)[0:first_checked],
+                                      predictions[0:first_checked])
+
+    def test_new_model_version_predicts_everything(self):
+        self.predict(self.features)
+
+        rows, predictions = self.predict(self.features, version='v2')
+
+        np.testing.assert_array_equal(np.arange(len(self.features)), rows)
+
+    @mock.patch('idle_sessions.time')
+    def test_idle_session_is_evicted(self, mock_time):
+        with mock.patch.object(PredictionCache, 'idle_sessions', IdleSessions()):
+            mock_time.time.return_value = 0
+            self.predict(self.features)
+            mock_time.time.return_value = IdleSessions.TIMEOUT + 1
+            PredictionCache.put('other', None)
+
+            self.assertIsNone(PredictionCache.get('night'))
+            self.assertEqual(['other'], list(PredictionCache.sessions))
@@ -0,0 +1,113 @@
+import threading
+from unittest import TestCase, mock
+
+from idle_sessions import IdleSessions
+from metrics import Metrics
+from prediction_queue import PredictionQueue
+
+
+class TestPredictionQueue(TestCase):
+
+    def test_results_carry_sequence_of_last_processed_upload(self):
+        calls = []
+
+        def predict(session_id, uploads):
+            calls.append((session_id, list(uploads)))
+            return [len(calls)], 'version'
+
+        prediction_queue = PredictionQueue(predict, number_of_workers=2)
+        self.addCleanup(prediction_queue.stop)
+
+        self.assertEqual(1, prediction_queue.submit('a', 'upload 1'))
+        self.assertEqual(2, prediction_queue.submit('a', 'upload 2'))
+        self.assertEqual(1, prediction_queue.submit('b', 'upload 1'))
+        prediction_queue.wait_until_idle()
+
+        self.assertEqual(2, prediction_queue.get_result('a')['sequence'])
+        self.assertEqual(1, prediction_queue.get_result('b')['sequence'])
+        self.assertEqual(['upload 1', 'upload 2'], [upload for session_id, uploads in calls if session_id == 'a'
+                                                    for upload in uploads])
+
+    def test_session_is_never_processed_concurrently(self):
+        release = threading.Event()
+        active = []
+        overlaps = []
+
+        def predict(session_id, uploads):
+            if session_id in active:
+                overlaps.append(session_id)
+            active.append(session_id)
+            release.wait(1)
+            active.remove(session_id)
+            return None
+
+        prediction_queue = PredictionQueue(predict, number_of_workers=4)
+        self.addCleanup(prediction_queue.stop)
+
+        for index in range(10):
+            prediction_queue.submit('a', index)
+        release.set()
+        prediction_queue.wait_until_idle()
+
+        self.assertEqual([], overlaps)
+        self.assertIsNone(prediction_queue.get_result('a'))
+        self.assertEqual(10, prediction_queue.get_sequence_number('a'))
+
+    def test_failed_prediction_keeps_worker_alive(self):
+        def predict(session_id, uploads):
+            if uploads == ['bad']:
+                raise ValueError('bad upload')
+            return [1], 'version'
+
+        prediction_queue = PredictionQueue(predict, number_of_workers=1)
+        self.addCleanup(prediction_queue.stop)
+
+        prediction_queue.submit('a', 'bad')
+        prediction_queue.wait_until_idle()
+        prediction_queue.submit('a', 'good')
+        prediction_queue.wait_until_idle()
+
+        self.assertEqual(2, prediction_queue.get_result('a')['sequence'])
+
+    @mock.patch('idle_sessions.time')
+    def test_idle_session_is_evicted_on_submit(self, mock_time):
+        prediction_queue = PredictionQueue(lambda session_id, uploads: ([1], 'version'), number_of_workers=1)
+        self.addCleanup(prediction_queue.stop)
+
+        mock_time.time.return_value = 0
+        prediction_queue.submit('idle', 'upload')
+        prediction_queue.wait_until_idle()
+        mock_time.time.return_value = IdleSessions.TIMEOUT - 1
+        prediction_queue.submit('active', 'upload')
+        prediction_queue.wait_until_idle()
+
+        mock_time.time.return_value = IdleSessions.TIMEOUT + 1
+        prediction_queue.submit('active', 'upload')
+        prediction_queue.wait_until_idle()
+
+        self.assertIsNone(prediction_queue.get_result('idle'))
+        self.assertIsNone(prediction_queue.get_sequence_number('idle'))
+        self.assertEqual(2, prediction_queue.get_sequence_number('active'))
+        self.assertEqual(1, prediction_queue.submit('idle', 'upload'))
+
+    def test_every_trace_is_reported(self):
+        traces = []
+
+        def predict(session_id, uploads):
+            with Metrics.stage('featurize'):
+                pass
+            if uploads == ['bad']:
+                raise ValueError('bad upload')
+            return None
+
+        prediction_queue = PredictionQueue(predict, number_of_workers=1,
+                                           on_trace=lambda session_id, trace: traces.append((session_id, trace)))
+        self.addCleanup(prediction_queue.stop)
+
+        prediction_queue.submit('a', 'upload')
+        prediction_queue.wait_until_idle()
+        prediction_queue.submit('b', 'bad')
+        prediction_queue.wait_until_idle()
+
+        self.assertEqual(['a', 'b'], [session_id for session_id, trace in traces])
+        self.assertTrue(all('featurize' in trace for session_id, trace in traces))
@@ -0,0 +1,37 @@
+from unittest import TestCase
+
+import numpy as np
+
+from sample_buffer import SampleBuffer
+
+
+class TestSampleBuffer(TestCase):
+
+    def test_append_grows_past_initial_capacity(self):
+        sample_buffer = SampleBuffer(2)
+        rows = np.arange(2 * (SampleBuffer.INITIAL_CAPACITY + 5)).reshape(-1, 2)
+
+        sample_buffer.append(rows[0:3])
+        sample_buffer.append(rows[3:])
+
+        np.testing.assert_array_equal(rows, sample_buffer.values())
+
+    def test_timestamps_keep_float64_precision(self):
+        sample_buffer = SampleBuffer(4)
+        timestamps = 1.7e9 + np.arange(100) * 0.02
+        values = np.random.RandomState(0).normal(0, 1, (100, 3))
+
+        sample_buffer.append(np.column_stack((timestamps, values)))
+
+        self.assertEqual(np.float64, sample_buffer.timestamps.dtype)
+        self.assertEqual(np.float32, sample_buffer.data.dtype)
+        np.testing.assert_array_equal(timestamps, sample_buffer.values()[:, 0])
+        np.testing.assert_array_equal(values.astype(np.float32), sample_buffer.values()[:, 1:])
+
+    def test_clear(self):
+        sample_buffer = SampleBuffer(2)
+        sample_buffer.append([[1, 2], [3, 4]])
+
+        sample_buffer.clear()
+
+        self.assertEqual((0, 2), sample_buffer.values().shape)
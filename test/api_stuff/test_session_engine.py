@@ -0,0 +1,135 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+import numpy as np
+from scipy.signal import filtfilt
+
+from source.preprocessing.activity_count.activity_count_service import ActivityCountService
+from source.preprocessing.epoch import Epoch
+from source2.preprocessing.activity_count.activity_count_collection import ActivityCountCollection
+from source2.preprocessing.activity_count.activity_count_feature_service import \
+    ActivityCountFeatureService as BatchActivityCountFeatureService
+from source2.preprocessing.activity_count.activity_count_service import \
+    ActivityCountService as BatchActivityCountService
+from source2.preprocessing.heart_rate.heart_rate_collection import HeartRateCollection
+from source2.preprocessing.heart_rate.heart_rate_feature_service import \
+    HeartRateFeatureService as BatchHeartRateFeatureService
+from idle_sessions import IdleSessions
+from session_engine import SessionEngine
+
+
+class TestSessionEngine(TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        duration = 3600
+        self.motion_timestamps = np.arange(0, duration, 0.02) + 0.003
+        self.z = random_state.normal(0, 0.3, len(self.motion_timestamps))
+        self.heart_rate_timestamps = np.arange(1.3, duration, 5.0)
+        self.heart_rate = 60 + 10 * np.sin(self.heart_rate_timestamps / 1200) + random_state.normal(0, 2, len(
+            self.heart_rate_timestamps))
+        self.duration = duration
+
+    def upload(self, session_id, chunk_seconds):
+        SessionEngine.reset_session(session_id)
+        for start in range(0, self.duration, chunk_seconds):
+            motion_mask = (self.motion_timestamps >= start) & (self.motion_timestamps < start + chunk_seconds)
+            heart_rate_mask = (self.heart_rate_timestamps >= start) & (self.heart_rate_timestamps < start + chunk_seconds)
+            SessionEngine.append(session_id,
+                                 {'timestamp': self.motion_timestamps[motion_mask], 'z': self.z[motion_mask]},
+                                 {'timestamp': self.heart_rate_timestamps[heart_rate_mask],
+                                  'HR': self.heart_rate[heart_rate_mask]})
+        return SessionEngine.get_session(session_id)
+
+    def test_counts_match_batch_filter(self):
+        state = self.upload('counts', 60)
+
+        cropped = self.motion_timestamps >= 1.3
+        timestamps = self.motion_timestamps[cropped]
+        interpolated_timestamps = np.arange(np.amin(timestamps), np.amax(timestamps),
+                                            1.0 / ActivityCountService.SAMPLING_FREQUENCY)
+        z_data = np.interp(interpolated_timestamps, timestamps, self.z[cropped])
+        b, a = ActivityCountService.get_filter()
+        expected_counts = ActivityCountService.get_counts_from_filtered(filtfilt(b, a, z_data))
+
+        self.assertGreater(len(state.activity_counter.counts), 0)
+        np.testing.assert_array_equal(expected_counts[:len(state.activity_counter.counts)], state.activity_counter.counts)
+
+    def test_features_do_not_depend_on_upload_size(self):
+        small_chunks = self.upload('small', 30)
+        large_chunks = self.upload('large', 300)
+
+        self.assertEqual(small_chunks.epoch_timestamps, large_chunks.epoch_timestamps[:len(small_chunks.epoch_timestamps)])
+        np.testing.assert_array_almost_equal(small_chunks.count_features,
+                                             large_chunks.count_features[:len(small_chunks.count_features)])
+
+    def test_get_features_waits_for_minimum_epochs(self):
+        SessionEngine.reset_session('short')
+        SessionEngine.append('short', {'timestamp': np.arange(0, 60, 0.02), 'z': np.zeros(3000)},
+                             {'timestamp': np.arange(0, 60, 5.0), 'HR': np.full(12, 60.0)})
+
+        self.assertIsNone(SessionEngine.get_features('short'))
+
+    def test_get_features_returns_engineered_columns(self):
+        self.upload('features', 60)
+
+        features = SessionEngine.get_features('features')
+
+        self.assertIn('hr_mean_delta', features.columns)
+        self.assertIn('count_feature_lag_1', features.columns)
+        self.assertFalse(features.isnull().values.any())
+
+    def get_batch_counts(self, start_time):
+        cropped = self.motion_timestamps >= start_time
+        data = np.column_stack((self.motion_timestamps[cropped], self.z[cropped], self.z[cropped], self.z[cropped]))
+        with tempfile.TemporaryDirectory() as directory:
+            counts_path = Path(directory).joinpath('counts.out')
+            with mock.patch.object(BatchActivityCountService, 'get_cropped_file_path', return_value=counts_path):
+                BatchActivityCountService.build_activity_counts_without_matlab('parity', data)
+            return np.loadtxt(str(counts_path), delimiter=',')
+
+    def test_features_match_batch_feature_services(self):
+        state = self.upload('parity', 60)
+        epochs = [Epoch(timestamp=epoch_timestamp, index=index)
+                  for index, epoch_timestamp in enumerate(state.epoch_timestamps)]
+        self.assertGreater(len(epochs), 0)
+
+        # The batch counts are stretched over np.linspace(first, last sample); on the true 15 s grid the
+        # streamed features are the batch features, and the stretched grid only moves them slightly
+        batch_counts = self.get_batch_counts(state.start_time)
+        gridded_counts = batch_counts.copy()
+        gridded_counts[:, 0] = gridded_counts[0, 0] + np.arange(len(gridded_counts)) * \
+            ActivityCountService.EPOCH_DURATION
+        np.testing.assert_allclose(
+            BatchActivityCountFeatureService.build_from_collection(
+                ActivityCountCollection('parity', gridded_counts), epochs).ravel(),
+            state.count_features, rtol=1e-9)
+        np.testing.assert_allclose(
+            BatchActivityCountFeatureService.build_from_collection(
+                ActivityCountCollection('parity', batch_counts), epochs).ravel(),
+            state.count_features, atol=0.05 * np.amax(state.count_features))
+
+        # Heart rate only differs through the night-level 90th percentile, which the batch run also takes over
+        # the end of the night the engine has not finalized yet
+        cropped = self.heart_rate_timestamps >= state.start_time
+        heart_rate_collection = HeartRateCollection('parity', np.column_stack((self.heart_rate_timestamps[cropped],
+                                                                               self.heart_rate[cropped])))
+        batch_heart_rate = BatchHeartRateFeatureService.build_from_collection(heart_rate_collection, epochs)
+        hr_std, hr_mean = SessionEngine.normalize_heart_rate(state)
+        scale = batch_heart_rate[0, 0] / hr_std[0]
+        self.assertAlmostEqual(1, scale, delta=0.1)
+        np.testing.assert_allclose(batch_heart_rate[:, 0], hr_std * scale, rtol=1e-9)
+        np.testing.assert_allclose(batch_heart_rate[:, 1], hr_mean * scale, atol=1e-3)
+
+    @mock.patch('idle_sessions.time')
+    def test_idle_session_is_evicted(self, mock_time):
+        with mock.patch.object(SessionEngine, 'sessions', {}), \
+                mock.patch.object(SessionEngine, 'idle_sessions', IdleSessions()):
+            mock_time.time.return_value = 0
+            state = SessionEngine.get_session('idle')
+            mock_time.time.return_value = IdleSessions.TIMEOUT + 1
+            SessionEngine.get_session('active')
+
+            self.assertEqual(['active'], list(SessionEngine.sessions))
+            self.assertIsNot(state, SessionEngine.get_session('idle'))
@@ -0,0 +1,23 @@
+from unittest import TestCase, mock
+
+from session_key import SessionKey
+
+
+class TestSessionKey(TestCase):
+
+    def test_uses_session_id_then_device_id(self):
+        self.assertEqual('night-1', SessionKey.get_session_id({'sessionId': 'night-1', 'deviceId': 'watch'}))
+        self.assertEqual('watch', SessionKey.get_session_id({'deviceId': 'watch'}))
+        self.assertEqual('header', SessionKey.get_session_id({}, default='header'))
+
+    def test_rejects_unsafe_ids(self):
+        with self.assertRaises(ValueError):
+            SessionKey.get_session_id({'sessionId': '../../etc/passwd'})
+
+    @mock.patch('session_key.datetime')
+    def test_legacy_session_follows_restart_of_timestamps(self, mock_datetime):
+        mock_datetime.now.return_value.strftime.return_value = '20260101'
+        with mock.patch.object(SessionKey, 'legacy_session_id', '20251231'):
+            self.assertEqual('20251231', SessionKey.get_session_id({'accel_timestamp': [600.0]}))
+            self.assertEqual('20260101', SessionKey.get_session_id({'accel_timestamp': [0.5]}))
+            self.assertEqual('20260101', SessionKey.get_session_id({'accel_timestamp': [630.0]}))
@@ -0,0 +1,73 @@
+import tempfile
+from unittest import TestCase, mock
+
+import numpy as np
+
+from idle_sessions import IdleSessions
+from session_store import SessionStore
+
+
+class TestSessionStore(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.patches = [mock.patch.object(SessionStore, 'SNAPSHOT_DIRECTORY', self.directory.name + '/sessions/'),
+                        mock.patch.object(SessionStore, 'START_TIME_DIRECTORY', self.directory.name + '/logs/'),
+                        mock.patch.object(SessionStore, 'sessions', {})]
+        for patch in self.patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    @staticmethod
+    def make_upload(start):
+        timestamps = np.arange(start, start + 1, 0.25)
+        accel_data = {'timestamp': timestamps, 'x': timestamps * 2, 'y': timestamps * 3, 'z': timestamps * 4}
+        hr_data = {'timestamp': np.array([start + 0.5]), 'HR': np.array([60.0])}
+        return accel_data, hr_data
+
+    def test_append_accumulates_until_new_session(self):
+        SessionStore.append('night', *self.make_upload(0))
+        SessionStore.append('night', *self.make_upload(30))
+
+        accel_data, hr_data = SessionStore.get_samples('night')
+        np.testing.assert_array_equal(np.concatenate((np.arange(0, 1, 0.25), np.arange(30, 31, 0.25))),
+                                      accel_data['timestamp'])
+        np.testing.assert_array_equal([0.5, 30.5], hr_data['timestamp'])
+
+        SessionStore.append('night', *self.make_upload(0))
+
+        accel_data, hr_data = SessionStore.get_samples('night')
+        self.assertEqual(4, len(accel_data['timestamp']))
+
+    def test_snapshot_restores_samples(self):
+        SessionStore.append('night', *self.make_upload(0))
+        SessionStore.append('night', *self.make_upload(30))
+        SessionStore.snapshot('night')
+        expected_accel_data, expected_hr_data = SessionStore.get_samples('night')
+
+        SessionStore.sessions.clear()
+        accel_data, hr_data = SessionStore.get_samples('night')
+
+        np.testing.assert_array_equal(expected_accel_data['z'], accel_data['z'])
+        np.testing.assert_array_equal(expected_hr_data['HR'], hr_data['HR'])
+
+    def test_snapshot_written_after_interval(self):
+        with mock.patch.object(SessionStore, 'SNAPSHOT_INTERVAL', 0):
+            SessionStore.append('night', *self.make_upload(0))
+
+        SessionStore.sessions.clear()
+        accel_data, hr_data = SessionStore.get_samples('night')
+        self.assertEqual(4, len(accel_data['timestamp']))
+
+    @mock.patch('idle_sessions.time')
+    def test_idle_session_is_evicted_and_restorable(self, mock_time):
+        with mock.patch.object(SessionStore, 'idle_sessions', IdleSessions()):
+            mock_time.time.return_value = 0
+            SessionStore.append('idle', *self.make_upload(0))
+            mock_time.time.return_value = IdleSessions.TIMEOUT + 1
+            SessionStore.append('active', *self.make_upload(0))
+
+            self.assertEqual(['active'], list(SessionStore.sessions))
+            accel_data, hr_data = SessionStore.get_samples('idle')
+            self.assertEqual(4, len(accel_data['timestamp']))
@@ -0,0 +1,70 @@
+import os
+import time
+from unittest import TestCase, mock
+
+import numpy as np
+
+from metrics import Metrics
+from prediction_queue import PredictionQueue
+from session_predictor import SessionPredictor
+from session_store import SessionStore
+from sharded_prediction_queue import ShardedPredictionQueue
+
+
+def predict_with_process_id(session_id, uploads):
+    return np.array([os.getpid()]), 'version'
+
+
+def featurize_without_prediction(session_id, uploads):
+    with Metrics.stage('featurize'):
+        pass
+    return None
+
+
+class TestShardedPredictionQueue(TestCase):
+
+    @mock.patch.object(SessionStore, 'append')
+    @mock.patch.object(SessionPredictor, 'predict', new=predict_with_process_id)
+    def test_sessions_stay_on_their_shard(self, mock_append):
+        prediction_queue = ShardedPredictionQueue(3, number_of_workers=1)
+        self.addCleanup(prediction_queue.stop)
+        session_ids = [f"watch-{index}" for index in range(12)]
+
+        for upload_index in range(3):
+            for session_id in session_ids:
+                prediction_queue.ingest(session_id, ({'timestamp': []}, {'timestamp': []}))
+
+        deadline = time.time() + 20
+        while time.time() < deadline:
+            results = [prediction_queue.get_result(session_id) for session_id in session_ids]
+            if all(result is not None and result['sequence'] == 3 for result in results):
+                break
+            time.sleep(0.05)
+
+        process_ids = {}
+        for session_id in session_ids:
+            result = prediction_queue.get_result(session_id)
+            self.assertEqual(3, result['sequence'])
+            shard = prediction_queue.get_shard(session_id)
+            process_ids.setdefault(shard, set()).add(int(result['predictions'][0]))
+
+        for shard, shard_process_ids in process_ids.items():
+            self.assertEqual({prediction_queue.shards[shard].pid}, shard_process_ids)
+
+    @mock.patch.object(Metrics, 'histograms', {})
+    @mock.patch.object(SessionStore, 'append')
+    @mock.patch.object(SessionPredictor, 'predict', new=featurize_without_prediction)
+    def test_traces_without_predictions_reach_metrics(self, mock_append):
+        prediction_queue = ShardedPredictionQueue(2, number_of_workers=1)
+        self.addCleanup(prediction_queue.stop)
+
+        for session_id in ['watch-1', 'watch-2', 'watch-3']:
+            prediction_queue.ingest(session_id, ({'timestamp': []}, {'timestamp': []}))
+
+        histogram = Metrics.get_histogram(PredictionQueue.METRICS_ENDPOINT, 'featurize')
+        deadline = time.time() + 20
+        while time.time() < deadline and histogram.count < 3:
+            time.sleep(0.05)
+
+        self.assertEqual(3, histogram.count)
+        self.assertIsNone(prediction_queue.get_result('watch-1'))
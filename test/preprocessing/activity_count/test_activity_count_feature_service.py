@@ -70,4 +70,36 @@ class TestActivityCountFeatureService(TestCase):
             activity_count_collection)
 
         self.assertListEqual([0, 1, 2, 3, 4, 5, 6, 7, 8], interpolated_counts.tolist())
-        self.assertListEqual([1, 2, 3, 4, 5, 6, 7, 8, 9], interpolated_timestamps.tolist())
\ No newline at end of file
+        self.assertListEqual([1, 2, 3, 4, 5, 6, 7, 8, 9], interpolated_timestamps.tolist())
+
+    def test_get_window_bounds(self):
+        timestamps = np.arange(0, 1000, 1) + 0.5
+        epoch_timestamps = np.array([30, 300, 330, 990])
+
+        first_indices, last_indices = ActivityCountFeatureService.get_window_bounds(timestamps, epoch_timestamps)
+
+        for index, epoch_timestamp in enumerate(epoch_timestamps):
+            expected_indices = ActivityCountFeatureService.get_window(timestamps, Epoch(timestamp=epoch_timestamp,
+                                                                                        index=index))
+            self.assertEqual(expected_indices.tolist(), list(range(first_indices[index], last_indices[index])))
+
+    def test_build_from_collection_matches_per_epoch_features(self):
+        random_state = np.random.RandomState(0)
+        timestamps = np.arange(0, 3 * 3600, 15) + 3.7
+        data = np.column_stack((timestamps, random_state.gamma(1, 50, len(timestamps))))
+        activity_count_collection = ActivityCountCollection(subject_id='subjectA', data=data)
+        valid_epochs = [Epoch(timestamp=timestamp, index=index) for index, timestamp in
+                        enumerate(range(0, 3 * 3600 + 120, 30))]
+
+        interpolated_timestamps, interpolated_counts = ActivityCountFeatureService.interpolate(
+            activity_count_collection)
+        expected_features = []
+        for epoch in valid_epochs:
+            if epoch.timestamp - np.amin(interpolated_timestamps) < ActivityCountFeatureService.WINDOW_SIZE:
+                continue
+            indices_in_range = ActivityCountFeatureService.get_window(interpolated_timestamps, epoch)
+            expected_features.append(ActivityCountFeatureService.get_feature(interpolated_counts[indices_in_range]))
+
+        returned_features = ActivityCountFeatureService.build_from_collection(activity_count_collection, valid_epochs)
+
+        self.assertEqual(np.array(expected_features).tolist(), returned_features.tolist())
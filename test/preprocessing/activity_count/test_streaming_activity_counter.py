@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+import numpy as np
+from scipy.signal import filtfilt
+
+from source.preprocessing.activity_count.activity_count_service import ActivityCountService
+from source.preprocessing.activity_count.streaming_activity_counter import StreamingActivityCounter
+
+
+class TestStreamingActivityCounter(TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.z = random_state.normal(0, 0.3, ActivityCountService.SAMPLING_FREQUENCY * 1800)
+        self.chunk_sizes = random_state.randint(1, 3000, 1000)
+        b, a = ActivityCountService.get_filter()
+        self.filtered = filtfilt(b, a, self.z)
+
+    def stream(self, counter, length):
+        start = 0
+        for chunk_size in self.chunk_sizes:
+            if start >= length:
+                break
+            counter.append(self.z[start:min(start + chunk_size, length)])
+            start = start + chunk_size
+
+    def test_filtered_tail_stays_within_bound_of_zero_phase_filter(self):
+        lookahead = StreamingActivityCounter.LOOKAHEAD * ActivityCountService.SAMPLING_FREQUENCY
+
+        for length in [2000, 20000, 80000]:
+            counter = StreamingActivityCounter()
+            self.stream(counter, length)
+
+            filtered = counter.get_backward()[0:length - lookahead - counter.forward_start]
+            expected = self.filtered[counter.forward_start:length - lookahead]
+
+            self.assertLess(np.amax(np.abs(filtered - expected)), 1e-8)
+
+    def test_counts_match_offline_counts(self):
+        counter = StreamingActivityCounter()
+        self.stream(counter, len(self.z))
+        expected_counts = ActivityCountService.get_counts_from_filtered(self.filtered)
+
+        streamed_counts = counter.counts.copy()
+        counter.finish()
+
+        self.assertEqual(len(expected_counts) - 1, len(streamed_counts))
+        np.testing.assert_array_equal(expected_counts[:len(streamed_counts)], streamed_counts)
+        np.testing.assert_array_equal(expected_counts, counter.counts)
+
+    def test_waits_for_padding_before_filtering(self):
+        counter = StreamingActivityCounter()
+
+        self.assertEqual(0, len(counter.append(np.zeros(StreamingActivityCounter.PADDING))))
+        self.assertIsNone(counter.state)
+        self.assertEqual(0, len(counter.finish()))
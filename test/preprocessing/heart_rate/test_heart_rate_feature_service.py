@@ -58,3 +58,31 @@ class TestHeartRateFeatureService(TestCase):
         returned_feature_array = HeartRateFeatureService.build(subject_id, valid_epochs)
 
         self.assertEqual(expected_feature_array.tolist(), returned_feature_array.tolist())
+
+    def test_build_statistics_matches_per_epoch_statistics(self):
+        random_state = np.random.RandomState(0)
+        timestamps = np.arange(0, 3 * 3600, 5.0) + 1.3
+        data = np.column_stack((timestamps, 60 + 10 * np.sin(timestamps / 1200) +
+                                random_state.normal(0, 2, len(timestamps))))
+        heart_rate_collection = HeartRateCollection(subject_id='subjectA', data=data)
+        valid_epochs = [Epoch(timestamp=timestamp, index=index) for index, timestamp in
+                        enumerate(range(0, 3 * 3600 - 300, 30))]
+
+        interpolated_timestamps, normalized_hr = HeartRateFeatureService.interpolate_and_normalize(
+            heart_rate_collection)
+        _, raw_hr = HeartRateFeatureService.interpolate_raw(heart_rate_collection)
+        expected_std, expected_mean = [], []
+        for epoch in valid_epochs:
+            if epoch.timestamp - np.amin(interpolated_timestamps) < HeartRateFeatureService.WINDOW_SIZE:
+                continue
+            indices_in_range = HeartRateFeatureService.get_window(interpolated_timestamps, epoch)
+            expected_std.append(np.std(normalized_hr[indices_in_range]))
+            expected_mean.append(np.mean(raw_hr[indices_in_range]))
+
+        heart_rate_std, raw_mean, normalized_mean = HeartRateFeatureService.build_statistics_from_collection(
+            heart_rate_collection, valid_epochs)
+
+        np.testing.assert_allclose(expected_std, heart_rate_std, rtol=0, atol=1e-10)
+        np.testing.assert_allclose(expected_mean, raw_mean, rtol=0, atol=1e-10)
+        np.testing.assert_allclose(np.array(expected_mean) / np.percentile(np.abs(raw_hr), 90), normalized_mean,
+                                   rtol=0, atol=1e-10)
@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+import numpy as np
+
+from source import utils
+from source.preprocessing.heart_rate.incremental_dog_convolution import IncrementalDogConvolution
+
+
+class TestIncrementalDogConvolution(TestCase):
+
+    def test_matches_batch_convolution(self):
+        random_state = np.random.RandomState(0)
+        box = utils.get_dog_kernel(285)
+
+        for length in [142, 143, 285, 286, 3000]:
+            heart_rate = 60 + random_state.normal(0, 5, length)
+            convolution = IncrementalDogConvolution(285)
+            finalized = []
+            start = 0
+            while start < length:
+                step = random_state.randint(1, 300)
+                finalized.extend(convolution.append(heart_rate[start:start + step]))
+                start = start + step
+
+            expected = utils.convolve_with_dog(heart_rate, 285) + np.mean(heart_rate) * np.sum(box)
+
+            self.assertEqual(max(length - 143, 0), len(finalized))
+            np.testing.assert_allclose(expected[0:len(finalized)], finalized, rtol=0, atol=1e-9)
+            np.testing.assert_allclose(expected, convolution.get_output(), rtol=0, atol=1e-9)
+
+    def test_short_series_is_not_finalized(self):
+        convolution = IncrementalDogConvolution(285)
+
+        self.assertEqual(0, len(convolution.append(np.ones(100))))
+        self.assertEqual(0, len(convolution.convolved))
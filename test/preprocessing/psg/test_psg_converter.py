@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from source.preprocessing.psg.psg_converter import PSGConverter
 from source.sleep_stage import SleepStage
 
@@ -28,3 +30,8 @@ class TestPSGConverter(TestCase):
         self.assertEqual(PSGConverter.get_label_from_int(5), SleepStage.rem)
         self.assertEqual(PSGConverter.get_label_from_int(6), SleepStage.unscored)
 
+
+    def test_get_values_from_ints(self):
+        values = PSGConverter.get_values_from_ints(np.array([0, 1, 2, 3, 4, 5, 6, -1, 9]))
+
+        self.assertListEqual([0, 1, 2, 3, 4, 5, -1, -1, -1], values.tolist())
@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+import numpy as np
+
+from source.preprocessing.epoch import Epoch
+from source.preprocessing.epoch_array import EpochArray
+from source.sleep_stage import SleepStage
+from test.test_helper import TestHelper
+
+
+class TestEpochArray(TestCase):
+
+    def test_from_epochs(self):
+        epochs = [Epoch(timestamp=30, index=1), Epoch(timestamp=60, index=2)]
+
+        epoch_array = EpochArray.from_epochs(epochs)
+
+        self.assertListEqual([30, 60], epoch_array.timestamps.tolist())
+        self.assertListEqual([1, 2], epoch_array.indices.tolist())
+        self.assertListEqual([SleepStage.unscored.value] * 2, epoch_array.stages.tolist())
+        self.assertIs(epoch_array, EpochArray.from_epochs(epoch_array))
+
+    def test_get_timestamps(self):
+        epochs = [Epoch(timestamp=30, index=1), Epoch(timestamp=60, index=2)]
+
+        self.assertListEqual([30, 60], EpochArray.get_timestamps(epochs).tolist())
+        self.assertListEqual([30, 60], EpochArray.get_timestamps(EpochArray.from_epochs(epochs)).tolist())
+
+    def test_select_and_index(self):
+        epoch_array = EpochArray(timestamps=[0, 30, 60], indices=[0, 1, 2],
+                                 stages=[SleepStage.wake.value, SleepStage.unscored.value, SleepStage.rem.value])
+
+        scored = epoch_array.select(epoch_array.is_scored())
+
+        self.assertEqual(2, len(scored))
+        self.assertListEqual([0, 2], scored.indices.tolist())
+        TestHelper.assert_models_equal(self, Epoch(timestamp=60.0, index=2), scored[1])
+        self.assertListEqual([0, 60], [epoch.timestamp for epoch in scored])
+        self.assertListEqual([30, 60], epoch_array[1:].timestamps.tolist())
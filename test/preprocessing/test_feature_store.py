@@ -0,0 +1,46 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+import numpy as np
+
+from source.preprocessing.feature_store import FeatureStore
+
+
+class TestFeatureStore(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patch = mock.patch.object(FeatureStore, 'get_path',
+                                  side_effect=lambda subject_id: Path(self.directory.name).joinpath(
+                                      subject_id + '_features.npz'))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_write_and_load(self):
+        FeatureStore.write('subjectA', {'timestamp': np.array([30.0, 60.0]),
+                                        'psg_label': np.array([0, 2]),
+                                        'count_feature': np.array([0.5, 0.25]),
+                                        'circadian_feature': np.array([[0.1], [0.2]]),
+                                        'hr_mean_raw': None})
+
+        features = FeatureStore.load('subjectA')
+
+        self.assertEqual(FeatureStore.COLUMNS, features.dtype.names)
+        self.assertListEqual([30.0, 60.0], features['timestamp'].tolist())
+        self.assertListEqual([0, 2], features['psg_label'].tolist())
+        self.assertListEqual([0.5, 0.25], features['count_feature'].tolist())
+        self.assertListEqual([0.1, 0.2], features['circadian_feature'].tolist())
+        self.assertTrue(np.all(np.isnan(features['hr_mean_raw'])))
+
+    def test_load_rejects_other_schema_versions(self):
+        FeatureStore.write('subjectA', {'timestamp': np.array([30.0])})
+
+        with mock.patch.object(FeatureStore, 'SCHEMA_VERSION', FeatureStore.SCHEMA_VERSION + 1):
+            with self.assertRaises(ValueError):
+                FeatureStore.load('subjectA')
+
+    def test_write_rejects_unknown_columns(self):
+        with self.assertRaises(ValueError):
+            FeatureStore.write('subjectA', {'timestamp': np.array([30.0]), 'unknown': np.array([1.0])})
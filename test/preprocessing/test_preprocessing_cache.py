@@ -0,0 +1,86 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from source.preprocessing.activity_count.activity_count_feature_service import ActivityCountFeatureService
+from source.preprocessing.activity_count.activity_count_service import ActivityCountService
+from source.preprocessing.preprocessing_cache import PreprocessingCache
+
+
+class TestPreprocessingCache(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        directory = Path(self.directory.name)
+        self.input_paths = [str(directory.joinpath('input_' + str(index))) for index in range(3)]
+        self.artifact_paths = {stage: [str(directory.joinpath(stage + '.npy'))] for stage in PreprocessingCache.STAGES}
+        for path in self.input_paths:
+            Path(path).write_bytes(path.encode())
+        for paths in self.artifact_paths.values():
+            Path(paths[0]).write_bytes(b'artifact')
+
+        patches = [mock.patch.object(PreprocessingCache, 'get_manifest_path',
+                                     return_value=directory.joinpath('manifest.json')),
+                   mock.patch.object(PreprocessingCache, 'get_input_paths', return_value=self.input_paths),
+                   mock.patch.object(PreprocessingCache, 'get_artifact_paths',
+                                     side_effect=lambda subject_id, stage: self.artifact_paths[stage])]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.directory.cleanup)
+
+    def test_stage_keys_follow_inputs_and_parameters(self):
+        manifest = PreprocessingCache.load()
+        stage_keys = PreprocessingCache.get_stage_keys(manifest, 'subjectA')
+
+        with mock.patch.object(ActivityCountService, 'CUTOFF_LOW', 2):
+            count_keys = PreprocessingCache.get_stage_keys(manifest, 'subjectA')
+        with mock.patch.object(ActivityCountFeatureService, 'WINDOW_SIZE', 300):
+            feature_keys = PreprocessingCache.get_stage_keys(manifest, 'subjectA')
+        Path(self.input_paths[1]).write_bytes(b'changed input')
+        input_keys = PreprocessingCache.get_stage_keys(manifest, 'subjectA')
+
+        self.assertEqual(stage_keys['crop'], count_keys['crop'])
+        self.assertNotEqual(stage_keys['counts'], count_keys['counts'])
+        self.assertNotEqual(stage_keys['features'], count_keys['features'])
+        self.assertEqual(stage_keys['counts'], feature_keys['counts'])
+        self.assertNotEqual(stage_keys['features'], feature_keys['features'])
+        for stage in PreprocessingCache.STAGES:
+            self.assertNotEqual(stage_keys[stage], input_keys[stage])
+
+    def test_unchanged_inputs_are_not_hashed_again(self):
+        manifest = PreprocessingCache.load()
+        PreprocessingCache.get_stage_keys(manifest, 'subjectA')
+
+        with mock.patch.object(PreprocessingCache, 'hash_file') as mock_hash_file:
+            PreprocessingCache.get_stage_keys(manifest, 'subjectA')
+
+        mock_hash_file.assert_not_called()
+
+    def test_missing_input_has_no_keys(self):
+        os.remove(self.input_paths[0])
+
+        manifest = PreprocessingCache.load()
+
+        self.assertIsNone(PreprocessingCache.get_stage_keys(manifest, 'subjectA'))
+        self.assertEqual(list(PreprocessingCache.STAGES), PreprocessingCache.get_stale_stages(manifest, 'subjectA',
+                                                                                             None))
+
+    def test_recorded_stages_are_fresh_until_an_artifact_changes(self):
+        manifest = PreprocessingCache.load()
+        stage_keys = PreprocessingCache.get_stage_keys(manifest, 'subjectA')
+
+        self.assertEqual(list(PreprocessingCache.STAGES),
+                         PreprocessingCache.get_stale_stages(manifest, 'subjectA', stage_keys))
+
+        PreprocessingCache.record(manifest, 'subjectA', stage_keys, PreprocessingCache.STAGES)
+        PreprocessingCache.save(manifest)
+        manifest = PreprocessingCache.load()
+
+        self.assertEqual([], PreprocessingCache.get_stale_stages(manifest, 'subjectA', stage_keys))
+        self.assertEqual('counts', manifest['artifacts'][self.artifact_paths['counts'][0]]['stage'])
+
+        Path(self.artifact_paths['counts'][0]).write_bytes(b'rewritten artifact')
+
+        self.assertEqual(['counts', 'features'], PreprocessingCache.get_stale_stages(manifest, 'subjectA', stage_keys))
@@ -0,0 +1,48 @@
+from unittest import TestCase, mock
+
+import numpy as np
+
+from source.preprocessing.epoch_array import EpochArray
+from source.preprocessing.heart_rate.heart_rate_collection import HeartRateCollection
+from source.preprocessing.motion.motion_collection import MotionCollection
+from source.preprocessing.raw_data_processor import RawDataProcessor
+from source.sleep_stage import SleepStage
+
+
+class TestRawDataProcessor(TestCase):
+
+    def test_get_epoch_sample_counts(self):
+        timestamps = np.array([95, 100, 100.02, 129.99, 130, 190, 250.5, 251])
+        epoch_timestamps = np.array([100, 130, 160, 190, 220, 250])
+
+        sample_counts = RawDataProcessor.get_epoch_sample_counts(timestamps, epoch_timestamps, 100)
+
+        self.assertListEqual([3, 1, 0, 1, 0, 2], sample_counts.tolist())
+
+    def test_get_epoch_sample_counts_without_samples(self):
+        sample_counts = RawDataProcessor.get_epoch_sample_counts(np.array([]), np.array([0, 30]), 0)
+
+        self.assertListEqual([0, 0], sample_counts.tolist())
+
+    @mock.patch('source.preprocessing.raw_data_processor.HeartRateService')
+    @mock.patch('source.preprocessing.raw_data_processor.MotionService')
+    @mock.patch('source.preprocessing.raw_data_processor.PSGService')
+    def test_get_valid_epochs(self, mock_psg_service, mock_motion_service, mock_heart_rate_service):
+        stages = [SleepStage.wake, SleepStage.n1, SleepStage.unscored, SleepStage.rem, SleepStage.n2]
+        mock_psg_service.load_cropped_epoch_array.return_value = EpochArray(
+            timestamps=10 + 30 * np.arange(5), indices=np.arange(5), stages=[stage.value for stage in stages])
+        motion_timestamps = np.array([11, 12, 41, 71, 101, 131])
+        mock_motion_service.load_cropped.return_value = MotionCollection(
+            subject_id='subjectA', data=np.column_stack((motion_timestamps, np.zeros((6, 3)))))
+        heart_rate_timestamps = np.array([15, 75, 105, 135, 136])
+        mock_heart_rate_service.load_cropped.return_value = HeartRateCollection(
+            subject_id='subjectA', data=np.column_stack((heart_rate_timestamps, np.zeros(5))))
+
+        valid_epochs = RawDataProcessor.get_valid_epochs('subjectA')
+
+        self.assertEqual([0, 3, 4], valid_epochs.indices.tolist())
+
+        with mock.patch.object(RawDataProcessor, 'MINIMUM_MOTION_SAMPLES', 2):
+            valid_epochs = RawDataProcessor.get_valid_epochs('subjectA')
+
+        self.assertEqual([0], valid_epochs.indices.tolist())
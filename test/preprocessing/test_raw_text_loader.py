@@ -0,0 +1,59 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from source import utils
+from source.preprocessing.raw_text_loader import RawTextLoader
+
+
+class TestRawTextLoader(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = Path(self.directory.name).joinpath('1_acceleration.txt')
+        with open(str(self.path), 'w') as raw_file:
+            raw_file.write('0.0 0.1 0.2 0.3\n')
+            for row in [[1.0, 0.5, -0.25, 1e-3], [1.0, 0.5, -0.25, 1e-3], [1.5, 0.0, 2.0, -1.0], [0.5, 1.0, 1.0, 1.0]]:
+                raw_file.write(' '.join(str(value) for value in row) + '\n')
+
+    def test_load_matches_read_csv_and_remove_repeats(self):
+        expected = utils.remove_repeats(pd.read_csv(str(self.path), delimiter=' ').values)
+
+        array = RawTextLoader.load(self.path)
+
+        self.assertEqual(expected.tolist(), array.tolist())
+
+    def test_parse_grows_buffer_across_chunks(self):
+        original_chunk_rows = RawTextLoader.CHUNK_ROWS
+        original_estimate = RawTextLoader.BYTES_PER_ROW_ESTIMATE
+        RawTextLoader.CHUNK_ROWS = 2
+        RawTextLoader.BYTES_PER_ROW_ESTIMATE = 1000
+        try:
+            array = RawTextLoader.parse(self.path)
+        finally:
+            RawTextLoader.CHUNK_ROWS = original_chunk_rows
+            RawTextLoader.BYTES_PER_ROW_ESTIMATE = original_estimate
+
+        self.assertEqual(pd.read_csv(str(self.path), delimiter=' ').values.tolist(), array.tolist())
+
+    def test_sidecar_is_used_until_source_changes(self):
+        array = RawTextLoader.load(self.path, write_sidecar=True)
+        sidecar_path = RawTextLoader.get_sidecar_path(self.path)
+        self.assertTrue(sidecar_path.is_file())
+
+        cached_array = RawTextLoader.load(self.path)
+        self.assertIsInstance(cached_array, np.memmap)
+        self.assertEqual(array.tolist(), cached_array.tolist())
+
+        with open(str(self.path), 'a') as raw_file:
+            raw_file.write('2.0 3.0 3.0 3.0\n')
+        sidecar_time = os.stat(str(sidecar_path)).st_mtime_ns
+        os.utime(str(self.path), ns=(sidecar_time + 10 ** 9, sidecar_time + 10 ** 9))
+
+        reloaded_array = RawTextLoader.load(self.path)
+        self.assertEqual(len(array) + 1, len(reloaded_array))
@@ -0,0 +1,80 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from source.preprocessing.subject_preprocessing_result import SubjectPreprocessingResult
+from source.preprocessing.subject_preprocessor import SubjectPreprocessor
+
+
+class TestSubjectPreprocessor(TestCase):
+
+    @mock.patch('source.preprocessing.subject_preprocessor.FeatureBuilder')
+    @mock.patch('source.preprocessing.subject_preprocessor.ActivityCountService')
+    @mock.patch('source.preprocessing.subject_preprocessor.MotionService')
+    @mock.patch('source.preprocessing.subject_preprocessor.RawDataProcessor')
+    def test_run_crops_counts_then_builds_features(self, mock_raw_data_processor, mock_motion_service,
+                                                   mock_activity_count_service, mock_feature_builder):
+        result = SubjectPreprocessor.run('subjectA')
+
+        mock_raw_data_processor.crop.assert_called_once_with('subjectA')
+        mock_motion_service.load_cropped.assert_called_once_with('subjectA')
+        mock_activity_count_service.build_activity_counts_without_matlab.assert_called_once_with(
+            'subjectA', mock_motion_service.load_cropped.return_value.data)
+        mock_feature_builder.build.assert_called_once_with('subjectA')
+        self.assertTrue(result.succeeded())
+        self.assertEqual('subjectA', result.subject_id)
+        self.assertGreaterEqual(result.crop_time, 0)
+        self.assertGreaterEqual(result.feature_time, 0)
+
+    @mock.patch('source.preprocessing.subject_preprocessor.FeatureBuilder')
+    @mock.patch('source.preprocessing.subject_preprocessor.ActivityCountService')
+    @mock.patch('source.preprocessing.subject_preprocessor.MotionService')
+    @mock.patch('source.preprocessing.subject_preprocessor.RawDataProcessor')
+    def test_run_all_records_failures_in_order(self, mock_raw_data_processor, mock_motion_service,
+                                               mock_activity_count_service, mock_feature_builder):
+        def crop(subject_id):
+            if subject_id == '2':
+                raise FileNotFoundError(subject_id)
+
+        mock_raw_data_processor.crop.side_effect = crop
+
+        results = SubjectPreprocessor.run_all([1, 2, 3], number_of_workers=1, use_cache=False)
+
+        self.assertEqual(['1', '2', '3'], [result.subject_id for result in results])
+        self.assertEqual([True, False, True], [result.succeeded() for result in results])
+        self.assertIn('FileNotFoundError', results[1].error)
+        self.assertEqual([mock.call('1'), mock.call('3')], mock_feature_builder.build.call_args_list)
+
+    def test_run_all_uses_worker_processes(self):
+        results = SubjectPreprocessor.run_all(['missing_b', 'missing_a'], number_of_workers=2, use_cache=False)
+
+        self.assertEqual(['missing_b', 'missing_a'], [result.subject_id for result in results])
+        self.assertFalse(any(result.succeeded() for result in results))
+
+    @mock.patch.object(SubjectPreprocessor, 'run')
+    def test_run_all_skips_cached_subjects(self, mock_run):
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            input_paths = [directory.joinpath('input_' + str(index)) for index in range(3)]
+            artifact_path = directory.joinpath('artifact.npy')
+            for path in input_paths + [artifact_path]:
+                path.write_bytes(b'data')
+
+            def run(subject_id, stages):
+                artifact_path.write_bytes(b'data')
+                return SubjectPreprocessingResult(subject_id)
+
+            mock_run.side_effect = run
+
+            with mock.patch('source.preprocessing.preprocessing_cache.PreprocessingCache.get_manifest_path',
+                            return_value=directory.joinpath('manifest.json')), \
+                    mock.patch('source.preprocessing.preprocessing_cache.PreprocessingCache.get_input_paths',
+                               return_value=[str(path) for path in input_paths]), \
+                    mock.patch('source.preprocessing.preprocessing_cache.PreprocessingCache.get_artifact_paths',
+                               return_value=[str(artifact_path)]):
+                first_results = SubjectPreprocessor.run_all(['subjectA'], number_of_workers=1)
+                second_results = SubjectPreprocessor.run_all(['subjectA'], number_of_workers=1)
+
+        mock_run.assert_called_once_with('subjectA', ['crop', 'counts', 'features'])
+        self.assertFalse(first_results[0].cached)
+        self.assertTrue(second_results[0].cached)
@@ -69,3 +69,53 @@ class TestUtils(TestCase):
         returned_no_repeats = utils.remove_repeats(array_with_repeats)
 
         self.assertEqual(array_no_repeats.tolist(), returned_no_repeats.tolist())
+
+    def test_remove_repeats_matches_unique_when_sorted_or_not(self):
+        random_state = np.random.RandomState(0)
+        sorted_array = np.column_stack((np.repeat(np.arange(50.0), 2), random_state.randint(0, 3, 100)))
+        unsorted_array = sorted_array[random_state.permutation(100)]
+
+        for array in [sorted_array, unsorted_array]:
+            expected = np.unique(array, axis=0)
+            expected = expected[np.argsort(expected[:, 0])]
+            self.assertEqual(expected.tolist(), utils.remove_repeats(array).tolist())
+
+    def test_smooth_gauss_windows(self):
+        y = np.random.RandomState(0).normal(0, 1, 500)
+        first_indices = np.array([0, 10, 10, 200, 490, 500])
+        last_indices = np.array([300, 309, 310, 499, 500, 500])
+
+        causal_sums = utils.smooth_gauss_windows(y, first_indices, last_indices, causal=True)
+        centered_sums = utils.smooth_gauss_windows(y, first_indices, last_indices)
+
+        for index in range(len(first_indices)):
+            window = y[first_indices[index]:last_indices[index]]
+            self.assertEqual(utils.smooth_gauss_causal(window, len(window)), causal_sums[index])
+            self.assertEqual(utils.smooth_gauss(window, len(window)), centered_sums[index])
+
+    def test_get_window_statistics(self):
+        y = 1e6 + np.random.RandomState(0).normal(0, 1e-3, 1000)
+        first_indices = np.array([0, 100, 500, 1000])
+        last_indices = np.array([300, 399, 1000, 1000])
+
+        means, stds = utils.get_window_statistics(y, first_indices, last_indices)
+
+        for index in range(3):
+            window = y[first_indices[index]:last_indices[index]]
+            self.assertAlmostEqual(np.mean(window), means[index], delta=1e-9)
+            self.assertAlmostEqual(np.std(window), stds[index], delta=1e-9)
+        self.assertTrue(np.isnan(means[3]))
+        self.assertTrue(np.isnan(stds[3]))
+
+    def test_convolve_with_dog_uses_fft_for_long_series(self):
+        y = 60 + np.random.RandomState(0).normal(0, 5, 40000)
+        box = utils.get_dog_kernel(285)
+        padded = np.insert(y - np.mean(y), 0, np.flip((y - np.mean(y))[0:142]))
+        padded = np.insert(padded, len(padded) - 1, np.flip(padded[-142:]))
+
+        convolution = utils.convolve_with_dog(y, 285)
+
+        self.assertIs(box, utils.get_dog_kernel(285))
+        self.assertFalse(box.flags.writeable)
+        self.assertGreaterEqual(len(padded) * len(box), utils.FFT_CONVOLUTION_MINIMUM)
+        np.testing.assert_allclose(np.convolve(padded, box, mode='valid'), convolution, rtol=0, atol=1e-9)